@@ -1,4 +1,6 @@
-from game.game_play import start_game
+import sys
+
+from game.cli import main
 
 if __name__ == '__main__':
-    start_game()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Module containing benchmarks of the engine and bots"""
@@ -0,0 +1,34 @@
+"""Benchmark of the vectorized batch engine"""
+
+import time
+
+import numpy as np
+
+from game.batch_engine import BatchEngine, random_policy
+from game.solvability_study import deal_position
+
+
+def benchmark_batch_engine(
+    n_games: int = 10_000, n_players: int = 4, seed: int = 0
+) -> float:
+    """Measures moves per second of random playouts of a batch of dealt games
+    Args:
+        n_games: number of games in the batch
+        n_players: number of players at the table
+        seed: seed of the deals and the playouts
+
+    Returns:
+        Moves per second
+    """
+    # A few hundred distinct deals repeated over the batch keeps the setup short
+    positions = [deal_position(n_players, seed, deal_no) for deal_no in range(256)]
+    engine = BatchEngine.from_positions(
+        [positions[game_no % len(positions)] for game_no in range(n_games)]
+    )
+    start = time.perf_counter()
+    engine.run(random_policy, np.random.default_rng(seed))
+    return int(engine.moves_played.sum()) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print(f"Batch engine moves/sec: {benchmark_batch_engine():.0f}")
@@ -0,0 +1,149 @@
+"""Benchmarks of the engine hot paths, each returns its metrics keyed by name"""
+
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+import numpy as np
+
+from deck.deck_functions import Deck, ENCODED_CARDS
+from game.encoding import ENCODING_SIZE, StateEncoder
+from game.game_functions import get_available_play_card
+from game.game_log import PICKUP_CARDS
+from game.game_state import GameState
+from game.simulation import game_rng, play_simulation_game, setup_simulation_game
+from game.tournament import play_match
+from player.player_functions import RandomBot
+
+Metrics = Dict[str, float]
+
+
+def _best_time(run: Callable[[], None], repeats: int = 3) -> float:
+    """Returns the fastest of several timings of run, which is the least disturbed one"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _peak_kib(run: Callable[[], None]) -> float:
+    """Returns peak memory allocated while run executes, in KiB"""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_deck(n_deals: int = 5000, seed: int = 0) -> Metrics:
+    """Measures shuffling and dealing a full deck to four players"""
+    deck = Deck(ENCODED_CARDS)
+    rng = random.Random(seed)
+
+    def run():
+        for _ in range(n_deals):
+            deck.reset_deck()
+            deck.shuffle(rng)
+            for _ in range(4):
+                deck.deal(6)
+
+    return {"deals_per_sec": n_deals / _best_time(run)}
+
+
+def benchmark_available_play_card(n_calls: int = 50_000, seed: int = 0) -> Metrics:
+    """Measures finding the legal beating cards of a player mid trick"""
+    game = setup_simulation_game([RandomBot() for _ in range(4)])
+    game.deal_cards(random.Random(seed))
+    game.set_trumps()
+    game.share_nines()
+    player = game.players[0]
+    card_stack = [next(iter(game.players[1].hand))]
+
+    def run():
+        for _ in range(n_calls):
+            get_available_play_card(card_stack, player)
+
+    return {"calls_per_sec": n_calls / _best_time(run)}
+
+
+def benchmark_private_game_state(n_calls: int = 20_000, seed: int = 0) -> Metrics:
+    """Measures taking private snapshots of a changing game state"""
+    game = setup_simulation_game([RandomBot() for _ in range(4)])
+    game.deal_cards(random.Random(seed))
+    game.set_trumps()
+    game.share_nines()
+    game_state = GameState(game.players, card_stack=[], card_to_beat=False)
+
+    def run():
+        for call_no in range(n_calls):
+            game_state.adjust_card_to_beat(bool(call_no & 1))
+            game_state.private_game_state(game.players[call_no % 4])
+
+    return {"calls_per_sec": n_calls / _best_time(run)}
+
+
+def benchmark_encoding(
+    n_batches: int = 200, batch_size: int = 256, seed: int = 0
+) -> Metrics:
+    """Measures encoding private views of game states into a preallocated batch buffer"""
+    game = setup_simulation_game([RandomBot() for _ in range(4)])
+    game.deal_cards(random.Random(seed))
+    game.set_trumps()
+    game.share_nines()
+    game_state = GameState(game.players, card_stack=[], card_to_beat=False)
+    game_states = [game_state] * batch_size
+    observers = [game.players[row % 4] for row in range(batch_size)]
+    encoder = StateEncoder(batch_size)
+    out = np.empty((batch_size, ENCODING_SIZE), dtype=np.float32)
+
+    def run():
+        for _ in range(n_batches):
+            encoder.encode(out, game_states, observers)
+
+    return {"states_per_sec": n_batches * batch_size / _best_time(run)}
+
+
+def benchmark_subgame(n_games: int = 500, seed: int = 0) -> Metrics:
+    """Measures full tricks between RandomBots, with the game log recorded"""
+    game = setup_simulation_game([RandomBot() for _ in range(4)])
+    moves = 0
+
+    def run():
+        nonlocal moves
+        moves = 0
+        for game_no in range(n_games):
+            trick = play_simulation_game(game, game_rng(seed, game_no), True)
+            moves += int((trick.game_log.records["action"] <= PICKUP_CARDS).sum())
+
+    elapsed = _best_time(run)
+    peak_kib = _peak_kib(lambda: play_simulation_game(game, game_rng(seed, 0), True))
+    return {
+        "games_per_sec": n_games / elapsed,
+        "moves_per_sec": moves / elapsed,
+        "peak_kib_per_game": peak_kib,
+    }
+
+
+def benchmark_match(n_matches: int = 20, seed: int = 0) -> Metrics:
+    """Measures full matches to seven letters between RandomBots"""
+    game = setup_simulation_game([RandomBot() for _ in range(4)])
+
+    def run():
+        for match_no in range(n_matches):
+            play_match(game, game_rng(seed, match_no))
+
+    return {"matches_per_sec": n_matches / _best_time(run)}
+
+
+ENGINE_BENCHMARKS: Dict[str, Callable[[], Metrics]] = {
+    "deck_shuffle_deal": benchmark_deck,
+    "available_play_card": benchmark_available_play_card,
+    "private_game_state": benchmark_private_game_state,
+    "state_encoding": benchmark_encoding,
+    "subgame_random_bots": benchmark_subgame,
+    "match_random_bots": benchmark_match,
+}
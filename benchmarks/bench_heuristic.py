@@ -0,0 +1,40 @@
+"""Benchmark of the heuristic playout bot, its speed and its strength against RandomBot"""
+
+import time
+
+from benchmarks.bench_engine import Metrics
+from game.simulation import simulate
+from game.tournament import run_tournament
+from player.heuristic_bot import HeuristicBot
+from player.player_functions import RandomBot
+
+
+def benchmark_heuristic(
+    n_games: int = 500, n_matches: int = 100, n_players: int = 4, seed: int = 0
+) -> Metrics:
+    """Measures games per second of heuristic bots playing each other and the match win rate of
+    a heuristic bot against random bots, seats rotated between matches
+    Args:
+        n_games: number of games to time
+        n_matches: number of matches against random bots
+        n_players: number of players at the table
+        seed: seed of the games and the matches
+
+    Returns:
+        Games per second and win rate against RandomBot
+    """
+    start = time.perf_counter()
+    simulate(n_games, [HeuristicBot() for _ in range(n_players)], seed)
+    games_per_sec = n_games / (time.perf_counter() - start)
+
+    lineup = [HeuristicBot()] + [RandomBot() for _ in range(n_players - 1)]
+    results = run_tournament(n_matches, lineup, seed, workers=1)
+    return {
+        "games_per_sec": games_per_sec,
+        "win_rate_vs_random": results.type_stats["HeuristicBot"].win_rate,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in benchmark_heuristic().items():
+        print(f"{name}: {value:.3f}")
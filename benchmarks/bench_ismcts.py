@@ -0,0 +1,39 @@
+"""Benchmark of ISMCTS search speed"""
+
+import random
+import time
+
+from game.game_state import GameState
+from game.simulation import setup_simulation_game
+from player.ismcts_bot import ISMCTSBot
+from player.player_functions import RandomBot
+
+
+def benchmark_ismcts(
+    iterations: int = 2000, n_players: int = 4, seed: int = 0
+) -> float:
+    """Measures search iterations per second of the opening decision of a fresh deal
+    Args:
+        iterations: number of iterations to search
+        n_players: number of players at the table
+        seed: seed of the deal and the search
+
+    Returns:
+        Iterations per second
+    """
+    game = setup_simulation_game([RandomBot() for _ in range(n_players)])
+    game.deal_cards(random.Random(seed))
+    starting_player = game.set_trumps()
+    game.share_nines()
+    game_state = GameState(game.players, card_stack=[], card_to_beat=False)
+
+    bot = ISMCTSBot(iterations=iterations, rng=random.Random(seed))
+    start = time.perf_counter()
+    bot.select_card_to_play(
+        list(starting_player.hand), starting_player, [], [], game_state, 1, False
+    )
+    return iterations / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print(f"ISMCTS iterations/sec: {benchmark_ismcts():.0f}")
@@ -0,0 +1,150 @@
+"""Runs the benchmark suite, appends the results to a history file and flags regressions"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.bench_batch_engine import benchmark_batch_engine
+from benchmarks.bench_engine import ENGINE_BENCHMARKS, Metrics
+from benchmarks.bench_heuristic import benchmark_heuristic
+from benchmarks.bench_ismcts import benchmark_ismcts
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(__file__), "history.jsonl")
+# Percentage a metric may get worse by before it is flagged
+DEFAULT_THRESHOLD = 10.0
+# Number of previous runs the baseline is the median of
+BASELINE_RUNS = 5
+# Metrics with these suffixes are better when lower, all others when higher
+LOWER_IS_BETTER = ("_kib_per_game",)
+
+BENCHMARKS = {
+    **ENGINE_BENCHMARKS,
+    "batch_engine": lambda: {"moves_per_sec": benchmark_batch_engine()},
+    "ismcts": lambda: {"iterations_per_sec": benchmark_ismcts()},
+    "heuristic_bot": benchmark_heuristic,
+}
+
+
+def _git_commit() -> Optional[str]:
+    """Returns the commit of the working tree, None outside of a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(names: Optional[List[str]] = None) -> Dict[str, Metrics]:
+    """Runs benchmarks of the suite
+    Args:
+        names: (Optional) names of the benchmarks to run, all by default
+
+    Returns:
+        Metrics of each benchmark
+    """
+    return {name: BENCHMARKS[name]() for name in names or BENCHMARKS}
+
+
+def load_history(path: str) -> List[dict]:
+    """Loads previous runs from a history file, one JSON object per line"""
+    if not os.path.exists(path):
+        return []
+    with open(path) as history_file:
+        return [json.loads(line) for line in history_file if line.strip()]
+
+
+def append_history(path: str, results: Dict[str, Metrics]) -> dict:
+    """Appends a run to the history file
+    Args:
+        path: path of the history file
+        results: metrics of each benchmark
+
+    Returns:
+        Entry written to the file
+    """
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "a") as history_file:
+        history_file.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def find_regressions(
+    results: Dict[str, Metrics],
+    history: List[dict],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[str]:
+    """Compares results with the median of the last runs in the history
+    Args:
+        results: metrics of each benchmark
+        history: previous runs, oldest first
+        threshold: percentage a metric may get worse by
+
+    Returns:
+        Description of every metric worse than its baseline by more than threshold
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            previous = [
+                entry["results"][name][metric]
+                for entry in history[-BASELINE_RUNS:]
+                if metric in entry["results"].get(name, {})
+            ]
+            if not previous:
+                continue
+            baseline = statistics.median(previous)
+            if metric.endswith(LOWER_IS_BETTER):
+                change = (value - baseline) / baseline * 100
+            else:
+                change = (baseline - value) / baseline * 100
+            if change > threshold:
+                regressions.append(
+                    f"{name}.{metric}: {value:.1f} vs baseline {baseline:.1f} "
+                    f"({change:.1f}% worse)"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("names", nargs="*", help="benchmarks to run, all by default")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--no-save", action="store_true", help="do not append to the history"
+    )
+    args = parser.parse_args(argv)
+
+    history = load_history(args.history)
+    results = run_suite(args.names)
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            print(f"{name:24} {metric:22} {value:14.1f}")
+
+    regressions = find_regressions(results, history, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not args.no_save:
+        append_history(args.history, results)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,38 @@
 import itertools
-from typing import Iterable, List
-
-from numpy import random
+import random
+from typing import Iterable, List, Optional, Union
 
 from deck.card_encoding import PLAYING_CARDS, SUITS
 
+# Each card owns one bit of a 24 bit mask. Bits are laid out suit by suit, ascending by face,
+# so iterating over set bits yields cards in the same (suit, face) order as a sorted hand
+CARD_INDEX = {
+    (face, suit): suit_idx * len(PLAYING_CARDS) + face_idx
+    for suit_idx, suit in enumerate(SUITS)
+    for face_idx, face in enumerate(PLAYING_CARDS)
+}
+FULL_MASK = (1 << len(CARD_INDEX)) - 1
+
+
+def popcount(mask: int) -> int:
+    """Counts set bits of a card mask, int.bit_count is not available before Python 3.10"""
+    return bin(mask).count("1")
+
 
 class Card:
-    """Data class of a card"""
+    """Data class of a card, a thin view over its bit in a CardSet"""
+
+    __slots__ = ("face", "suit", "index")
 
     def __init__(self, card_representation: tuple):
         self.face = card_representation[0]
         self.suit = card_representation[1]
+        self.index = CARD_INDEX[(self.face, self.suit)]
+
+    @property
+    def mask(self) -> int:
+        """Bit mask of a card"""
+        return 1 << self.index
 
     def __lt__(self, other: "Card"):
         return self.face < other.face
@@ -20,7 +41,10 @@ class Card:
         return self.face > other.face
 
     def __eq__(self, other: "Card"):
-        return self.face == other.face and self.suit == other.suit
+        return isinstance(other, Card) and self.index == other.index
+
+    def __hash__(self):
+        return self.index
 
     def __str__(self):
         return f"{PLAYING_CARDS[self.face]}{SUITS[self.suit]}"
@@ -29,6 +53,96 @@ class Card:
         return f"Card({self.face},{self.suit})"
 
 
+class CardSet:
+    """Set of cards packed into the bits of a single integer, used for hands, known cards and stacks
+    Args:
+        cards: iterable of cards or an already built bit mask
+    """
+
+    __slots__ = ("mask",)
+
+    def __init__(self, cards: Union[int, Iterable[Card]] = 0):
+        self.mask = cards if isinstance(cards, int) else cards_to_mask(cards)
+
+    def __contains__(self, card: Optional[Card]) -> bool:
+        return card is not None and bool(self.mask >> card.index & 1)
+
+    def __len__(self):
+        return popcount(self.mask)
+
+    def __bool__(self):
+        return self.mask != 0
+
+    def __iter__(self):
+        mask = self.mask
+        while mask:
+            low_bit = mask & -mask
+            yield CARDS_BY_INDEX[low_bit.bit_length() - 1]
+            mask ^= low_bit
+
+    def __getitem__(self, idx: int) -> Card:
+        return list(self)[idx]
+
+    def __eq__(self, other: "CardSet"):
+        return isinstance(other, CardSet) and self.mask == other.mask
+
+    def __or__(self, other: "CardSet") -> "CardSet":
+        return CardSet(self.mask | other.mask)
+
+    def __and__(self, other: "CardSet") -> "CardSet":
+        return CardSet(self.mask & other.mask)
+
+    def __sub__(self, other: "CardSet") -> "CardSet":
+        return CardSet(self.mask & ~other.mask)
+
+    def __str__(self):
+        return str([str(card) for card in self])
+
+    def __repr__(self):
+        return f"CardSet({self.mask:#08x})"
+
+    def add(self, card: Card):
+        """Adds a single card to the set"""
+        self.mask |= 1 << card.index
+
+    def discard(self, card: Card):
+        """Removes a single card from the set if it is present"""
+        self.mask &= ~(1 << card.index)
+
+    def add_cards(self, cards: Union["CardSet", Iterable[Card]]):
+        """Adds all given cards to the set"""
+        self.mask |= cards_to_mask(cards)
+
+    def remove_cards(self, cards: Union["CardSet", Iterable[Card]]):
+        """Removes all given cards that are present in the set"""
+        self.mask &= ~cards_to_mask(cards)
+
+    def clear(self):
+        """Removes all cards from the set"""
+        self.mask = 0
+
+    def copy(self) -> "CardSet":
+        """Returns an independent copy of the set"""
+        return CardSet(self.mask)
+
+
+def cards_to_mask(cards: Union[CardSet, Iterable[Optional[Card]]]) -> int:
+    """Packs cards into a bit mask
+    Args:
+        cards: card set or iterable of cards, None entries are skipped
+
+    Returns:
+        Bit mask with a bit set for each card
+    """
+    if isinstance(cards, CardSet):
+        return cards.mask
+    mask = 0
+    for card in cards:
+        if card is not None:
+            mask |= 1 << card.index
+    return mask
+
+
 class Deck:
     """Represents a standard deck of cards built using Constants from card_encoding
     Args:
@@ -45,9 +159,12 @@ class Deck:
     def __len__(self):
         return len(self.deck)
 
-    def shuffle(self):
-        """Shuffles deck"""
-        random.shuffle(self.deck)
+    def shuffle(self, rng: Optional[random.Random] = None):
+        """Shuffles deck
+        Args:
+            rng: (Optional) random generator to shuffle with, global random state is used otherwise
+        """
+        (rng or random).shuffle(self.deck)
 
     def deal(self, no_cards: int = 1) -> List[Card]:
         """Deals no_cards of cards by removing them from the deck"""
@@ -71,5 +188,6 @@ def visualise_set_of_cards(card_list: Iterable[Card]) -> str:
 
 
 ENCODED_CARDS = [Card(c) for c in itertools.product(PLAYING_CARDS, SUITS)]
+CARDS_BY_INDEX = sorted(ENCODED_CARDS, key=lambda card: card.index)
 QUEEN_OF_SPADES = Card((12, 1))
 NINES = [Card(c) for c in [(9, 1), (9, 2), (9, 3), (9, 4)]]
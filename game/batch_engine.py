@@ -0,0 +1,268 @@
+"""Module containing a vectorized engine playing many Vezimas tricks in lockstep"""
+
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from deck.deck_functions import CARDS_BY_INDEX
+from game.rules import LEGAL_BEAT_MASKS
+from game.position import BEAT, LEAD, PICKUP, PLAY, Position
+
+N_CARDS = len(CARDS_BY_INDEX)
+# Loser of a game that was tied, or not finished within the move limit
+TIED_GAME = -1
+UNFINISHED_GAME = -2
+
+# LEGAL_BEAT_MASKS as an array indexed by [top card, own suit, next suit]
+LEGAL_BEAT_TABLE = np.array(LEGAL_BEAT_MASKS, dtype=np.int64)
+_POPCOUNT_8 = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+# Cards from the lowest face to the highest, for the heuristic policy
+LOW_CARD_ORDER = [
+    card.index for card in sorted(CARDS_BY_INDEX, key=lambda card: card.face)
+]
+
+BatchPolicy = Callable[
+    ["BatchEngine", np.ndarray, np.ndarray, np.random.Generator], np.ndarray
+]
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Counts set bits of 24 bit card masks"""
+    return (
+        _POPCOUNT_8[masks & 0xFF]
+        + _POPCOUNT_8[masks >> 8 & 0xFF]
+        + _POPCOUNT_8[masks >> 16 & 0xFF]
+    )
+
+
+class BatchEngine:
+    """Plays a batch of tricks as arrays, one move of every unfinished game per step. Follows the
+    rules of check_play_validity and the turn structure of VezimasSubgame.start_game
+    Args:
+        hands: card mask of each seat of each game, shape (games, seats)
+        suits: trump suit of each seat of each game, shape (games, seats)
+        to_act: seat of the player to act in each game
+        next_seats: (Optional) seat playing after each seat, seats play in index order otherwise
+    """
+
+    def __init__(
+        self,
+        hands: np.ndarray,
+        suits: np.ndarray,
+        to_act: np.ndarray,
+        next_seats: Optional[np.ndarray] = None,
+    ):
+        self.hands = np.array(hands, dtype=np.int64)
+        n_games, n_seats = self.hands.shape
+        self.suits = np.array(suits, dtype=np.int64)
+        self.next_seats = (
+            np.broadcast_to((np.arange(n_seats) + 1) % n_seats, (n_games, n_seats))
+            if next_seats is None
+            else np.array(next_seats, dtype=np.int64)
+        )
+        self.to_act = np.array(to_act, dtype=np.int64)
+        self.games = np.arange(n_games)
+
+        self.stack_mask = np.zeros(n_games, dtype=np.int64)
+        self.top = np.full(n_games, -1, dtype=np.int64)
+        self.phase = np.full(n_games, LEAD, dtype=np.int64)
+        self.n_active = (self.hands != 0).sum(axis=1)
+        self.done = self.n_active <= 1
+        self.loser = np.where(
+            self.n_active == 1, (self.hands != 0).argmax(axis=1), TIED_GAME
+        )
+        self.loser[~self.done] = UNFINISHED_GAME
+        self.moves_played = np.zeros(n_games, dtype=np.int64)
+
+    @classmethod
+    def from_positions(cls, positions: List[Position]) -> "BatchEngine":
+        """Builds a batch from positions with an empty stack, such as starting positions
+        Args:
+            positions: positions about to lead, all with the same number of seats
+
+        Returns:
+            Batch of the positions
+        """
+        if any(position.stack for position in positions):
+            raise ValueError("Batch games have to start with an empty stack")
+        return cls(
+            hands=[position.hands for position in positions],
+            suits=[position.suits for position in positions],
+            to_act=[position.to_act for position in positions],
+            next_seats=[position.next_seats for position in positions],
+        )
+
+    def __len__(self):
+        return len(self.games)
+
+    def next_active_seat(self, seats: np.ndarray) -> np.ndarray:
+        """Returns the next seat after the given one of each game that still has cards"""
+        seats = self.next_seats[self.games, seats]
+        for _ in range(self.hands.shape[1] - 1):
+            empty = self.hands[self.games, seats] == 0
+            if not empty.any():
+                break
+            seats = np.where(empty, self.next_seats[self.games, seats], seats)
+        return seats
+
+    def legal_card_masks(self) -> np.ndarray:
+        """Returns the mask of legal cards of the player to act in each game, 0 for finished games"""
+        hands = self.hands[self.games, self.to_act]
+        next_suits = self.suits[self.games, self.next_active_seat(self.to_act)]
+        own_suits = self.suits[self.games, self.to_act]
+        beat_masks = LEGAL_BEAT_TABLE[np.maximum(self.top, 0), own_suits, next_suits]
+        masks = np.where(self.phase == BEAT, hands & beat_masks, hands)
+        return np.where(self.done, 0, masks)
+
+    def can_pick_up(self) -> np.ndarray:
+        """Returns a flag of each game whether the player to act may pick up the stack"""
+        return (self.phase != LEAD) & ~self.done
+
+    def step(self, moves: np.ndarray):
+        """Plays one move in every unfinished game, the moves must be legal
+        Args:
+            moves: card bit index or PICKUP for each game, ignored for finished games
+        """
+        moves = np.asarray(moves, dtype=np.int64)
+        playing = ~self.done
+        seats = self.to_act
+        hands = self.hands[self.games, seats]
+
+        pickup = playing & (moves == PICKUP)
+        card = playing & ~pickup
+        bits = np.where(card, np.int64(1) << np.where(card, moves, 0), 0)
+        hands = np.where(pickup, hands | self.stack_mask, hands & ~bits)
+        self.hands[self.games, seats] = hands
+        self.stack_mask = np.where(pickup, 0, self.stack_mask | bits)
+        self.top = np.where(pickup, -1, np.where(card, moves, self.top))
+
+        turn_over = pickup | card & ((self.phase != BEAT) | (hands == 0))
+        self.phase = np.where(card & ~turn_over, PLAY, self.phase)
+
+        self.n_active = self.n_active - (turn_over & (hands == 0))
+        finished = turn_over & (self.n_active <= 1)
+        next_seats = self.next_active_seat(seats)
+        self.loser = np.where(
+            finished, np.where(self.n_active == 1, next_seats, TIED_GAME), self.loser
+        )
+        self.done = self.done | finished
+        self.to_act = np.where(turn_over & ~finished, next_seats, seats)
+        self.phase = np.where(
+            turn_over, np.where(self.stack_mask != 0, BEAT, LEAD), self.phase
+        )
+        self.moves_played += playing
+
+    def run(
+        self,
+        policy: BatchPolicy,
+        rng: np.random.Generator,
+        max_moves: int = 600,
+    ) -> np.ndarray:
+        """Plays every game until it ends or reaches max_moves
+        Args:
+            policy: vectorized move choice, see random_policy
+            rng: random generator passed to the policy
+            max_moves: moves after which an unfinished game stays UNFINISHED_GAME
+
+        Returns:
+            Loser seat of each game, TIED_GAME or UNFINISHED_GAME
+        """
+        for _ in range(max_moves):
+            if self.done.all():
+                break
+            self.step(policy(self, self.legal_card_masks(), self.can_pick_up(), rng))
+        return self.loser
+
+
+def _nth_set_bit(
+    masks: np.ndarray, nth: np.ndarray, order=range(N_CARDS)
+) -> np.ndarray:
+    """Returns the bit index of the nth set bit of each mask, counted in order, PICKUP if none"""
+    moves = np.full(len(masks), PICKUP, dtype=np.int64)
+    seen = np.zeros(len(masks), dtype=np.int64)
+    for card_idx in order:
+        bit = masks >> card_idx & 1
+        moves = np.where((bit == 1) & (seen == nth), card_idx, moves)
+        seen += bit
+    return moves
+
+
+def random_policy(
+    engine: BatchEngine,
+    card_masks: np.ndarray,
+    can_pick_up: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Chooses uniformly between legal cards and pickup, as RandomBot does"""
+    n_moves = popcount(card_masks) + can_pick_up
+    return _nth_set_bit(
+        card_masks, (rng.random(len(engine)) * n_moves).astype(np.int64)
+    )
+
+
+def card_first_policy(
+    engine: BatchEngine,
+    card_masks: np.ndarray,
+    can_pick_up: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Plays a random legal card, picking up only when no card can be played"""
+    n_cards = popcount(card_masks)
+    return _nth_set_bit(
+        card_masks, (rng.random(len(engine)) * n_cards).astype(np.int64)
+    )
+
+
+def lowest_card_policy(
+    engine: BatchEngine,
+    card_masks: np.ndarray,
+    can_pick_up: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Heuristic playing the legal card of the lowest face, picking up only without a card"""
+    return _nth_set_bit(card_masks, np.zeros(len(engine), np.int64), LOW_CARD_ORDER)
+
+
+def scored_policy(score: Callable[[BatchEngine], np.ndarray]) -> BatchPolicy:
+    """Builds a policy playing the legal move of the highest score, such as model outputs
+    Args:
+        score: scores of every move of every game, shape (games, PICKUP + 1)
+
+    Returns:
+        Vectorized policy
+    """
+
+    def policy(
+        engine: BatchEngine,
+        card_masks: np.ndarray,
+        can_pick_up: np.ndarray,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        legal = card_masks[:, None] >> np.arange(N_CARDS) & 1 == 1
+        legal = np.concatenate([legal, can_pick_up[:, None]], axis=1)
+        return np.where(legal, score(engine), -np.inf).argmax(axis=1)
+
+    return policy
+
+
+def playout_loss_rates(
+    position: Position,
+    n_playouts: int,
+    policy: BatchPolicy = card_first_policy,
+    seed: Optional[int] = None,
+    max_moves: int = 600,
+) -> np.ndarray:
+    """Monte Carlo evaluation of a position by batched playouts
+    Args:
+        position: position with an empty stack to evaluate
+        n_playouts: number of playouts
+        policy: vectorized move choice of every player
+        seed: (Optional) seed of the playouts
+        max_moves: moves after which a playout counts as unfinished
+
+    Returns:
+        Fraction of playouts lost by each seat
+    """
+    engine = BatchEngine.from_positions([position] * n_playouts)
+    losers = engine.run(policy, np.random.default_rng(seed), max_moves)
+    return np.bincount(losers[losers >= 0], minlength=len(position.hands)) / n_playouts
@@ -0,0 +1,110 @@
+"""Module for relabelling Vezimas positions into a canonical form shared by symmetric positions"""
+
+import itertools
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from deck.card_encoding import PLAYING_CARDS, SUITS
+from game.position import PICKUP, Position, _bit_indexes
+
+SUIT_LIST = list(SUITS)
+N_FACES = len(PLAYING_CARDS)
+
+
+class CanonicalForm(NamedTuple):
+    """Canonical relabelling of a position
+    Args:
+        position: relabelled position, the player to act sits in seat 0 and seats follow turn order
+        seat_map: canonical seat of each original seat
+        suit_map: canonical suit of each original suit
+    """
+
+    position: Position
+    seat_map: List[int]
+    suit_map: Dict[int, int]
+
+    @property
+    def key(self) -> int:
+        """Hash of the canonical position, equal for all positions equivalent to it"""
+        return self.position.key
+
+    def to_canonical_move(self, move: Optional[int]) -> Optional[int]:
+        """Relabels a move of the original position"""
+        return _relabel_card(move, self.suit_map)
+
+    def from_canonical_move(self, move: Optional[int]) -> Optional[int]:
+        """Relabels a move of the canonical position back to the original position"""
+        inverse = {canonical: suit for suit, canonical in self.suit_map.items()}
+        return _relabel_card(move, inverse)
+
+    def from_canonical_seat(self, seat: Optional[int]) -> Optional[int]:
+        """Relabels a seat of the canonical position back to the original position"""
+        return None if seat is None else self.seat_map.index(seat)
+
+
+def _relabel_card(card_idx: Optional[int], suit_map: Dict[int, int]) -> Optional[int]:
+    """Moves a card bit index to the same face of the mapped suit, pickups stay as they are"""
+    if card_idx is None or card_idx == PICKUP:
+        return card_idx
+    suit = SUIT_LIST[card_idx // N_FACES]
+    return SUIT_LIST.index(suit_map[suit]) * N_FACES + card_idx % N_FACES
+
+
+def _relabel_mask(mask: int, suit_map: Dict[int, int]) -> int:
+    """Relabels every card of a mask"""
+    relabelled = 0
+    for card_idx in _bit_indexes(mask):
+        relabelled |= 1 << _relabel_card(card_idx, suit_map)
+    return relabelled
+
+
+def canonicalize(position: Position) -> CanonicalForm:
+    """Relabels seats and suits of a position. The rules only compare suits for equality and
+    only follow seats in turn order, so positions with the same canonical form play the same.
+    Seats are numbered in turn order from the player to act, trump suits are numbered in seat
+    order, and suits no one holds as trump are ordered to give the smallest hands and stack.
+    Args:
+        position: position to relabel
+
+    Returns:
+        Canonical form with the relabelling applied
+    """
+    n_seats = len(position.hands)
+    seat_order = [position.to_act]
+    while len(seat_order) < n_seats:
+        seat_order.append(position.next_seats[seat_order[-1]])
+    seat_map = [0] * n_seats
+    for canonical_seat, seat in enumerate(seat_order):
+        seat_map[seat] = canonical_seat
+
+    owned_suits = []
+    for seat in seat_order:
+        if position.suits[seat] not in owned_suits:
+            owned_suits.append(position.suits[seat])
+    free_suits = [suit for suit in SUIT_LIST if suit not in owned_suits]
+
+    best: Optional[Tuple] = None
+    for free_order in itertools.permutations(free_suits):
+        suit_map = {
+            suit: SUIT_LIST[label]
+            for label, suit in enumerate(owned_suits + list(free_order))
+        }
+        hands = [_relabel_mask(position.hands[seat], suit_map) for seat in seat_order]
+        stack = [_relabel_card(card_idx, suit_map) for card_idx in position.stack]
+        if best is None or (hands, stack) < best[:2]:
+            best = hands, stack, suit_map
+    hands, stack, suit_map = best
+
+    canonical = Position(
+        hands=hands,
+        suits=[suit_map[position.suits[seat]] for seat in seat_order],
+        to_act=0,
+        stack=stack,
+        next_seats=[(seat + 1) % n_seats for seat in range(n_seats)],
+        phase=position.phase,
+    )
+    return CanonicalForm(canonical, seat_map, suit_map)
+
+
+def canonical_key(position: Position) -> int:
+    """Returns the hash shared by every position equivalent to the given one"""
+    return canonicalize(position).key
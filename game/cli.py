@@ -0,0 +1,187 @@
+"""Command line interface of Vezimas. Modules of a subcommand are only imported when it runs,
+so starting the interpreter for a short job stays cheap
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from player.player_functions import PlayerType
+
+# Module and class of every bot the command line can seat
+BOTS: Dict[str, Tuple[str, str]] = {
+    "random": ("player.player_functions", "RandomBot"),
+    "heuristic": ("player.heuristic_bot", "HeuristicBot"),
+    "ismcts": ("player.ismcts_bot", "ISMCTSBot"),
+}
+COMMANDS = ("play", "simulate", "tournament", "solve", "bench")
+
+
+def make_bot(name: str) -> "PlayerType":
+    """Creates a bot by its command line name, importing its module on first use
+    Args:
+        name: key of BOTS
+
+    Returns:
+        New bot with default settings
+    """
+    module, class_name = BOTS[name]
+    return getattr(importlib.import_module(module), class_name)()
+
+
+def play_command(args: argparse.Namespace) -> int:
+    """Plays a match in the terminal"""
+    from game.game_play import start_game
+
+    start_game(
+        player_count=args.players,
+        bot_count=args.bots,
+        bot_level=make_bot(args.bot),
+        seed=args.seed,
+    )
+    return 0
+
+
+def simulate_command(args: argparse.Namespace) -> int:
+    """Plays bot games headlessly and prints how often each seat lost"""
+    from game.simulation import TIED_GAME, simulate
+
+    start = time.perf_counter()
+    results = simulate(
+        args.games, [make_bot(args.bot) for _ in range(args.players)], args.seed
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"games {args.games} in {elapsed:.2f}s ({args.games / elapsed:.1f}/s)")
+    print(
+        f"mean turns {results.turns.mean():.1f}, ties {(results.loser == TIED_GAME).mean():.3f}"
+    )
+    for seat in range(args.players):
+        print(f"seat {seat} lost {(results.loser == seat).mean():.3f}")
+    return 0
+
+
+def tournament_command(args: argparse.Namespace) -> int:
+    """Plays matches between bots and prints the win rate of each bot"""
+    from game.tournament import run_tournament
+
+    results = run_tournament(
+        args.matches,
+        [make_bot(name) for name in args.lineup],
+        args.seed,
+        workers=args.workers,
+        labels=args.lineup,
+    )
+    for label, stats in results.type_stats.items():
+        print(
+            f"{label:12} won {stats.win_rate:.3f} [{stats.ci_low:.3f}, {stats.ci_high:.3f}] "
+            f"of {stats.matches} matches"
+        )
+    return 0
+
+
+def solve_command(args: argparse.Namespace) -> int:
+    """Solves a deal from its start and prints the forced loser"""
+    from game.position import move_to_card
+    from game.solvability_study import deal_position
+    from game.solver import SearchAborted, solve
+
+    position = deal_position(args.players, args.seed, args.deal)
+    try:
+        result = solve(position, max_nodes=args.max_nodes)
+    except SearchAborted:
+        print(f"search aborted after {args.max_nodes} nodes")
+        return 1
+
+    loser = "nobody" if result.loser is None else f"seat {result.loser}"
+    print(f"forced loser: {loser}")
+    print(f"best move of seat {position.to_act}: {move_to_card(result.best_move)}")
+    print(f"nodes {result.nodes}, table hit rate {result.hit_rate:.3f}")
+    return 0
+
+
+def bench_command(args: argparse.Namespace) -> int:
+    """Runs the benchmark suite, see benchmarks.run_benchmarks"""
+    from benchmarks.run_benchmarks import main as run_benchmarks
+
+    argv = list(args.names)
+    if args.history is not None:
+        argv += ["--history", args.history]
+    if args.threshold is not None:
+        argv += ["--threshold", str(args.threshold)]
+    if args.no_save:
+        argv.append("--no-save")
+    return run_benchmarks(argv)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the parser of every subcommand, each sets the function running it as handler"""
+    parser = argparse.ArgumentParser(
+        prog="vezimas", description="Play, simulate and analyse Vezimas"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(
+        name: str, handler: Callable[[argparse.Namespace], int]
+    ) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=handler.__doc__)
+        command.set_defaults(handler=handler)
+        return command
+
+    def add_seed(command: argparse.ArgumentParser, default: Optional[int] = 0):
+        command.add_argument("--seed", type=int, default=default)
+
+    play = add_command("play", play_command)
+    play.add_argument("--players", type=int, default=4)
+    play.add_argument("--bots", type=int, default=3)
+    play.add_argument("--bot", choices=BOTS, default="random")
+    add_seed(play, default=None)
+
+    simulate = add_command("simulate", simulate_command)
+    simulate.add_argument("--games", type=int, default=1000)
+    simulate.add_argument("--players", type=int, default=4)
+    simulate.add_argument("--bot", choices=BOTS, default="random")
+    add_seed(simulate)
+
+    tournament = add_command("tournament", tournament_command)
+    tournament.add_argument("lineup", nargs="+", choices=BOTS, metavar="BOT")
+    tournament.add_argument("--matches", type=int, default=100)
+    tournament.add_argument(
+        "--workers", type=int, default=None, help="all cores by default"
+    )
+    add_seed(tournament)
+
+    solve = add_command("solve", solve_command)
+    solve.add_argument("--players", type=int, default=2)
+    solve.add_argument("--deal", type=int, default=0, help="index of the deal")
+    solve.add_argument("--max-nodes", type=int, default=1_000_000)
+    add_seed(solve)
+
+    bench = add_command("bench", bench_command)
+    bench.add_argument("names", nargs="*", help="benchmarks to run, all by default")
+    bench.add_argument("--history", default=None)
+    bench.add_argument("--threshold", type=float, default=None)
+    bench.add_argument("--no-save", action="store_true")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs a subcommand, an interactive game is played when none is given
+    Args:
+        argv: (Optional) command line arguments, sys.argv is used otherwise
+
+    Returns:
+        Exit code of the subcommand
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv.insert(0, "play")
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
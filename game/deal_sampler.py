@@ -0,0 +1,224 @@
+"""Module for sampling deals of hidden cards consistent with what a player knows"""
+
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from deck.deck_functions import CARDS_BY_INDEX, popcount
+
+if TYPE_CHECKING:
+    from game.game_state import GameState
+    from player.player_functions import Player
+
+N_CARDS = len(CARDS_BY_INDEX)
+
+
+class HandConstraints(NamedTuple):
+    """What is known about the hand of every seat, seats follow the order of the game players
+    Args:
+        fixed: cards known to be in each hand, as masks
+        counts: number of cards in each hand
+        possible: cards each hand could hold, fixed cards included, as masks
+    """
+
+    fixed: Tuple[int, ...]
+    counts: Tuple[int, ...]
+    possible: Tuple[int, ...]
+
+
+def hand_constraints(game_state: "GameState", observer: "Player") -> HandConstraints:
+    """Collects what a player knows about every hand: their own hand, card counts, the cards
+    others picked up and the nine of their trump suit they were given, and cards already played
+    Args:
+        game_state: game state or a private snapshot of it
+        observer: player whose knowledge to collect
+
+    Returns:
+        Constraints of the hands of every seat
+    """
+    own_mask = observer.hand.mask
+    unseen = game_state.unseen_mask & ~own_mask
+    fixed, counts, possible = [], [], []
+    for player in game_state.players:
+        state = game_state.player_state[player.name]
+        if player is observer:
+            fixed.append(own_mask)
+            counts.append(len(observer.hand))
+            possible.append(own_mask)
+        elif not state["is_active"]:
+            fixed.append(0)
+            counts.append(0)
+            possible.append(0)
+        else:
+            known = state["known_cards"].mask & ~own_mask
+            fixed.append(known)
+            counts.append(state["no_cards"])
+            possible.append(game_state.possible_masks[player.name] & (known | unseen))
+    return HandConstraints(tuple(fixed), tuple(counts), tuple(possible))
+
+
+class _CardClass(NamedTuple):
+    """Hidden cards that may go to the same seats"""
+
+    seats: Tuple[int, ...]
+    bits: np.ndarray
+
+
+def _compositions(total: int, caps: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+    """Returns every way of splitting total cards between seats without going over their caps"""
+    if not caps:
+        return [()] if total == 0 else []
+    if len(caps) == 1:
+        return [(total,)] if total <= caps[0] else []
+    return [
+        (first,) + rest
+        for first in range(min(total, caps[0]) + 1)
+        for rest in _compositions(total - first, caps[1:])
+    ]
+
+
+class DealSampler:
+    """Samples deals uniformly from every deal of hidden cards consistent with hand constraints.
+    Hidden cards are grouped by the seats that may hold them, the number of completions of each
+    split of a group is counted exactly, so every deal is drawn without rejection however
+    constraints interact. Deals are returned as hand masks, ready for a Position or BatchEngine.
+    Args:
+        constraints: what is known about every hand
+
+    Raises:
+        ValueError: no deal is consistent with the constraints
+    """
+
+    def __init__(self, constraints: HandConstraints):
+        self.constraints = constraints
+        self.n_seats = len(constraints.counts)
+        fixed_mask = 0
+        for fixed in constraints.fixed:
+            fixed_mask |= fixed
+        free = [
+            count - popcount(fixed)
+            for count, fixed in zip(constraints.counts, constraints.fixed)
+        ]
+        hidden = 0
+        for possible in constraints.possible:
+            hidden |= possible
+        hidden &= ~fixed_mask
+        # Hidden cards beyond the ones hands are missing may be in no hand, an extra seat takes them
+        slack = popcount(hidden) - sum(free)
+        if min(free) < 0 or slack < 0:
+            raise ValueError("No deal is consistent with the constraints")
+        self._free = tuple(free) + (slack,)
+
+        classes: Dict[Tuple[int, ...], List[int]] = {}
+        for card_idx in range(N_CARDS):
+            if hidden >> card_idx & 1:
+                seats = tuple(
+                    seat
+                    for seat in range(self.n_seats)
+                    if constraints.possible[seat] >> card_idx & 1 and free[seat]
+                ) + ((self.n_seats,) if slack else ())
+                classes.setdefault(seats, []).append(1 << card_idx)
+        self._classes = [
+            _CardClass(seats, np.array(bits, dtype=np.int64))
+            for seats, bits in classes.items()
+        ]
+        self._ways: Dict[Tuple[int, Tuple[int, ...]], int] = {}
+        self._options: Dict[
+            Tuple[int, Tuple[int, ...]], Tuple[np.ndarray, np.ndarray]
+        ] = {}
+
+        self.n_deals = self._count(0, self._free)
+        if not self.n_deals:
+            raise ValueError("No deal is consistent with the constraints")
+
+    def _splits(
+        self, class_no: int, caps: Tuple[int, ...]
+    ) -> List[Tuple[Tuple[int, ...], int]]:
+        """Returns every split of a class with the number of deals it leads to"""
+        card_class = self._classes[class_no]
+        n_cards = len(card_class.bits)
+        splits = []
+        for split in _compositions(
+            n_cards, tuple(caps[seat] for seat in card_class.seats)
+        ):
+            rest = list(caps)
+            for seat, taken in zip(card_class.seats, split):
+                rest[seat] -= taken
+            ways = self._count(class_no + 1, tuple(rest))
+            if ways:
+                arrangements = math.factorial(n_cards)
+                for taken in split:
+                    arrangements //= math.factorial(taken)
+                splits.append((split, arrangements * ways))
+        return splits
+
+    def _count(self, class_no: int, caps: Tuple[int, ...]) -> int:
+        """Counts deals of the classes from class_no on that fill the capacities exactly"""
+        if class_no == len(self._classes):
+            return int(not any(caps))
+        key = (class_no, caps)
+        ways = self._ways.get(key)
+        if ways is None:
+            ways = sum(ways for _, ways in self._splits(class_no, caps))
+            self._ways[key] = ways
+        return ways
+
+    def _split_options(
+        self, class_no: int, caps: Tuple[int, ...]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns splits of a class as rows of taken cards with their probabilities"""
+        key = (class_no, caps)
+        options = self._options.get(key)
+        if options is None:
+            splits = self._splits(class_no, caps)
+            total = sum(ways for _, ways in splits)
+            options = (
+                np.array([split for split, _ in splits], dtype=np.int64),
+                np.array([ways / total for _, ways in splits]),
+            )
+            self._options[key] = options
+        return options
+
+    def sample(
+        self, n_deals: int, rng: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        """Draws deals uniformly and independently
+        Args:
+            n_deals: number of deals to draw
+            rng: (Optional) random generator, a fresh one is used otherwise
+
+        Returns:
+            Hand masks of every seat in each deal, shaped (n_deals, n_seats)
+        """
+        rng = rng or np.random.default_rng()
+        hands = np.tile(np.array(self.constraints.fixed, dtype=np.int64), (n_deals, 1))
+        hands = np.hstack([hands, np.zeros((n_deals, 1), dtype=np.int64)])
+        caps = np.tile(np.array(self._free, dtype=np.int64), (n_deals, 1))
+
+        for class_no, card_class in enumerate(self._classes):
+            seats = list(card_class.seats)
+            n_cards = len(card_class.bits)
+            if len(seats) == 1:
+                taken = np.full((n_deals, 1), n_cards, dtype=np.int64)
+            else:
+                taken = np.empty((n_deals, len(seats)), dtype=np.int64)
+                states, inverse = np.unique(caps, axis=0, return_inverse=True)
+                for state_no, state in enumerate(states):
+                    rows = np.flatnonzero(inverse.ravel() == state_no)
+                    splits, probabilities = self._split_options(
+                        class_no, tuple(state.tolist())
+                    )
+                    taken[rows] = splits[
+                        rng.choice(len(splits), size=len(rows), p=probabilities)
+                    ]
+            caps[:, seats] -= taken
+
+            # Cards of a class go to its seats in the order of a random permutation
+            shuffled = card_class.bits[rng.random((n_deals, n_cards)).argsort(axis=1)]
+            owner = (
+                np.arange(n_cards)[None, :, None] >= taken.cumsum(axis=1)[:, None, :]
+            ).sum(axis=2)
+            for seat_no, seat in enumerate(seats):
+                hands[:, seat] |= np.where(owner == seat_no, shuffled, 0).sum(axis=1)
+        return hands[:, : self.n_seats]
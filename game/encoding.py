@@ -0,0 +1,138 @@
+"""Module for encoding private views of a game state as fixed shape feature rows"""
+
+from typing import Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from deck.card_encoding import SUITS
+from deck.deck_functions import CARDS_BY_INDEX
+from game.position import BEAT, LEAD, MAX_SEATS, PLAY
+
+if TYPE_CHECKING:
+    from game.game_state import GameState
+    from player.player_functions import Player
+
+N_CARDS = len(CARDS_BY_INDEX)
+N_SUITS = len(SUITS)
+
+# Card planes of an encoding, each holds one bit per card. Opponents follow the observer in turn
+# order, seats missing at smaller tables stay empty
+HAND_PLANE = 0
+KNOWN_PLANES = 1  # One plane per opponent
+UNSEEN_PLANE = KNOWN_PLANES + MAX_SEATS - 1
+STACK_PLANE = UNSEEN_PLANE + 1
+TOP_CARD_PLANE = STACK_PLANE + 1
+N_CARD_PLANES = TOP_CARD_PLANE + 1
+
+# Offsets of the features following the card planes, seats are relative to the observer
+CARD_COUNTS = N_CARD_PLANES * N_CARDS  # Cards in each hand, as a fraction of the deck
+ACTIVE = CARD_COUNTS + MAX_SEATS  # 1 for seats still in the trick
+TRUMPS = ACTIVE + MAX_SEATS  # One hot trump suit of each seat
+PHASE = TRUMPS + MAX_SEATS * N_SUITS  # One hot lead, beat or play phase
+ENCODING_SIZE = PHASE + 3
+
+_CARD_SHIFTS = np.arange(N_CARDS, dtype=np.int64)
+_SEAT_INFO = 3  # Card count, active flag and trump suit of a seat
+
+
+class StateEncoder:
+    """Encodes private views of game states straight into rows of a batch buffer. Python only
+    gathers integer masks and counts into preallocated scratch arrays, the planes of a whole batch
+    are then unpacked by a few vectorized operations.
+    Args:
+        batch_size: largest number of states encoded in one call
+    """
+
+    def __init__(self, batch_size: int = 1):
+        self.batch_size = batch_size
+        self._masks = np.zeros((batch_size, N_CARD_PLANES), dtype=np.int64)
+        self._seats = np.zeros((batch_size, MAX_SEATS, _SEAT_INFO), dtype=np.int64)
+        self._phases = np.zeros(batch_size, dtype=np.int64)
+        self._bits = np.zeros((batch_size, N_CARD_PLANES, N_CARDS), dtype=np.int64)
+
+    def encode(
+        self,
+        out: np.ndarray,
+        game_states: Sequence["GameState"],
+        observers: Sequence["Player"],
+    ) -> np.ndarray:
+        """Writes the view of each observer of its game state into a row of out
+        Args:
+            out: buffer of at least len(observers) rows of ENCODING_SIZE, floating point
+            game_states: game state of each row, shared by rows of the same game
+            observers: player whose private view to encode in each row
+
+        Returns:
+            Rows of out that were written
+        """
+        size = len(observers)
+        if size > self.batch_size:
+            raise ValueError(
+                f"Batch of {size} states is larger than the encoder batch size {self.batch_size}"
+            )
+        masks, seats, phases = (
+            self._masks[:size],
+            self._seats[:size],
+            self._phases[:size],
+        )
+        masks[:] = 0
+        seats[:] = 0
+        for row, (game_state, observer) in enumerate(zip(game_states, observers)):
+            row_masks, row_seats = masks[row], seats[row]
+            player_state = game_state.player_state
+            card_stack = game_state.play_state["card_stack"]
+            hand_mask = observer.hand.mask
+
+            row_masks[HAND_PLANE] = hand_mask
+            row_masks[UNSEEN_PLANE] = game_state.unseen_mask & ~hand_mask
+            if card_stack:
+                stack_mask = 0
+                for card in card_stack:
+                    stack_mask |= 1 << card.index
+                row_masks[STACK_PLANE] = stack_mask
+                row_masks[TOP_CARD_PLANE] = 1 << card_stack[-1].index
+
+            player = observer
+            for seat in range(len(game_state.players)):
+                state = player_state[player.name]
+                if seat:
+                    row_masks[KNOWN_PLANES + seat - 1] = state["known_cards"].mask
+                row_seats[seat, 0] = state["no_cards"]
+                row_seats[seat, 1] = state["is_active"]
+                row_seats[seat, 2] = state["suit"]
+                player = player.next_player_init
+
+            if game_state.play_state["card_to_beat"]:
+                phases[row] = BEAT
+            else:
+                phases[row] = PLAY if card_stack else LEAD
+
+        rows = out[:size]
+        rows[:] = 0
+        bits = self._bits[:size]
+        np.right_shift(masks[:, :, None], _CARD_SHIFTS, out=bits)
+        np.bitwise_and(bits, 1, out=bits)
+        rows[:, :CARD_COUNTS] = bits.reshape(size, -1)
+        rows[:, CARD_COUNTS:ACTIVE] = seats[:, :, 0] / N_CARDS
+        rows[:, ACTIVE:TRUMPS] = seats[:, :, 1]
+
+        sample_rows, seat_cols = np.nonzero(seats[:, :, 2])
+        rows[
+            sample_rows,
+            TRUMPS + seat_cols * N_SUITS + seats[sample_rows, seat_cols, 2] - 1,
+        ] = 1
+        rows[np.arange(size), PHASE + phases] = 1
+        return rows
+
+
+def encode_state(game_state: "GameState", observer: "Player") -> np.ndarray:
+    """Encodes the private view of a single player
+    Args:
+        game_state: game state to encode
+        observer: player whose view to encode
+
+    Returns:
+        Feature row of ENCODING_SIZE float32 values
+    """
+    out = np.empty((1, ENCODING_SIZE), dtype=np.float32)
+    return StateEncoder().encode(out, [game_state], [observer])[0]
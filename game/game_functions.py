@@ -1,9 +1,44 @@
-from typing import Optional, List
+import random
+from typing import NamedTuple, Optional, List
 
 from deck.card_encoding import SUITS
-from deck.deck_functions import Deck, Card, QUEEN_OF_SPADES, NINES
+from deck.deck_functions import (
+    Deck,
+    Card,
+    CardSet,
+    QUEEN_OF_SPADES,
+    NINES,
+    CARDS_BY_INDEX,
+)
+from game.game_log import (
+    GameLog,
+    LEAD_CARD,
+    BEAT_CARD,
+    PLAY_CARD,
+    PICKUP_CARDS,
+    PLAYER_OUT,
+    PLAYER_LOST,
+    GAME_TIED,
+    NO_SEAT,
+)
 from game.game_state import GameState
-from player.player_functions import Player, MyCycle, PlayerType, HumanInput
+from game.profiling import (
+    GameProfiler,
+    DEAL,
+    SHARE_NINES,
+    SORT,
+    MOVE_GENERATION,
+    DECISION,
+    STATE_UPDATE,
+    MOVES,
+    PICKUPS,
+    ELIMINATIONS,
+)
+from game.time_control import TimeControl
+from game.position import BEAT, LEAD, PLAY, PICKUP, PICKUP_BIT, Position, card_to_move
+from game.rules import is_legal_beat, get_legal_beat_mask
+from game.turn_order import TurnOrder
+from player.player_functions import Player, PlayerType, HumanInput
 from collections import deque
 
 
@@ -15,6 +50,9 @@ class Vezimas:
         player_names: (Optional) provide names for players, otherwise they will be numbered
         bot_count: number of bots to include
         bot_level: bot class for bots to play as
+        player_types: (Optional) player type for each seat, overrides bot_count and bot_level
+        profiler: (Optional) profiler timing phases of the game and its tricks
+        time_control: (Optional) time budgets of the decisions of player types
     """
 
     def __init__(
@@ -22,14 +60,24 @@ class Vezimas:
         deck_of_cards: Deck,
         player_count: int,
         bot_count: int,
-        bot_level: PlayerType,
+        bot_level: Optional[PlayerType],
         player_names: Optional[List[str]] = None,
+        player_types: Optional[List[PlayerType]] = None,
+        profiler: Optional[GameProfiler] = None,
+        time_control: Optional[TimeControl] = None,
     ):
         self.deck = deck_of_cards
+        self.profiler = profiler
+        self.time_control = time_control
         self.player_count = player_count
         self.bot_count = bot_count
         self.bot_level = bot_level
 
+        if player_types and player_count != len(player_types):
+            raise ValueError(
+                f"Incorrect number of player types provided, expected {player_count}, got {len(player_types)}"
+            )
+
         self.human_count = player_count - bot_count
 
         if player_names and player_count != len(player_names):
@@ -44,9 +92,13 @@ class Vezimas:
         self.player_names = player_names or [f"Player {i}" for i in range(player_count)]
         self.bot_list = [False] * self.human_count + [True] * self.bot_count
 
+        self.player_types = player_types or [
+            self.bot_level if bot_flag else HumanInput() for bot_flag in self.bot_list
+        ]
+
         self.players = [
-            Player(name, self.bot_level if bot_flag else HumanInput())
-            for name, bot_flag in zip(self.player_names, self.bot_list)
+            Player(name, player_type)
+            for name, player_type in zip(self.player_names, self.player_types)
         ]
 
     def set_player_reference(self):
@@ -69,12 +121,19 @@ class Vezimas:
         for player in self.players:
             player.reset_player_reference()
 
-    def deal_cards(self):
-        """Method that shuffles and deals cards to the players"""
+    def deal_cards(self, rng: Optional[random.Random] = None):
+        """Method that shuffles and deals cards to the players
+        Args:
+            rng: (Optional) random generator to shuffle with, for reproducible deals
+        """
+        if self.profiler is not None:
+            started = self.profiler.now()
         cards_per_player = int(len(self.deck) / self.player_count)
-        self.deck.shuffle()
+        self.deck.shuffle(rng)
         for player in self.players:
             player.add_cards(self.deck.deal(cards_per_player))
+        if self.profiler is not None:
+            self.profiler.add(DEAL, started)
 
     def set_trumps(self):
         """Setting trumps for the players using Queen of spades start of game method
@@ -95,12 +154,22 @@ class Vezimas:
                     next_player = next_player.next_player
                 return player
 
+    def reset_trumps(self):
+        """Method for clearing trumps and starting player so they can be set for a new deal"""
+        for player in self.players:
+            player.suit = None
+            player.starting_player = False
+
     def share_nines(self):
         """Method for `returning` each nine card to its suits owner"""
+        if self.profiler is not None:
+            started = self.profiler.now()
         for player in self.players:
             player.remove_cards(NINES)
             nine_to_add = Card((9, player.suit))
             player.add_cards([nine_to_add])
+        if self.profiler is not None:
+            self.profiler.add(SHARE_NINES, started)
 
     def remove_starting_player_flags(self):
         """Method for resetting starting player flag"""
@@ -116,7 +185,11 @@ class Vezimas:
 
     def sort_cards(self):
         """Method for sorting cards of each player"""
+        if self.profiler is not None:
+            started = self.profiler.now()
         [player.sort_cards() for player in self.players]
+        if self.profiler is not None:
+            self.profiler.add(SORT, started)
 
     def check_worst_player(self) -> Player:
         """Method for checking score of worst player"""
@@ -128,6 +201,16 @@ class Vezimas:
         self.deck.reset_deck()
 
 
+def get_next_active_suit(player: Player) -> int:
+    """Returns the suit of the next player in line that still has cards
+    Args:
+        player: player that is making the play
+
+    Returns: suit of the next active player
+    """
+    return player.next_active_player().suit
+
+
 def check_play_validity(
     card_stack: List[Card], card_to_beat: Optional[Card], player: Player
 ) -> bool:
@@ -141,186 +224,276 @@ def check_play_validity(
     """
     if not card_to_beat:
         return True
-    last_card = card_stack[-1]
-    next_player_suit = None
-    next_player_to_play = player.next_player
-
-    while next_player_suit is None:
-        if next_player_to_play.hand:
-            next_player_suit = next_player_to_play.suit
-        else:
-            next_player_to_play = next_player_to_play.next_player
-
-    if last_card.suit == player.suit and card_to_beat.suit != player.suit:
-        return False
-
-    if last_card.suit == player.suit and last_card > card_to_beat:
-        return False
-
-    if last_card.suit == next_player_suit and card_to_beat.suit != player.suit:
-        return False
+    return is_legal_beat(
+        card_stack[-1], card_to_beat, player.suit, get_next_active_suit(player)
+    )
 
-    if last_card.suit != next_player_suit and last_card.suit != player.suit:
-        if card_to_beat.suit != player.suit:
-            if card_to_beat.suit != last_card.suit:
-                return False
-            if last_card > card_to_beat:
-                return False
 
-    return True
-
-
-def get_available_play_card(card_stack: List[Card], player: Player) -> List[Card]:
-    """Returns list of cards in hand available for legal play
+def get_available_play_card(card_stack: List[Card], player: Player) -> CardSet:
+    """Returns set of cards in hand available for legal play
     Args:
         card_stack: stack of cards already played
         player: player that is making the play
 
-    Returns: List of legal play cards
+    Returns: Set of legal play cards
     """
+    legal_mask = get_legal_beat_mask(
+        card_stack[-1].index, player.suit, get_next_active_suit(player)
+    )
+    return CardSet(player.hand.mask & legal_mask)
+
 
-    legal_card_idx_to_play = [
-        card for card in player.hand if check_play_validity(card_stack, card, player)
-    ]
+class Decision(NamedTuple):
+    """Decision a player has to make in a trick
+    Args:
+        seat: seat of the deciding player
+        player: deciding player
+        phase: turn phase of the decision
+        list_of_cards: cards the player may play
+        play_no: placement of 1st or 2nd card (1,2)
+        allow_pickup: flag if card pickup is a viable move
+    """
 
-    return legal_card_idx_to_play
+    seat: int
+    player: Player
+    phase: int
+    list_of_cards: CardSet
+    play_no: int
+    allow_pickup: bool
 
 
 class VezimasSubgame:
-    """Class of playing the trick/subgame of Vezimas"""
+    """Class of playing the trick/subgame of Vezimas
+    Args:
+        main_game: game whose players play the trick
+        record_log: flag to record moves in the game log, disable for headless simulations
+    """
 
-    def __init__(self, main_game: Vezimas):
+    def __init__(self, main_game: Vezimas, record_log: bool = True):
         self.main_game = main_game
-        self.game_log = list()
-
-        # creates cycle list starting from player who has its starting player flag set
-        _player_to_add = self.main_game.get_starting_player()
-        _player_list = []
-        for i in range(self.main_game.player_count):
-            _player_list.append(_player_to_add)
-            _player_to_add = _player_to_add.next_player
-
-        self.player_cycle = MyCycle(_player_list)
+        self.record_log = record_log
+        self.game_log = GameLog(self.main_game.players)
+        self._seats = {
+            id(player): seat for seat, player in enumerate(main_game.players)
+        }
+        self.turn_count = 0
+        self.pickup_count = 0
+        # Deal of the trick, kept so the game log can be replayed
+        self.initial_hands: List[int] = []
+        # Position of the trick and game state shown to players, built by setup_position
+        self.position: Optional[Position] = None
+        self.public_game_state: Optional[GameState] = None
+        # Profiler reading at the start of the decision in play, set by begin_decision
+        self._decision_started = 0.0
+
+        # turn order starting from player who has its starting player flag set
+        self.turn_order = TurnOrder(
+            [self._seats[id(player.next_player)] for player in main_game.players],
+            self._seats[id(self.main_game.get_starting_player())],
+        )
         self.card_stack = []
 
+    def remaining_players(self) -> List[Player]:
+        """Returns players still in the trick in turn order"""
+        return [self.main_game.players[seat] for seat in self.turn_order.seats()]
+
     def pickup_cards(self, player: Player):
         """Method for picking up cards and resetting card stack"""
+        self.pickup_count += 1
         player.add_cards(self.card_stack)
         self.card_stack = []
 
     def start_game(self):
-        """Method for starting the trick of Vezimas"""
+        """Method for starting the trick of Vezimas, asks player types for moves until it ends
 
-        public_game_state = GameState(
-            players=self.main_game.players, card_stack=list(), card_to_beat=False
-        )
+        Returns:
+            Player who lost the trick, None if it was tied
+        """
+        self.setup_position()
+        while not self.position.is_over:
+            self.play_decision()
+        return self.finish_game()
+
+    def play_decision(self):
+        """Asks the player type to act for its move and plays it"""
+        decision = self.begin_decision()
+        self.complete_decision(decision, self.ask_player_type(decision))
+
+    def begin_decision(self) -> Decision:
+        """Prepares the next decision like next_decision, then starts its clock and passes its
+        deadline to the player type. Loops that get the move elsewhere, like the tables of
+        game.server, pair it with complete_decision.
 
-        for player_turn in self.player_cycle:
-            self.game_log.append("\n")
-            self.game_log.append(f"{player_turn.name}{SUITS[player_turn.suit]}: ")
-
-            # If card stack is empty play one card
-            if not self.card_stack:
-                public_game_state.adjust_card_to_beat(False)
-
-                card_to_play_first = player_turn.player_type.select_card_to_play(
-                    list_of_cards=player_turn.hand,
-                    player=player_turn,
-                    card_stack=self.card_stack,
-                    play_history=self.game_log,
-                    game_state=public_game_state,
-                    play_no=1,
-                    allow_pickup=False,
-                )
+        Returns:
+            Decision the player to act has to make
+        """
+        profiler = self.main_game.profiler
+        time_control = self.main_game.time_control
+        if profiler is not None:
+            started = profiler.now()
+        decision = self.next_decision()
+        if profiler is not None:
+            self._decision_started = profiler.add(MOVE_GENERATION, started)
+        if time_control is not None:
+            decision.player.player_type.set_deadline(
+                time_control.start_decision(decision.seat)
+            )
+        return decision
+
+    def complete_decision(self, decision: Decision, card: Optional[Card]):
+        """Stops the clock of a decision begun with begin_decision and plays its move
+        Args:
+            decision: decision returned by begin_decision
+            card: card chosen for the decision, None to pick up
+        """
+        profiler = self.main_game.profiler
+        time_control = self.main_game.time_control
+        if time_control is not None:
+            time_control.end_decision(decision.seat)
+        if profiler is not None:
+            started = profiler.add(DECISION, self._decision_started)
+
+        self.play_move(card_to_move(card))
+        if profiler is not None:
+            profiler.add(STATE_UPDATE, started)
+
+    def next_decision(self) -> Decision:
+        """Prepares the decision of the player to act and shows the game state whether a card
+        has to be beaten
+
+        Returns:
+            Decision the player to act has to make
+        """
+        seat, phase = self.position.to_act, self.position.phase
+        player_turn = self.main_game.players[seat]
+        self.public_game_state.adjust_card_to_beat(phase == BEAT)
+        if phase == BEAT:
+            list_of_cards = CardSet(self.position.legal_move_mask() & ~PICKUP_BIT)
+        else:
+            list_of_cards = player_turn.hand
+        return Decision(
+            seat=seat,
+            player=player_turn,
+            phase=phase,
+            list_of_cards=list_of_cards,
+            play_no=2 if phase == PLAY else 1,
+            allow_pickup=phase != LEAD,
+        )
 
-                player_turn.remove_cards([card_to_play_first])
-                self.card_stack.append(card_to_play_first)
+    def ask_player_type(self, decision: Decision) -> Optional[Card]:
+        """Asks the player type of the deciding player for its move
+        Args:
+            decision: decision returned by next_decision
 
-                self.game_log.append(f"1st card: {card_to_play_first} ")
-                public_game_state.remove_known_cards(
-                    player_turn, [card_to_play_first], self.card_stack
-                )
+        Returns:
+            Card to play or None to pick up
+        """
+        player_turn = decision.player
+        if decision.phase == BEAT:
+            return player_turn.player_type.select_card_to_beat(
+                list_of_cards=decision.list_of_cards,
+                player=player_turn,
+                card_stack=self.card_stack,
+                play_history=self.game_log,
+                game_state=self.public_game_state,
+                play_no=decision.play_no,
+            )
+        # If card stack is empty play one card, if still cards in hand after beating continue play
+        return player_turn.player_type.select_card_to_play(
+            list_of_cards=decision.list_of_cards,
+            player=player_turn,
+            card_stack=self.card_stack,
+            play_history=self.game_log,
+            game_state=self.public_game_state,
+            play_no=decision.play_no,
+            allow_pickup=decision.allow_pickup,
+        )
 
-            # If card stack is not empty play cards
-            else:
-                public_game_state.adjust_card_to_beat(True)
+    def finish_game(self) -> Optional[Player]:
+        """Scores the finished trick and logs its result
 
-                legal_cards_to_play = get_available_play_card(
-                    self.card_stack, player_turn
-                )
-                card_to_beat = player_turn.player_type.select_card_to_beat(
-                    list_of_cards=legal_cards_to_play,
-                    player=player_turn,
-                    card_stack=self.card_stack,
-                    play_history=self.game_log,
-                    game_state=public_game_state,
-                    play_no=1,
+        Returns:
+            Player who lost the trick, None if it was tied
+        """
+        if self.position.loser is None:
+            if self.record_log:
+                self.game_log.append(self.turn_count, NO_SEAT, GAME_TIED)
+            return None
+
+        lost_player = self.main_game.players[self.position.loser]
+        lost_player.score += 1
+        if self.record_log:
+            self.game_log.append(self.turn_count, self.position.loser, PLAYER_LOST)
+        return lost_player
+
+    def setup_position(self):
+        """Builds the position and public game state of the dealt trick and sets the game clocks,
+        needed before play_move
+        """
+        players = self.main_game.players
+        self.public_game_state = GameState(
+            players=players, card_stack=list(), card_to_beat=False
+        )
+        self.initial_hands = [player.hand.mask for player in players]
+        self.position = Position(
+            hands=self.initial_hands,
+            suits=[player.suit for player in players],
+            to_act=self.turn_order.current,
+            next_seats=self.turn_order.next_seats,
+        )
+        if self.main_game.time_control is not None:
+            self.main_game.time_control.start_game(len(players))
+
+    def play_move(self, move: int):
+        """Plays a move of the player to act on the position and on the players, card stack,
+        game state and log, so the trick can be driven one move at a time
+        Args:
+            move: card bit index or PICKUP, must be legal in the current position
+        """
+        position = self.position
+        if not position.legal_move_mask() >> move & 1:
+            raise ValueError(f"Move {move} is not legal in the current position")
+        seat, phase, n_active = position.to_act, position.phase, position.n_active
+        player_turn = self.main_game.players[seat]
+        if phase != PLAY:
+            self.turn_count += 1
+
+        if move == PICKUP:
+            # Pickup cards
+            if self.record_log:
+                self.game_log.append(
+                    self.turn_count, seat, PICKUP_CARDS, len(self.card_stack)
                 )
+            self.public_game_state.add_known_cards(player_turn, self.card_stack)
+            self.pickup_cards(player_turn)
+        else:
+            card = CARDS_BY_INDEX[move]
+            player_turn.remove_cards([card])
+            self.card_stack.append(card)
+
+            if self.record_log:
+                action = {LEAD: LEAD_CARD, BEAT: BEAT_CARD, PLAY: PLAY_CARD}[phase]
+                self.game_log.append(self.turn_count, seat, action, move)
+            self.public_game_state.remove_known_cards(
+                player_turn, [card], self.card_stack
+            )
 
-                if card_to_beat:
-                    player_turn.remove_cards([card_to_beat])
-                    self.card_stack.append(card_to_beat)
-
-                    self.game_log.append(f"1st card: {card_to_beat} ")
-                    public_game_state.remove_known_cards(
-                        player_turn, [card_to_beat], self.card_stack
-                    )
-
-                    if player_turn.hand:
-                        # If still cards in hand, continue play
-                        public_game_state.adjust_card_to_beat(False)
-
-                        card_to_play = player_turn.player_type.select_card_to_play(
-                            list_of_cards=player_turn.hand,
-                            player=player_turn,
-                            card_stack=self.card_stack,
-                            play_history=self.game_log,
-                            game_state=public_game_state,
-                            play_no=2,
-                        )
-                        if card_to_play:
-                            player_turn.remove_cards([card_to_play])
-                            self.card_stack.append(card_to_play)
-
-                            self.game_log.append(f"2nd card: {card_to_play}")
-                            public_game_state.remove_known_cards(
-                                player_turn, [card_to_play], self.card_stack
-                            )
-                        else:
-                            # Pickup cards
-                            self.game_log.append(
-                                f"Pickup cards({len(self.card_stack)})"
-                            )
-                            public_game_state.add_known_cards(
-                                player_turn, self.card_stack
-                            )
-
-                            self.pickup_cards(player_turn)
-                            player_turn.sort_cards()
-                else:
-                    # Pickup cards
-                    self.game_log.append(f"Pickup cards({len(self.card_stack)})")
-                    public_game_state.add_known_cards(player_turn, self.card_stack)
-
-                    self.pickup_cards(player_turn)
-                    player_turn.sort_cards()
-
-            # Remove player from playing trick if he has no more cards and adjust references
-            if not player_turn.hand:
-                self.player_cycle.remove(player_turn)
-                player_turn.previous_player.next_player = player_turn.next_player
-                player_turn.next_player.previous_player = player_turn.previous_player
-
-                self.game_log.append(f"{player_turn.name} won")
-                public_game_state.remove_player(player_turn)
-
-            # End game when there is only one person left
-            if len(self.player_cycle) == 1:
-                lost_player = self.player_cycle.elements()[0]
-                lost_player.score += 1
-                self.game_log.append(f"{lost_player.name} lost the game")
-                return lost_player
-
-            if len(self.player_cycle) == 0:
-                self.game_log.append(f"Game was tied")
-                break
+        position.step(move)
+
+        # Remove player from playing trick if he has no more cards
+        eliminated = position.n_active < n_active
+        if eliminated:
+            self.turn_order.remove(seat)
+            if self.record_log:
+                self.game_log.append(self.turn_count, seat, PLAYER_OUT)
+            self.public_game_state.remove_player(player_turn)
+        if position.to_act != seat:
+            self.turn_order.current = position.to_act
+
+        profiler = self.main_game.profiler
+        if profiler is not None:
+            profiler.count(MOVES)
+            if move == PICKUP:
+                profiler.count(PICKUPS)
+            if eliminated:
+                profiler.count(ELIMINATIONS)
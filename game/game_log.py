@@ -0,0 +1,159 @@
+"""Module containing a compact, structured move log of a Vezimas trick"""
+
+from array import array
+from functools import lru_cache
+from typing import List, Optional, TYPE_CHECKING
+
+from deck.card_encoding import SUITS
+from deck.deck_functions import CARDS_BY_INDEX
+from player.player_functions import Player
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Action of a log record
+LEAD_CARD = 0
+BEAT_CARD = 1
+PLAY_CARD = 2
+PICKUP_CARDS = 3
+PLAYER_OUT = 4
+PLAYER_LOST = 5
+GAME_TIED = 6
+# Card field of records without a card, pickups store the number of cards picked up instead
+NO_CARD = -1
+NO_SEAT = -1
+
+LOG_FIELDS = ("turn", "seat", "action", "card")
+
+
+@lru_cache(maxsize=None)
+def _log_dtype() -> "np.dtype":
+    """Fixed width record of 4 int16 fields, 8 bytes a move. Built on first use, so playing
+    and logging a game never imports numpy
+    """
+    import numpy as np
+
+    return np.dtype([(field, np.int16) for field in LOG_FIELDS])
+
+
+def __getattr__(name: str):
+    """Resolves LOG_DTYPE lazily"""
+    if name == "LOG_DTYPE":
+        return _log_dtype()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class GameLog:
+    """Append only log of a trick stored as fixed width (turn, seat, action, card) records in a
+    flat buffer, text is only rendered when asked for
+    Args:
+        players: (Optional) players of the game, their index is the seat of a record and their
+            names and suits are used for rendering
+    """
+
+    def __init__(self, players: Optional[List[Player]] = None):
+        self.player_names = [player.name for player in players or []]
+        self.player_suits = [player.suit for player in players or []]
+        self._buffer = array("h")
+
+    def __len__(self):
+        return len(self._buffer) // len(LOG_FIELDS)
+
+    def __bool__(self):
+        return bool(self._buffer)
+
+    def __str__(self):
+        return self.render()
+
+    def append(self, turn: int, seat: int, action: int, card: int = NO_CARD):
+        """Adds a record to the log
+        Args:
+            turn: number of the turn the action was taken in
+            seat: seat index of the acting player, NO_SEAT for GAME_TIED
+            action: action of the record
+            card: bit index of the card played, number of cards for PICKUP_CARDS
+        """
+        self._buffer.extend((turn, seat, action, card))
+
+    @property
+    def records(self) -> "np.ndarray":
+        """Records as a structured array sharing memory with the log"""
+        import numpy as np
+
+        return np.frombuffer(self._buffer, dtype=_log_dtype())
+
+    def render(self) -> str:
+        """Renders the log as the text shown to human players"""
+        lines = []
+        turn = None
+        fields = iter(self._buffer)
+        for record_turn, seat, action, card in zip(*[fields] * len(LOG_FIELDS)):
+            if action in (LEAD_CARD, BEAT_CARD, PICKUP_CARDS) and record_turn != turn:
+                turn = record_turn
+                lines.append(f"\n{self._name(seat)}{self._suit(seat)}: ")
+
+            if action in (LEAD_CARD, BEAT_CARD):
+                lines.append(f"1st card: {CARDS_BY_INDEX[card]} ")
+            elif action == PLAY_CARD:
+                lines.append(f"2nd card: {CARDS_BY_INDEX[card]}")
+            elif action == PICKUP_CARDS:
+                lines.append(f"Pickup cards({card})")
+            elif action == PLAYER_OUT:
+                lines.append(f"{self._name(seat)} won")
+            elif action == PLAYER_LOST:
+                lines.append(f"{self._name(seat)} lost the game")
+            elif action == GAME_TIED:
+                lines.append("Game was tied")
+        return "".join(lines)
+
+    def _name(self, seat: int) -> str:
+        """Name of the player in a seat, numbered when names are not known"""
+        if seat < len(self.player_names):
+            return self.player_names[seat]
+        return f"Player {seat + 1}"
+
+    def _suit(self, seat: int) -> str:
+        """Trump suit symbol of the player in a seat, empty when suits are not known"""
+        if seat < len(self.player_suits):
+            return SUITS.get(self.player_suits[seat], "")
+        return ""
+
+    def save(self, path: str):
+        """Saves the records to a .npy file, which load_records can memory map"""
+        import numpy as np
+
+        np.save(path, self.records)
+
+    @classmethod
+    def from_records(
+        cls, records: "np.ndarray", players: Optional[List[Player]] = None
+    ) -> "GameLog":
+        """Builds a log from records, such as a slice of an archive of many games
+        Args:
+            records: structured array of LOG_DTYPE
+            players: (Optional) players of the game, used for rendering
+
+        Returns:
+            Log holding a copy of the records
+        """
+        import numpy as np
+
+        game_log = cls(players)
+        game_log._buffer.frombytes(
+            np.ascontiguousarray(records, _log_dtype()).tobytes()
+        )
+        return game_log
+
+
+def load_records(path: str, mmap: bool = True) -> "np.ndarray":
+    """Loads records saved with GameLog.save
+    Args:
+        path: path of the .npy file
+        mmap: flag to memory map the file instead of reading it
+
+    Returns:
+        Structured array of LOG_DTYPE
+    """
+    import numpy as np
+
+    return np.load(path, mmap_mode="r" if mmap else None)
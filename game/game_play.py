@@ -1,12 +1,30 @@
+import random
+from typing import Optional
+
 from deck.card_encoding import SUITS
 from deck.deck_functions import Deck, ENCODED_CARDS
 from game.game_functions import Vezimas, VezimasSubgame
-from player.player_functions import RandomBot
-
-
-def start_game(player_count=4, bot_count=3):
+from player.player_functions import PlayerType, RandomBot
+
+
+def start_game(
+    player_count: int = 4,
+    bot_count: int = 3,
+    bot_level: Optional[PlayerType] = None,
+    seed: Optional[int] = None,
+):
+    """Plays a match in the terminal until a player collects all the letters
+    Args:
+        player_count: number of players
+        bot_count: number of bots among the players
+        bot_level: (Optional) player type of the bots, RandomBot by default
+        seed: (Optional) seed of the deals and the bots
+    """
     deck = Deck(ENCODED_CARDS)
-    bot_level = RandomBot()
+    bot_level = bot_level or RandomBot()
+    rng = None if seed is None else random.Random(seed)
+    if rng is not None:
+        bot_level.set_rng(rng)
     game = Vezimas(
         deck_of_cards=deck,
         player_count=player_count,
@@ -14,12 +32,12 @@ def start_game(player_count=4, bot_count=3):
         bot_level=bot_level,
     )
     game.set_player_reference()
-    game.deal_cards()
+    game.deal_cards(rng)
     game.set_trumps()
 
     while (game_no := game.check_worst_player().score) < 7:
         print(f"Starting game {sum([p.score for p in  game.players])}")
-        game.deal_cards()
+        game.deal_cards(rng)
         game.share_nines()
         game.sort_cards()
         trick = VezimasSubgame(game)
@@ -38,5 +56,3 @@ def start_game(player_count=4, bot_count=3):
 
 if __name__ == "__main__":
     start_game(player_count=4, bot_count=4)
-
-print("stop")
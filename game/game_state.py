@@ -1,8 +1,7 @@
-from functools import reduce
-from typing import List
-import copy
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
-from deck.deck_functions import Card, ENCODED_CARDS
+from deck.deck_functions import Card, CardSet, FULL_MASK, cards_to_mask
 from player.player_functions import Player, OptionalCardList
 
 
@@ -23,54 +22,153 @@ class GameState:
                 "is_active": True,
                 "suit": player.suit,
                 "no_cards": len(player.hand),
-                "known_cards": [Card((9, player.suit))],
+                "known_cards": CardSet([Card((9, player.suit))]),
             }
             for player in players
         }
         self.play_state = {"card_stack": card_stack, "card_to_beat": card_to_beat}
 
+        # Cards not known to be in any hand nor on the stack, and cards each player could hold,
+        # both kept up to date by every change so queries never rebuild them
+        self.unseen_mask = FULL_MASK & ~cards_to_mask(card_stack)
+        for state in self.player_state.values():
+            self.unseen_mask &= ~state["known_cards"].mask
+        self.possible_masks = {
+            name: state["known_cards"].mask | self.unseen_mask
+            for name, state in self.player_state.items()
+        }
+
+        # Snapshots handed out since the last change, reused until the state changes again
+        self._snapshots: Dict[str, Tuple[int, "GameStateView"]] = {}
+
     def add_known_cards(self, player: "Player", list_of_cards: List[Card]):
         """Marks cards as known in player hands"""
-        self.player_state[player.name]["known_cards"] += list_of_cards
+        self._snapshots.clear()
+        self.player_state[player.name]["known_cards"].add_cards(list_of_cards)
         self.player_state[player.name]["no_cards"] += len(list_of_cards)
         self.play_state["card_stack"] = []
 
+        cards_mask = cards_to_mask(list_of_cards)
+        self.unseen_mask &= ~cards_mask
+        for name in self.possible_masks:
+            self.possible_masks[name] &= ~cards_mask
+        self.possible_masks[player.name] |= cards_mask
+
     def remove_known_cards(
         self, player: "Player", list_of_cards: List[Card], card_stack: OptionalCardList
     ):
         """Removes card as known in player hands"""
-        [
-            self.player_state[player.name]["known_cards"].remove(card)
-            for card in list_of_cards
-            if card in self.player_state[player.name]["known_cards"]
-        ]
+        self._snapshots.clear()
+        self.player_state[player.name]["known_cards"].remove_cards(list_of_cards)
         self.player_state[player.name]["no_cards"] -= len(list_of_cards)
         self.play_state["card_stack"] = card_stack
 
+        cards_mask = cards_to_mask(list_of_cards)
+        self.unseen_mask &= ~cards_mask
+        for name in self.possible_masks:
+            self.possible_masks[name] &= ~cards_mask
+
     def remove_player(self, player: "Player"):
         """Marks player as inactive"""
+        self._snapshots.clear()
         self.player_state[player.name]["is_active"] = False
+        self.possible_masks[player.name] = 0
 
     def adjust_card_to_beat(self, card_to_beat: bool):
         """Adjust card_to_beat flag"""
+        self._snapshots.clear()
         self.play_state["card_to_beat"] = card_to_beat
 
-    def private_game_state(self, player: "Player"):
-        """Returns a copy of game state with private information of player observing the state"""
-        private_game_state = copy.deepcopy(self)
-        private_game_state.player_state[player.name]["known_cards"] = player.hand
-        return private_game_state
+    def unseen_cards(self) -> CardSet:
+        """Returns cards not known to be in any hand nor on the stack"""
+        return CardSet(self.unseen_mask)
+
+    def possible_cards(self, player: "Player") -> CardSet:
+        """Returns cards that could be in the hand of a player, known cards included"""
+        return CardSet(self.possible_masks[player.name])
+
+    def private_game_state(self, player: "Player") -> "GameStateView":
+        """Returns a read only snapshot of game state with private information of player observing
+        the state, the snapshot is shared by every call until the state changes
+        """
+        hand_mask, snapshot = self._snapshots.get(player.name, (None, None))
+        if snapshot is None or hand_mask != player.hand.mask:
+            snapshot = GameStateView(self, player)
+            self._snapshots[player.name] = player.hand.mask, snapshot
+        return snapshot
 
     def __repr__(self):
-        known_cards = (
-            reduce(
-                lambda a, b: a + b["known_cards"], self.player_state.values(), list()
-            )
-            + self.play_state["card_stack"]
-        )
-        unk_cards = [card for card in ENCODED_CARDS if card not in known_cards]
+        known_cards = CardSet(FULL_MASK & ~self.unseen_mask)
+        unk_cards = CardSet(self.unseen_mask)
 
         return f"""player state: {self.player_state}
 play state: {self.play_state}
 known_cards: {len(known_cards)}
 unknown_cards: {len(unk_cards)}"""
+
+
+class GameStateView:
+    """Read only snapshot of a game state as seen by a single player. Players are shared with the
+    game instead of copied, card sets are copied as masks, so a snapshot costs a few small dicts.
+    Hands of other players are only exposed as the cards known to be in them.
+    Args:
+        game_state: game state to take the snapshot of
+        observer: player observing the state, known_cards of the observer is their whole hand
+    """
+
+    __slots__ = (
+        "players",
+        "observer",
+        "player_state",
+        "play_state",
+        "unseen_mask",
+        "possible_masks",
+    )
+
+    def __init__(self, game_state: GameState, observer: Optional["Player"] = None):
+        self.players: Tuple["Player", ...] = tuple(game_state.players)
+        self.observer = observer
+
+        player_state = {}
+        for name, state in game_state.player_state.items():
+            state = dict(state)
+            if observer is not None and name == observer.name:
+                state["known_cards"] = observer.hand.copy()
+            else:
+                state["known_cards"] = state["known_cards"].copy()
+            player_state[name] = MappingProxyType(state)
+        self.player_state: Mapping[str, Mapping] = MappingProxyType(player_state)
+        self.play_state: Mapping = MappingProxyType(
+            {
+                "card_stack": tuple(game_state.play_state["card_stack"]),
+                "card_to_beat": game_state.play_state["card_to_beat"],
+            }
+        )
+
+        # The observer sees their own hand, so none of it is unseen or possible for others
+        hand_mask = observer.hand.mask if observer is not None else 0
+        self.unseen_mask = game_state.unseen_mask & ~hand_mask
+        possible_masks = {
+            name: possible_mask & ~hand_mask
+            for name, possible_mask in game_state.possible_masks.items()
+        }
+        if observer is not None:
+            possible_masks[observer.name] = hand_mask
+        self.possible_masks: Mapping[str, int] = MappingProxyType(possible_masks)
+
+    def unseen_cards(self) -> CardSet:
+        """Returns cards the observer has not seen in any hand nor on the stack"""
+        return CardSet(self.unseen_mask)
+
+    def possible_cards(self, player: "Player") -> CardSet:
+        """Returns cards that could be in the hand of a player as far as the observer knows"""
+        return CardSet(self.possible_masks[player.name])
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"GameStateView is read only, can not set {name}")
+        object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f"""player state: {dict(self.player_state)}
+play state: {dict(self.play_state)}"""
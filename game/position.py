@@ -0,0 +1,296 @@
+"""Module containing a compact, bit mask based Vezimas position with make/unmake moves"""
+
+import random
+from typing import List, NamedTuple, Optional
+
+from deck.card_encoding import SUITS
+from deck.deck_functions import CARDS_BY_INDEX, Card
+from game.rules import LEGAL_BEAT_MASKS
+from player.player_functions import Player
+
+# Move played to pick up the whole card stack, card moves are the bit index of the card
+PICKUP = len(CARDS_BY_INDEX)
+PICKUP_BIT = 1 << PICKUP
+
+# Turn phases, a turn is either a single lead card or a beat followed by a play
+LEAD, BEAT, PLAY = 0, 1, 2
+
+MAX_SEATS = 4
+
+_zobrist_rng = random.Random(20210101)
+HAND_KEYS = [
+    [_zobrist_rng.getrandbits(64) for _ in CARDS_BY_INDEX] for _ in range(MAX_SEATS)
+]
+STACK_KEYS = [_zobrist_rng.getrandbits(64) for _ in CARDS_BY_INDEX]
+TOP_KEYS = [_zobrist_rng.getrandbits(64) for _ in CARDS_BY_INDEX]
+TO_ACT_KEYS = [_zobrist_rng.getrandbits(64) for _ in range(MAX_SEATS)]
+PHASE_KEYS = [_zobrist_rng.getrandbits(64) for _ in (LEAD, BEAT, PLAY)]
+# Trumps and seating never change during a trick, they keep tables shared between deals apart
+SUIT_KEYS = [
+    [_zobrist_rng.getrandbits(64) for _ in range(max(SUITS) + 1)]
+    for _ in range(MAX_SEATS)
+]
+NEXT_SEAT_KEYS = [
+    [_zobrist_rng.getrandbits(64) for _ in range(MAX_SEATS)] for _ in range(MAX_SEATS)
+]
+
+
+def move_to_card(move: int) -> Optional[Card]:
+    """Translates a move to the card it plays, None for a pickup"""
+    return None if move == PICKUP else CARDS_BY_INDEX[move]
+
+
+def card_to_move(card: Optional[Card]) -> int:
+    """Translates a played card to a move, None for a pickup"""
+    return PICKUP if card is None else card.index
+
+
+def turn_phase(card_stack: List[Card], card_to_beat: bool) -> int:
+    """Returns the turn phase of a player facing the card stack
+    Args:
+        card_stack: cards on the table
+        card_to_beat: flag if the player still has to beat the stack, False after beating it
+    """
+    if not card_stack:
+        return LEAD
+    return BEAT if card_to_beat else PLAY
+
+
+class Undo(NamedTuple):
+    """Information needed to take back a move"""
+
+    move: int
+    to_act: int
+    phase: int
+    hand: int
+    stack: Optional[List[int]]
+    stack_mask: int
+    n_active: int
+    loser: Optional[int]
+    key: int
+
+
+class Position:
+    """Full information Vezimas position, hands and stack are kept as card bit masks
+    Args:
+        hands: card mask of each seat
+        suits: trump suit of each seat
+        to_act: seat of the player to act
+        stack: (Optional) bit indexes of the cards on the table, last one on top
+        next_seats: (Optional) seat playing after each seat, seats play in index order otherwise
+        phase: (Optional) turn phase, LEAD or BEAT depending on the stack otherwise
+    """
+
+    __slots__ = (
+        "hands",
+        "suits",
+        "next_seats",
+        "stack",
+        "stack_mask",
+        "to_act",
+        "phase",
+        "n_active",
+        "loser",
+        "key",
+    )
+
+    def __init__(
+        self,
+        hands: List[int],
+        suits: List[int],
+        to_act: int,
+        stack: Optional[List[int]] = None,
+        next_seats: Optional[List[int]] = None,
+        phase: Optional[int] = None,
+    ):
+        if len(hands) > MAX_SEATS:
+            raise ValueError(f"At most {MAX_SEATS} seats supported, got {len(hands)}")
+        self.hands = list(hands)
+        self.suits = list(suits)
+        self.next_seats = next_seats or [
+            (seat + 1) % len(hands) for seat in range(len(hands))
+        ]
+        self.stack = list(stack or [])
+        self.stack_mask = 0
+        for card_idx in self.stack:
+            self.stack_mask |= 1 << card_idx
+        self.to_act = to_act
+        self.phase = (BEAT if self.stack else LEAD) if phase is None else phase
+        self.n_active = sum(1 for hand in self.hands if hand)
+        self.loser = None
+        self.key = self._compute_key()
+
+    @classmethod
+    def from_players(
+        cls,
+        players: List[Player],
+        card_stack: List[Card],
+        player_to_act: Player,
+        card_to_beat: bool = True,
+    ) -> "Position":
+        """Builds a position from players of a VezimasSubgame
+        Args:
+            players: players of the game, their index becomes their seat
+            card_stack: cards on the table
+            player_to_act: player whose turn it is
+            card_to_beat: flag if the player still has to beat the stack, False after beating it
+
+        Returns:
+            Position of the game
+        """
+        seats = {id(player): seat for seat, player in enumerate(players)}
+        return cls(
+            hands=[player.hand.mask for player in players],
+            suits=[player.suit for player in players],
+            to_act=seats[id(player_to_act)],
+            stack=[card.index for card in card_stack],
+            next_seats=[seats[id(player.next_player_init)] for player in players],
+            phase=turn_phase(card_stack, card_to_beat),
+        )
+
+    def _compute_key(self) -> int:
+        """Computes Zobrist hash of the position from scratch"""
+        key = TO_ACT_KEYS[self.to_act] ^ PHASE_KEYS[self.phase]
+        for seat, (suit, next_seat) in enumerate(zip(self.suits, self.next_seats)):
+            key ^= SUIT_KEYS[seat][suit] ^ NEXT_SEAT_KEYS[seat][next_seat]
+        for seat, hand in enumerate(self.hands):
+            for card_idx in _bit_indexes(hand):
+                key ^= HAND_KEYS[seat][card_idx]
+        for card_idx in self.stack:
+            key ^= STACK_KEYS[card_idx]
+        if self.stack:
+            key ^= TOP_KEYS[self.stack[-1]]
+        return key
+
+    def copy(self) -> "Position":
+        """Returns an independent copy of the position"""
+        position = Position.__new__(Position)
+        position.hands = self.hands.copy()
+        position.suits = self.suits
+        position.next_seats = self.next_seats
+        position.stack = self.stack.copy()
+        position.stack_mask = self.stack_mask
+        position.to_act = self.to_act
+        position.phase = self.phase
+        position.n_active = self.n_active
+        position.loser = self.loser
+        position.key = self.key
+        return position
+
+    def next_active_seat(self, seat: int) -> int:
+        """Returns the next seat after the given one that still has cards"""
+        seat = self.next_seats[seat]
+        while not self.hands[seat]:
+            seat = self.next_seats[seat]
+        return seat
+
+    def legal_move_mask(self) -> int:
+        """Returns legal moves of the player to act as a mask, PICKUP_BIT marks a legal pickup"""
+        if self.loser is not None:
+            return 0
+        hand = self.hands[self.to_act]
+        if self.phase == LEAD:
+            return hand
+        if self.phase == PLAY:
+            return hand | PICKUP_BIT
+        next_suit = self.suits[self.next_active_seat(self.to_act)]
+        return (
+            hand & LEGAL_BEAT_MASKS[self.stack[-1]][self.suits[self.to_act]][next_suit]
+            | PICKUP_BIT
+        )
+
+    def legal_moves(self) -> List[int]:
+        """Returns legal moves of the player to act"""
+        return list(_bit_indexes(self.legal_move_mask()))
+
+    def apply(self, move: int) -> Undo:
+        """Plays a move in place, the move must be legal
+        Args:
+            move: card bit index or PICKUP
+
+        Returns:
+            Information to take the move back with undo
+        """
+        seat = self.to_act
+        undo = Undo(
+            move,
+            seat,
+            self.phase,
+            self.hands[seat],
+            self.stack if move == PICKUP else None,
+            self.stack_mask,
+            self.n_active,
+            self.loser,
+            self.key,
+        )
+        self.step(move)
+        return undo
+
+    def step(self, move: int):
+        """Plays a move in place without keeping information to take it back, for playouts
+        Args:
+            move: card bit index or PICKUP, the move must be legal
+        """
+        seat = self.to_act
+        key = self.key ^ PHASE_KEYS[self.phase]
+
+        if move == PICKUP:
+            for card_idx in self.stack:
+                key ^= STACK_KEYS[card_idx] ^ HAND_KEYS[seat][card_idx]
+            key ^= TOP_KEYS[self.stack[-1]]
+            self.hands[seat] |= self.stack_mask
+            self.stack = []
+            self.stack_mask = 0
+            turn_over = True
+        else:
+            key ^= HAND_KEYS[seat][move] ^ STACK_KEYS[move] ^ TOP_KEYS[move]
+            if self.stack:
+                key ^= TOP_KEYS[self.stack[-1]]
+            self.hands[seat] &= ~(1 << move)
+            self.stack.append(move)
+            self.stack_mask |= 1 << move
+            turn_over = self.phase != BEAT or not self.hands[seat]
+
+        if not turn_over:
+            self.phase = PLAY
+        else:
+            if not self.hands[seat]:
+                self.n_active -= 1
+            if self.n_active <= 1:
+                self.loser = self.next_active_seat(seat) if self.n_active == 1 else None
+            else:
+                key ^= TO_ACT_KEYS[seat]
+                self.to_act = self.next_active_seat(seat)
+                key ^= TO_ACT_KEYS[self.to_act]
+            self.phase = BEAT if self.stack else LEAD
+        self.key = key ^ PHASE_KEYS[self.phase]
+
+    def undo(self, undo: Undo):
+        """Takes back the move applied last
+        Args:
+            undo: information returned by apply
+        """
+        self.hands[undo.to_act] = undo.hand
+        self.to_act = undo.to_act
+        self.phase = undo.phase
+        if undo.stack is None:
+            self.stack.pop()
+        else:
+            self.stack = undo.stack
+        self.stack_mask = undo.stack_mask
+        self.n_active = undo.n_active
+        self.loser = undo.loser
+        self.key = undo.key
+
+    @property
+    def is_over(self) -> bool:
+        """Flag if the trick has finished"""
+        return self.n_active <= 1
+
+
+def _bit_indexes(mask: int):
+    """Yields indexes of set bits in ascending order"""
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
@@ -0,0 +1,183 @@
+"""Module containing a persistent cache of solved positions keyed by their canonical form"""
+
+import os
+import sqlite3
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from game.canonical import canonicalize
+from game.position import Position
+from game.solver import Solver
+
+# Seconds a process waits for another process holding the database lock
+LOCK_TIMEOUT = 30.0
+# Number of stores written to disk in one transaction
+COMMIT_INTERVAL = 256
+
+_NO_VALUE = -1
+_SIGNED_64 = 1 << 63
+
+
+class CachedResult(NamedTuple):
+    """Solved result of a position, seats and moves are those of the position looked up
+    Args:
+        loser: seat forced to lose, None if nobody is
+        best_move: move the player to act should play, None if the game is over
+        nodes: number of positions searched to solve it
+    """
+
+    loser: Optional[int]
+    best_move: Optional[int]
+    nodes: int
+
+
+def _to_sqlite_key(key: int) -> int:
+    """Maps an unsigned 64 bit key to the signed range of SQLite integers"""
+    return key - (1 << 64) if key >= _SIGNED_64 else key
+
+
+class PositionCache:
+    """Cache of solved positions stored in SQLite, keyed by the canonical hash so symmetric
+    positions share one entry. Recently used entries are also kept in memory with least
+    recently used eviction. Every process opens its own connection, so a cache can be passed to
+    worker processes and several processes can share one file.
+    Args:
+        path: path of the SQLite database, created if missing
+        capacity: number of entries kept in memory
+    """
+
+    def __init__(self, path: str, capacity: int = 100_000):
+        self.path = path
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[int, tuple]" = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending = 0
+
+    def __getstate__(self):
+        return {"path": self.path, "capacity": self.capacity}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["capacity"])
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection of the current process, opened on first use"""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS positions ("
+                "key INTEGER PRIMARY KEY, loser INTEGER, best_move INTEGER, nodes INTEGER)"
+            )
+        return self._connection
+
+    def _remember(self, key: int, value: tuple):
+        """Puts an entry in memory, evicting the least recently used one when full"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def get(self, position: Position) -> Optional[CachedResult]:
+        """Looks up a position
+        Args:
+            position: position to look up
+
+        Returns:
+            Result relabelled to the position, None if it was never stored
+        """
+        form = canonicalize(position)
+        value = self._memory.get(form.key)
+        if value is not None:
+            self._memory.move_to_end(form.key)
+        else:
+            value = self.connection.execute(
+                "SELECT loser, best_move, nodes FROM positions WHERE key = ?",
+                (_to_sqlite_key(form.key),),
+            ).fetchone()
+            if value is None:
+                self.misses += 1
+                return None
+            self._remember(form.key, value)
+        self.hits += 1
+
+        loser, best_move, nodes = value
+        return CachedResult(
+            loser=form.from_canonical_seat(None if loser == _NO_VALUE else loser),
+            best_move=form.from_canonical_move(
+                None if best_move == _NO_VALUE else best_move
+            ),
+            nodes=nodes,
+        )
+
+    def put(
+        self,
+        position: Position,
+        loser: Optional[int],
+        best_move: Optional[int],
+        nodes: int,
+    ):
+        """Stores a solved position
+        Args:
+            position: solved position
+            loser: seat forced to lose, None if nobody is
+            best_move: best move of the player to act
+            nodes: number of positions searched to solve it
+        """
+        form = canonicalize(position)
+        canonical_loser = None if loser is None else form.seat_map[loser]
+        canonical_move = form.to_canonical_move(best_move)
+        value = (
+            _NO_VALUE if canonical_loser is None else canonical_loser,
+            _NO_VALUE if canonical_move is None else canonical_move,
+            nodes,
+        )
+        self._remember(form.key, value)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?)",
+            (_to_sqlite_key(form.key), *value),
+        )
+        self._pending += 1
+        if self._pending >= COMMIT_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Writes pending stores to disk"""
+        if self._connection is not None and self._pending:
+            self._connection.commit()
+        self._pending = 0
+
+    def close(self):
+        """Writes pending stores and closes the connection"""
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+
+def solve_cached(
+    solver: Solver, position: Position, cache: PositionCache
+) -> CachedResult:
+    """Solves a position unless an equivalent one is in the cache, storing new results
+    Args:
+        solver: solver to use on a cache miss, may raise SearchAborted
+        position: position to solve
+        cache: cache of solved positions
+
+    Returns:
+        Result of the position
+    """
+    cached = cache.get(position)
+    if cached is not None:
+        return cached
+    result = solver.solve(position)
+    cache.put(position, result.loser, result.best_move, result.nodes)
+    return CachedResult(result.loser, result.best_move, result.nodes)
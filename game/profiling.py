@@ -0,0 +1,126 @@
+"""Module containing optional per phase timing and counters of the game loop"""
+
+import json
+import marshal
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Phases of the game loop
+DEAL = "deal"
+SHARE_NINES = "share_nines"
+SORT = "sort"
+MOVE_GENERATION = "move_generation"
+DECISION = "decision"
+STATE_UPDATE = "state_update"
+PHASES = (DEAL, SHARE_NINES, SORT, MOVE_GENERATION, DECISION, STATE_UPDATE)
+
+# Counters of the game loop
+MOVES = "moves"
+PICKUPS = "pickups"
+ELIMINATIONS = "eliminations"
+
+
+class GameProfiler:
+    """Collects time spent in each phase of the game loop and counts of game events. The game
+    only calls it when one is attached, so an unprofiled game pays a single None check per phase.
+    Args:
+        record_events: flag to keep every timed span, needed for chrome_trace
+    """
+
+    def __init__(self, record_events: bool = False):
+        self.record_events = record_events
+        self.totals: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.calls: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.counters: Counter = Counter()
+        self.events: List[Tuple[str, float, float]] = []
+        self._origin = time.perf_counter()
+
+    @staticmethod
+    def now() -> float:
+        """Returns the clock the profiler measures with"""
+        return time.perf_counter()
+
+    def add(self, phase: str, started: float) -> float:
+        """Adds the time from started until now to a phase
+        Args:
+            phase: phase the time was spent in
+            started: clock reading at the start of the phase
+
+        Returns:
+            Current clock reading, to start the next phase from
+        """
+        ended = time.perf_counter()
+        self.totals[phase] = self.totals.get(phase, 0.0) + ended - started
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        if self.record_events:
+            self.events.append((phase, started, ended))
+        return ended
+
+    def count(self, counter: str, amount: int = 1):
+        """Increases a counter of game events"""
+        self.counters[counter] += amount
+
+    def reset(self):
+        """Removes everything collected so far"""
+        self.__init__(self.record_events)
+
+    def summary(self) -> str:
+        """Returns a table of time per phase and event counts"""
+        total = sum(self.totals.values()) or 1.0
+        lines = [
+            f"{'phase':16} {'calls':>10} {'seconds':>10} {'share':>7} {'us/call':>9}"
+        ]
+        for phase, seconds in self.totals.items():
+            calls = self.calls[phase]
+            per_call = seconds / calls * 1e6 if calls else 0.0
+            lines.append(
+                f"{phase:16} {calls:10d} {seconds:10.4f} "
+                f"{seconds / total:7.1%} {per_call:9.2f}"
+            )
+        for counter, value in sorted(self.counters.items()):
+            lines.append(f"{counter:16} {value:10d}")
+        return "\n".join(lines)
+
+    def chrome_trace(self, path: str):
+        """Writes recorded spans in the Chrome trace event format, for chrome://tracing or Perfetto
+        Args:
+            path: path of the JSON file
+        """
+        if not self.record_events:
+            raise ValueError("Chrome trace needs a profiler created with record_events")
+        trace_events = [
+            {
+                "name": phase,
+                "ph": "X",
+                "ts": (started - self._origin) * 1e6,
+                "dur": (ended - started) * 1e6,
+                "pid": 0,
+                "tid": 0,
+            }
+            for phase, started, ended in self.events
+        ]
+        trace_events += [
+            {"name": counter, "ph": "C", "ts": 0, "pid": 0, "args": {counter: value}}
+            for counter, value in self.counters.items()
+        ]
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": trace_events}, trace_file)
+
+    def dump_stats(self, path: str):
+        """Writes phase totals as a profile that pstats.Stats can load, each phase is a function
+        Args:
+            path: path of the profile file
+        """
+        stats = {
+            ("vezimas", 0, phase): (
+                self.calls[phase],
+                self.calls[phase],
+                seconds,
+                seconds,
+                {},
+            )
+            for phase, seconds in self.totals.items()
+        }
+        with open(path, "wb") as stats_file:
+            marshal.dump(stats, stats_file)
@@ -0,0 +1,220 @@
+"""Module for deterministic replay of recorded Vezimas tricks and archives of them"""
+
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from game.game_functions import VezimasSubgame
+from game.game_log import BEAT_CARD, LEAD_CARD, PICKUP_CARDS, PLAY_CARD
+from game.position import MAX_SEATS, PICKUP, Position
+
+# Moves between stored positions of a Replay
+CHECKPOINT_INTERVAL = 32
+
+_MOVE_ACTIONS = (LEAD_CARD, BEAT_CARD, PLAY_CARD, PICKUP_CARDS)
+
+
+class GameRecord(NamedTuple):
+    """Deal and moves of a trick, everything needed to replay it
+    Args:
+        hands: card mask of each seat at the start of the trick
+        suits: trump suit of each seat
+        next_seats: seat playing after each seat
+        to_act: seat of the player leading the first card
+        moves: moves played, card bit indexes or PICKUP
+    """
+
+    hands: Tuple[int, ...]
+    suits: Tuple[int, ...]
+    next_seats: Tuple[int, ...]
+    to_act: int
+    moves: np.ndarray
+
+    def initial_position(self) -> Position:
+        """Returns the position at the start of the trick"""
+        return Position(
+            hands=list(self.hands),
+            suits=list(self.suits),
+            to_act=self.to_act,
+            next_seats=list(self.next_seats),
+        )
+
+
+def record_from_subgame(trick: VezimasSubgame) -> GameRecord:
+    """Builds a game record of a played trick
+    Args:
+        trick: trick played with record_log enabled
+
+    Returns:
+        Record of the trick
+    """
+    records = trick.game_log.records
+    records = records[np.isin(records["action"], _MOVE_ACTIONS)]
+    if not len(records):
+        raise ValueError("Trick has no recorded moves, was it played with record_log?")
+
+    players = trick.main_game.players
+    seats = {id(player): seat for seat, player in enumerate(players)}
+    moves = np.where(records["action"] == PICKUP_CARDS, PICKUP, records["card"]).astype(
+        np.int8
+    )
+    return GameRecord(
+        hands=tuple(trick.initial_hands),
+        suits=tuple(player.suit for player in players),
+        next_seats=tuple(seats[id(player.next_player_init)] for player in players),
+        to_act=int(records["seat"][0]),
+        moves=moves,
+    )
+
+
+class Replay:
+    """Replays a recorded trick and seeks to any move quickly. Positions are stored every
+    checkpoint_interval moves, so seeking replays at most that many moves.
+    Args:
+        record: record of the trick
+        checkpoint_interval: number of moves between stored positions
+    """
+
+    def __init__(
+        self, record: GameRecord, checkpoint_interval: int = CHECKPOINT_INTERVAL
+    ):
+        self.record = record
+        self.checkpoint_interval = checkpoint_interval
+        self.moves: List[int] = record.moves.tolist()
+
+        position = record.initial_position()
+        self._checkpoints = [position.copy()]
+        for move_no, move in enumerate(self.moves, 1):
+            if not position.legal_move_mask() >> move & 1:
+                raise ValueError(f"Move {move} at index {move_no - 1} is not legal")
+            position.step(move)
+            if move_no % checkpoint_interval == 0:
+                self._checkpoints.append(position.copy())
+        self.final_position = position
+
+    def __len__(self):
+        return len(self.moves)
+
+    def position_at(self, move_no: int) -> Position:
+        """Returns the position before the move with the given index was played
+        Args:
+            move_no: index of the move, len(replay) for the final position
+
+        Returns:
+            Independent copy of the position
+        """
+        if not 0 <= move_no <= len(self.moves):
+            raise IndexError(f"Move index {move_no} out of range 0..{len(self.moves)}")
+        checkpoint_no = move_no // self.checkpoint_interval
+        position = self._checkpoints[checkpoint_no].copy()
+        for move in self.moves[checkpoint_no * self.checkpoint_interval : move_no]:
+            position.step(move)
+        return position
+
+    @property
+    def loser(self) -> Optional[int]:
+        """Seat that lost the trick, None if it was tied"""
+        return self.final_position.loser
+
+
+def iter_positions(
+    records: List[GameRecord], stride: int = 1
+) -> Iterator[Tuple[int, int, Position, int]]:
+    """Replays every record once, yielding positions along the way, for extracting training
+    positions or re-scoring recorded games
+    Args:
+        records: records to replay
+        stride: yield every stride-th position of a game
+
+    Returns:
+        Iterator of (game index, move index, position, move played), the position is reused
+        and moved on once the iterator is advanced, copy it to keep it
+    """
+    for game_no, record in enumerate(records):
+        position = record.initial_position()
+        for move_no, move in enumerate(record.moves.tolist()):
+            if move_no % stride == 0:
+                yield game_no, move_no, position, move
+            position.step(move)
+
+
+def move_agreement(
+    records: List[GameRecord], policy: Callable[[Position], int]
+) -> float:
+    """Re-scores recorded games with another policy
+    Args:
+        records: records to replay
+        policy: move choice of the policy in a position
+
+    Returns:
+        Fraction of recorded moves the policy would have played
+    """
+    agreed = total = 0
+    for _, _, position, move in iter_positions(records):
+        agreed += policy(position) == move
+        total += 1
+    return agreed / total if total else 0.0
+
+
+def save_archive(path: str, records: List[GameRecord]):
+    """Saves records to a single .npz archive, moves of all games are stored back to back
+    Args:
+        path: path of the archive
+        records: records to save
+    """
+    n_games = len(records)
+    hands = np.zeros((n_games, MAX_SEATS), dtype=np.uint32)
+    suits = np.zeros((n_games, MAX_SEATS), dtype=np.int8)
+    next_seats = np.full((n_games, MAX_SEATS), -1, dtype=np.int8)
+    n_seats = np.zeros(n_games, dtype=np.int8)
+    to_act = np.zeros(n_games, dtype=np.int8)
+    offsets = np.zeros(n_games + 1, dtype=np.int64)
+    for game_no, record in enumerate(records):
+        seats = len(record.hands)
+        hands[game_no, :seats] = record.hands
+        suits[game_no, :seats] = record.suits
+        next_seats[game_no, :seats] = record.next_seats
+        n_seats[game_no] = seats
+        to_act[game_no] = record.to_act
+        offsets[game_no + 1] = offsets[game_no] + len(record.moves)
+
+    moves = (
+        np.concatenate([record.moves for record in records])
+        if records
+        else np.zeros(0, dtype=np.int8)
+    )
+    np.savez_compressed(
+        path,
+        hands=hands,
+        suits=suits,
+        next_seats=next_seats,
+        n_seats=n_seats,
+        to_act=to_act,
+        offsets=offsets,
+        moves=moves.astype(np.int8),
+    )
+
+
+def load_archive(path: str) -> List[GameRecord]:
+    """Loads records saved with save_archive
+    Args:
+        path: path of the archive
+
+    Returns:
+        Records in the order they were saved
+    """
+    with np.load(path) as archive:
+        columns = {name: archive[name] for name in archive.files}
+    offsets = columns["offsets"]
+    records = []
+    for game_no, seats in enumerate(columns["n_seats"].tolist()):
+        records.append(
+            GameRecord(
+                hands=tuple(columns["hands"][game_no, :seats].tolist()),
+                suits=tuple(columns["suits"][game_no, :seats].tolist()),
+                next_seats=tuple(columns["next_seats"][game_no, :seats].tolist()),
+                to_act=int(columns["to_act"][game_no]),
+                moves=columns["moves"][offsets[game_no] : offsets[game_no + 1]],
+            )
+        )
+    return records
@@ -0,0 +1,72 @@
+"""Module containing the beating rule of Vezimas and its precomputed lookup table"""
+
+from typing import List
+
+from deck.card_encoding import SUITS
+from deck.deck_functions import CARDS_BY_INDEX, Card, cards_to_mask
+
+
+def is_legal_beat(
+    last_card: Card, card_to_beat: Card, player_suit: int, next_player_suit: int
+) -> bool:
+    """Checks if a card can beat the last card on the stack
+    Args:
+        last_card: card on top of the stack
+        card_to_beat: card played to beat the stack
+        player_suit: suit of the player making the play
+        next_player_suit: suit of the next player in line that still has cards
+
+    Returns: True if play obeys the game rules, False otherwise
+    """
+    if last_card.suit == player_suit and card_to_beat.suit != player_suit:
+        return False
+
+    if last_card.suit == player_suit and last_card > card_to_beat:
+        return False
+
+    if last_card.suit == next_player_suit and card_to_beat.suit != player_suit:
+        return False
+
+    if last_card.suit != next_player_suit and last_card.suit != player_suit:
+        if card_to_beat.suit != player_suit:
+            if card_to_beat.suit != last_card.suit:
+                return False
+            if last_card > card_to_beat:
+                return False
+
+    return True
+
+
+def _build_legal_beat_masks() -> List[List[List[int]]]:
+    """Precomputes masks of legal beating cards for every (top card, own suit, next suit) triple
+
+    Returns: nested list indexed as [top card index][own suit][next player suit]
+    """
+    suit_slots = max(SUITS) + 1
+    masks = [[[0] * suit_slots for _ in range(suit_slots)] for _ in CARDS_BY_INDEX]
+    for last_card in CARDS_BY_INDEX:
+        for player_suit in SUITS:
+            for next_player_suit in SUITS:
+                masks[last_card.index][player_suit][next_player_suit] = cards_to_mask(
+                    card
+                    for card in CARDS_BY_INDEX
+                    if is_legal_beat(last_card, card, player_suit, next_player_suit)
+                )
+    return masks
+
+
+LEGAL_BEAT_MASKS = _build_legal_beat_masks()
+
+
+def get_legal_beat_mask(
+    last_card_index: int, player_suit: int, next_player_suit: int
+) -> int:
+    """Returns the precomputed mask of every card that legally beats the top card
+    Args:
+        last_card_index: bit index of the card on top of the stack
+        player_suit: suit of the player making the play
+        next_player_suit: suit of the next player in line that still has cards
+
+    Returns: bit mask of legal beating cards
+    """
+    return LEGAL_BEAT_MASKS[last_card_index][player_suit][next_player_suit]
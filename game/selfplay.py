@@ -0,0 +1,293 @@
+"""Module for a resumable, multi-process self-play pipeline writing memory mapped dataset shards"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from game.encoding import ENCODING_SIZE, StateEncoder
+from game.game_functions import Vezimas, VezimasSubgame
+from game.position import PICKUP, card_to_move
+from game.simulation import deal_simulation_game, game_rng, setup_simulation_game
+from game.tournament import seat_lineup
+from player.player_functions import PlayerType, HumanInput
+
+INDEX_FILE = "index.json"
+N_MOVES = PICKUP + 1
+# Outcome of a record for the player who made the decision
+LOST, TIED, NOT_LOST = -1, 0, 1
+
+_MOVE_SHIFTS = np.arange(N_MOVES, dtype=np.int64)
+
+# Lineup and game reused by every shard of a worker process, set by _init_worker
+_worker_lineup: Optional[List[PlayerType]] = None
+_worker_game: Optional[Vezimas] = None
+
+
+class SelfPlayBatch(NamedTuple):
+    """Records of decisions made in self-play
+    Args:
+        states: encoded private view of the deciding player, rows of ENCODING_SIZE
+        legal: legal moves of the decision, rows of N_MOVES flags
+        moves: move chosen, card bit index or PICKUP
+        outcomes: LOST, TIED or NOT_LOST for the deciding player at the end of the trick
+    """
+
+    states: np.ndarray
+    legal: np.ndarray
+    moves: np.ndarray
+    outcomes: np.ndarray
+
+
+def shard_path(directory: str, shard_no: int, field: str) -> str:
+    """Path of the file holding one field of a shard"""
+    return os.path.join(directory, f"shard_{shard_no:06d}.{field}.npy")
+
+
+def generate_shard(
+    game: Vezimas,
+    lineup: List[PlayerType],
+    seed: int,
+    shard_no: int,
+    shard_size: int,
+    dtype: str = "float16",
+    max_moves: int = 5000,
+) -> SelfPlayBatch:
+    """Plays self-play tricks until a shard is full, recording every decision. Every shard plays
+    its own random streams, so it comes out the same whenever and wherever it is generated
+    Args:
+        game: game created with setup_simulation_game
+        lineup: player type for each seat, rotated between tricks
+        seed: seed of the dataset
+        shard_no: index of the shard within the dataset
+        shard_size: number of records in the shard
+        dtype: dtype of the encoded states
+        max_moves: moves after which a trick is abandoned and its records dropped
+
+    Returns:
+        Records of the shard
+    """
+    shard = SelfPlayBatch(
+        states=np.zeros((shard_size, ENCODING_SIZE), dtype=dtype),
+        legal=np.zeros((shard_size, N_MOVES), dtype=bool),
+        moves=np.zeros(shard_size, dtype=np.int8),
+        outcomes=np.zeros(shard_size, dtype=np.int8),
+    )
+    seats = np.zeros(shard_size, dtype=np.int8)
+    encoder = StateEncoder()
+    row, game_no = 0, 0
+    while row < shard_size:
+        game.player_types = seat_lineup(lineup, game_no % len(lineup))
+        for player, player_type in zip(game.players, game.player_types):
+            player.player_type = player_type
+        deal_simulation_game(game, game_rng(seed, game_no, stream=shard_no + 1))
+        game_no += 1
+
+        trick = VezimasSubgame(game, record_log=False)
+        trick.setup_position()
+        first_row, n_moves = row, 0
+        while not trick.position.is_over and n_moves < max_moves:
+            decision = trick.next_decision()
+            if row < shard_size:
+                encoder.encode(
+                    shard.states[row : row + 1],
+                    [trick.public_game_state],
+                    [decision.player],
+                )
+                shard.legal[row] = trick.position.legal_move_mask() >> _MOVE_SHIFTS & 1
+                seats[row] = decision.seat
+            move = card_to_move(trick.ask_player_type(decision))
+            if row < shard_size:
+                shard.moves[row] = move
+                row += 1
+            trick.play_move(move)
+            n_moves += 1
+
+        if not trick.position.is_over:
+            row = first_row
+            continue
+        loser = trick.position.loser
+        if loser is None:
+            shard.outcomes[first_row:row] = TIED
+        else:
+            shard.outcomes[first_row:row] = np.where(
+                seats[first_row:row] == loser, LOST, NOT_LOST
+            )
+    return shard
+
+
+def _init_worker(lineup: List[PlayerType]):
+    """Builds the game of a worker process once, so shards never pickle the player graph"""
+    global _worker_lineup, _worker_game
+    _worker_lineup = lineup
+    _worker_game = setup_simulation_game(lineup)
+
+
+def _run_shard(task: Tuple[str, int, int, int, str, int]) -> int:
+    """Generates a shard and writes its fields atomically, so a killed run never leaves half a
+    shard behind
+    Args:
+        task: tuple of (directory, seed, shard_no, shard_size, dtype, max_moves)
+
+    Returns:
+        Index of the written shard
+    """
+    directory, seed, shard_no, shard_size, dtype, max_moves = task
+    game = _worker_game or setup_simulation_game(_worker_lineup)
+    shard = generate_shard(
+        game, _worker_lineup, seed, shard_no, shard_size, dtype, max_moves
+    )
+    for field, values in shard._asdict().items():
+        path = shard_path(directory, shard_no, field)
+        temporary_path = f"{path}.tmp.npy"
+        np.save(temporary_path, values)
+        os.replace(temporary_path, path)
+    return shard_no
+
+
+def _write_index(directory: str, index: dict):
+    """Writes the index file atomically"""
+    path = os.path.join(directory, INDEX_FILE)
+    with open(f"{path}.tmp", "w") as index_file:
+        json.dump(index, index_file, indent=1)
+    os.replace(f"{path}.tmp", path)
+
+
+def generate_dataset(
+    directory: str,
+    lineup: List[PlayerType],
+    n_shards: int,
+    seed: int,
+    shard_size: int = 1 << 16,
+    workers: Optional[int] = None,
+    dtype: str = "float16",
+    max_moves: int = 5000,
+    labels: Optional[List[str]] = None,
+) -> "SelfPlayDataset":
+    """Generates self-play shards in a process pool, skipping shards already in the index, so an
+    interrupted run continues where it stopped when run again with the same arguments. Only the
+    calling process writes the index, every shard number is listed once however often it is run.
+    Args:
+        directory: directory of the dataset
+        lineup: player type for each seat, player types must be picklable
+        n_shards: number of shards the dataset should have
+        seed: seed of the dataset
+        shard_size: number of records in a shard, the unit of checkpointing
+        workers: number of worker processes, all cores are used by default, 1 runs in process
+        dtype: dtype of the encoded states
+        max_moves: moves after which a trick is abandoned and its records dropped
+        labels: (Optional) label of each lineup entry, class names are used otherwise
+
+    Returns:
+        Dataset of every shard in the index
+    """
+    if any(isinstance(player_type, HumanInput) for player_type in lineup):
+        raise ValueError("Human players can not take part in self-play")
+    os.makedirs(directory, exist_ok=True)
+    config = {
+        "seed": seed,
+        "shard_size": shard_size,
+        "encoding_size": ENCODING_SIZE,
+        "dtype": dtype,
+        "lineup": labels or [type(player_type).__name__ for player_type in lineup],
+    }
+    index_path = os.path.join(directory, INDEX_FILE)
+    if os.path.exists(index_path):
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+        if {key: index[key] for key in config} != config:
+            raise ValueError(
+                f"Dataset in {directory} was generated with other settings"
+            )
+    else:
+        index = {**config, "shards": []}
+
+    done = set(index["shards"])
+    tasks = [
+        (directory, seed, shard_no, shard_size, dtype, max_moves)
+        for shard_no in range(n_shards)
+        if shard_no not in done
+    ]
+
+    def finished(shard_no: int):
+        index["shards"] = sorted(set(index["shards"]) | {shard_no})
+        _write_index(directory, index)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(lineup)
+        for task in tasks:
+            finished(_run_shard(task))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(lineup,)
+        ) as pool:
+            for future in as_completed(
+                [pool.submit(_run_shard, task) for task in tasks]
+            ):
+                finished(future.result())
+    return SelfPlayDataset(directory)
+
+
+class SelfPlayDataset:
+    """Self-play records of a dataset directory, shards are memory mapped so only the rows read
+    are loaded from disk
+    Args:
+        directory: directory of the dataset
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as index_file:
+            self.index = json.load(index_file)
+        self.shard_size: int = self.index["shard_size"]
+        self.shards: List[int] = self.index["shards"]
+        self._mapped: Dict[int, SelfPlayBatch] = {}
+
+    def __len__(self):
+        return len(self.shards) * self.shard_size
+
+    def shard(self, shard_no: int) -> SelfPlayBatch:
+        """Returns the memory mapped fields of a shard"""
+        shard = self._mapped.get(shard_no)
+        if shard is None:
+            shard = SelfPlayBatch(
+                *(
+                    np.load(shard_path(self.directory, shard_no, field), mmap_mode="r")
+                    for field in SelfPlayBatch._fields
+                )
+            )
+            self._mapped[shard_no] = shard
+        return shard
+
+    def sample(
+        self, batch_size: int, rng: Optional[np.random.Generator] = None
+    ) -> SelfPlayBatch:
+        """Reads a minibatch of records drawn uniformly with replacement
+        Args:
+            batch_size: number of records
+            rng: (Optional) random generator, a fresh one is used otherwise
+
+        Returns:
+            Records copied into memory
+        """
+        rng = rng or np.random.default_rng()
+        picks = rng.integers(len(self), size=batch_size)
+        shard_idx, rows = np.divmod(picks, self.shard_size)
+        first = self.shard(self.shards[0])
+        batch = SelfPlayBatch(
+            *(
+                np.empty((batch_size,) + values.shape[1:], dtype=values.dtype)
+                for values in first
+            )
+        )
+        for position in np.unique(shard_idx):
+            in_shard = np.flatnonzero(shard_idx == position)
+            shard = self.shard(self.shards[position])
+            # Reading rows in ascending order keeps the reads sequential on disk
+            order = in_shard[np.argsort(rows[in_shard])]
+            for values, out in zip(shard, batch):
+                out[order] = values[rows[order]]
+        return batch
@@ -0,0 +1,429 @@
+"""Module for hosting many concurrent Vezimas tables on one asyncio event loop"""
+
+import asyncio
+import random
+import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from deck.card_encoding import SUITS
+from deck.deck_functions import Deck, ENCODED_CARDS, Card
+from game.game_functions import Decision, Vezimas, VezimasSubgame
+from game.simulation import game_rng
+from game.time_control import TimeControl
+from game.tournament import MATCH_SCORE
+from player.player_functions import PlayerType, HumanInput, RandomBot
+
+# Prefix of the line listing IDs a human seat may answer with
+CHOOSE_PREFIX = "choose:"
+# Prefix of lines announcing results of tricks and matches
+RESULT_PREFIX = "result:"
+
+
+class SeatDisconnected(ConnectionError):
+    """Raised when a human seat closes its connection in the middle of a match"""
+
+
+def check_executor(executor: Optional[Executor]):
+    """Checks that bots can decide in a worker pool. Bots decide on the live trick and keep
+    their random state and search trees between decisions, so the pool must share memory with
+    the table, a process pool would decide on copies and drop every change
+    Args:
+        executor: worker pool to check, None stands for the default executor of the loop
+
+    Raises:
+        ValueError: the pool is not a thread pool
+    """
+    if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+        raise ValueError(
+            f"Bots decide in a thread pool only, got {type(executor).__name__}"
+        )
+
+
+class Seat(ABC):
+    """Abstract class of a seat at a table, decides moves of its player without blocking the
+    event loop
+    """
+
+    player_type: PlayerType
+
+    @abstractmethod
+    async def choose(self, trick: VezimasSubgame, decision: Decision) -> Optional[Card]:
+        """Decides a move of the seat
+        Args:
+            trick: trick being played
+            decision: decision the player of the seat has to make
+
+        Returns:
+            Card to play or None to pick up
+        """
+
+    async def notify(self, message: str):
+        """Sends a message about the match to the seat, ignored by bot seats"""
+
+    async def close(self):
+        """Releases resources of the seat once the match is over"""
+
+
+class BotSeat(Seat):
+    """Seat of a bot, whose decisions run in a thread pool so CPU heavy searches don't block the
+    event loop. The table waits for the decision, so the trick is never changed while it runs.
+    Args:
+        player_type: bot of the seat, not to be shared with other tables
+        executor: (Optional) thread pool, the default executor of the loop is used otherwise
+        offload: flag to decide in the pool, disable for bots that decide at once
+
+    Raises:
+        ValueError: the executor is not a thread pool, see check_executor
+    """
+
+    def __init__(
+        self,
+        player_type: PlayerType,
+        executor: Optional[Executor] = None,
+        offload: bool = True,
+    ):
+        if isinstance(player_type, HumanInput):
+            raise ValueError("Human players need a StreamSeat")
+        check_executor(executor)
+        self.player_type = player_type
+        self.executor = executor
+        self.offload = offload
+
+    async def choose(self, trick: VezimasSubgame, decision: Decision) -> Optional[Card]:
+        if not self.offload:
+            return trick.ask_player_type(decision)
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, trick.ask_player_type, decision
+        )
+
+
+class StreamSeat(Seat):
+    """Seat of a human player connected through an asyncio stream, like a local socket. Every
+    decision is sent as the prompt of HumanInput followed by a line listing the legal IDs, the
+    player answers with one ID per line.
+    Args:
+        reader: stream to read answers from
+        writer: stream to write prompts to
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.player_type = HumanInput()
+        self.reader = reader
+        self.writer = writer
+
+    async def _send(self, text: str):
+        self.writer.write((text + "\n").encode())
+        await self.writer.drain()
+
+    async def choose(self, trick: VezimasSubgame, decision: Decision) -> Optional[Card]:
+        player = decision.player
+        legal_ids = HumanInput.legal_card_ids(
+            decision.list_of_cards, player, decision.allow_pickup
+        )
+        await self._send(
+            HumanInput.card_prompt(
+                decision.list_of_cards,
+                player,
+                trick.card_stack,
+                decision.play_no,
+                trick.game_log if trick.record_log else None,
+            )
+        )
+        await self._send(f"{CHOOSE_PREFIX} {' '.join(map(str, legal_ids))}")
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise SeatDisconnected(f"Seat of {player.name} disconnected")
+            try:
+                card_idx = int(line)
+                if card_idx not in legal_ids:
+                    raise ValueError
+            except ValueError:
+                await self._send("Bad last input, Try again")
+                continue
+            return player.hand[card_idx - 1] if card_idx else None
+
+    async def notify(self, message: str):
+        try:
+            await self._send(f"{RESULT_PREFIX} {message}")
+        except ConnectionError:
+            pass
+
+    async def close(self):
+        if self.writer.can_write_eof():
+            self.writer.write_eof()
+        self.writer.close()
+
+
+async def open_stdin_seat() -> StreamSeat:
+    """Creates a human seat reading answers from stdin and writing prompts to stdout, a stand in
+    for a network connection when playing or testing locally
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+    )
+    transport, protocol = await loop.connect_write_pipe(
+        asyncio.streams.FlowControlMixin, sys.stdout
+    )
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    return StreamSeat(reader, writer)
+
+
+class Table:
+    """Table playing a match of Vezimas between its seats, tricks are played move by move so
+    every decision can be awaited
+    Args:
+        seats: seat of each player
+        rng: random stream of the match, used for dealing and by every bot
+        target_score: score that ends the match
+        player_names: (Optional) names of the players, otherwise they will be numbered
+        time_control: (Optional) time budgets of the decisions, not to be shared with other tables
+    """
+
+    def __init__(
+        self,
+        seats: List[Seat],
+        rng: random.Random,
+        target_score: int = MATCH_SCORE,
+        player_names: Optional[List[str]] = None,
+        time_control: Optional[TimeControl] = None,
+    ):
+        self.seats = seats
+        self.rng = rng
+        self.target_score = target_score
+        self.record_log = any(isinstance(seat, StreamSeat) for seat in seats)
+        self.game = Vezimas(
+            deck_of_cards=Deck(ENCODED_CARDS),
+            player_count=len(seats),
+            bot_count=sum(not isinstance(seat, StreamSeat) for seat in seats),
+            bot_level=None,
+            player_names=player_names,
+            player_types=[seat.player_type for seat in seats],
+            time_control=time_control,
+        )
+        self.game.set_player_reference()
+        self.tricks_played = 0
+
+    async def notify_all(self, message: str):
+        """Sends a message to every seat"""
+        await asyncio.gather(*(seat.notify(message) for seat in self.seats))
+
+    async def play_trick(self) -> Optional[int]:
+        """Plays a dealt trick, awaiting the seat of every decision between the begin_decision and
+        complete_decision steps of the trick, so deadlines and clocks work as in start_game
+
+        Returns:
+            Seat index of the player who lost the trick, None if it was tied
+        """
+        trick = VezimasSubgame(self.game, record_log=self.record_log)
+        trick.setup_position()
+        while not trick.position.is_over:
+            decision = trick.begin_decision()
+            card = await self.seats[decision.seat].choose(trick, decision)
+            trick.complete_decision(decision, card)
+        lost_player = trick.finish_game()
+        self.tricks_played += 1
+        return None if lost_player is None else self.game.players.index(lost_player)
+
+    async def play_match(self) -> int:
+        """Plays tricks until one player reaches the target score, like tournament.play_match
+
+        Returns:
+            Seat index of the player who lost the match
+        """
+        game = self.game
+        for player_type in game.player_types:
+            player_type.set_rng(self.rng)
+        try:
+            game.deal_cards(self.rng)
+            game.set_trumps()
+            while True:
+                game.share_nines()
+                game.sort_cards()
+                loser = await self.play_trick()
+                await self.notify_all(
+                    "trick tied"
+                    if loser is None
+                    else f"{game.players[loser].name} lost the trick"
+                )
+                game.reset_player_reference()
+                game.reset_cards()
+                if game.check_worst_player().score >= self.target_score:
+                    loser = game.players.index(game.check_worst_player())
+                    await self.notify_all(
+                        str(
+                            {
+                                f"{player.name} {SUITS[player.suit]}": player.score
+                                for player in game.players
+                            }
+                        )
+                    )
+                    return loser
+                game.deal_cards(self.rng)
+        finally:
+            await asyncio.gather(*(seat.close() for seat in self.seats))
+
+
+class TableServer:
+    """Server hosting tables of humans and bots on one event loop. Every connection to the socket
+    is a human seat, seats of a table not taken by humans are filled with bots.
+    Args:
+        n_seats: number of players at a table
+        humans_per_table: number of connections a table waits for before it starts
+        bot_factory: creates the bot of a seat, every seat gets its own
+        executor: (Optional) thread pool the bots decide in, default executor of the loop otherwise
+        seed: seed of the server, table number picks the random stream of each table
+        target_score: score that ends a match
+        time_control: (Optional) time budgets of the decisions, every table plays with a copy
+
+    Raises:
+        ValueError: incorrect number of humans per table or an executor other than a thread pool
+    """
+
+    def __init__(
+        self,
+        n_seats: int = 4,
+        humans_per_table: int = 1,
+        bot_factory: Callable[[], PlayerType] = RandomBot,
+        executor: Optional[Executor] = None,
+        seed: int = 0,
+        target_score: int = MATCH_SCORE,
+        time_control: Optional[TimeControl] = None,
+    ):
+        if not 0 <= humans_per_table <= n_seats:
+            raise ValueError(
+                f"Incorrect number of humans per table, expected max {n_seats}, got {humans_per_table}"
+            )
+        check_executor(executor)
+        self.n_seats = n_seats
+        self.humans_per_table = humans_per_table
+        self.bot_factory = bot_factory
+        self.executor = executor
+        self.seed = seed
+        self.target_score = target_score
+        self.time_control = time_control
+
+        # Matches in play, losers of finished ones and disconnections, by table number
+        self.tables: Dict[int, asyncio.Task] = {}
+        self.results: Dict[int, int] = {}
+        self.errors: Dict[int, SeatDisconnected] = {}
+        self._waiting: List[StreamSeat] = []
+        self._table_no = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def bot_seat(self) -> BotSeat:
+        """Creates a seat with a new bot"""
+        return BotSeat(self.bot_factory(), self.executor)
+
+    def open_table(self, seats: List[Seat]) -> asyncio.Task:
+        """Starts a match at a new table
+        Args:
+            seats: seat of each player
+
+        Returns:
+            Task of the match, resulting in the seat index of its loser
+        """
+        table_no = self._table_no
+        self._table_no += 1
+        table = Table(
+            seats,
+            game_rng(self.seed, table_no),
+            target_score=self.target_score,
+            time_control=self.time_control.copy()
+            if self.time_control is not None
+            else None,
+        )
+        task = asyncio.get_running_loop().create_task(self._run_table(table_no, table))
+        self.tables[table_no] = task
+        return task
+
+    async def _run_table(self, table_no: int, table: Table) -> Optional[int]:
+        try:
+            self.results[table_no] = await table.play_match()
+            return self.results[table_no]
+        except SeatDisconnected as error:
+            self.errors[table_no] = error
+            return None
+        finally:
+            del self.tables[table_no]
+
+    async def _connected(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Seats a connected human, starting a table once enough humans wait"""
+        self._waiting.append(StreamSeat(reader, writer))
+        if len(self._waiting) == self.humans_per_table:
+            humans, self._waiting = self._waiting, []
+            bots = [self.bot_seat() for _ in range(self.n_seats - len(humans))]
+            self.open_table(humans + bots)
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 0
+    ) -> asyncio.AbstractServer:
+        """Starts accepting human players on a TCP socket
+        Args:
+            host: address to listen on
+            port: port to listen on, a free one is picked when 0
+
+        Returns:
+            Listening server, its sockets give the picked port
+
+        Raises:
+            ValueError: the server seats no humans, a connection would never get a table
+        """
+        if self.humans_per_table == 0:
+            raise ValueError("A server without human seats can not accept players")
+        self._server = await asyncio.start_server(self._connected, host, port)
+        return self._server
+
+    async def close(self):
+        """Stops accepting players and waits for tables in play to finish"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await asyncio.gather(*self.tables.values(), return_exceptions=True)
+
+
+async def play_bot_tables(
+    n_tables: int,
+    n_seats: int = 4,
+    bot_factory: Callable[[], PlayerType] = RandomBot,
+    executor: Optional[Executor] = None,
+    seed: int = 0,
+    target_score: int = MATCH_SCORE,
+    time_control: Optional[TimeControl] = None,
+) -> List[int]:
+    """Plays matches at many bot only tables concurrently
+    Args:
+        n_tables: number of tables
+        n_seats: number of players at a table
+        bot_factory: creates the bot of a seat, every seat gets its own
+        executor: (Optional) thread pool the bots decide in
+        seed: seed of the tables
+        target_score: score that ends a match
+        time_control: (Optional) time budgets of the decisions, every table plays with a copy
+
+    Returns:
+        Seat index of the loser of each table
+
+    Raises:
+        ValueError: the executor is not a thread pool, see check_executor
+    """
+    server = TableServer(
+        n_seats,
+        humans_per_table=0,
+        bot_factory=bot_factory,
+        executor=executor,
+        seed=seed,
+        target_score=target_score,
+        time_control=time_control,
+    )
+    tasks = [
+        server.open_table([server.bot_seat() for _ in range(n_seats)])
+        for _ in range(n_tables)
+    ]
+    return list(await asyncio.gather(*tasks))
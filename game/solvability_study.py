@@ -0,0 +1,249 @@
+"""Module for a resumable, multi-process study of how many Vezimas deals are solvable"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from game.position import Position
+from game.position_cache import PositionCache
+from game.simulation import game_rng, setup_simulation_game
+from game.solver import SearchAborted, Solver, TranspositionTable
+from player.player_functions import RandomBot
+
+# File recording the settings a study directory was solved with
+CONFIG_FILE = "study.json"
+
+# Solve status of a deal
+ABORTED, NO_FORCED_LOSER, FORCED = -1, 0, 1
+
+STUDY_COLUMNS = {
+    "deal_no": np.uint32,
+    "n_players": np.uint8,
+    "status": np.int8,
+    "loser": np.int8,
+    "nodes": np.uint64,
+    "tt_probes": np.uint64,
+    "tt_hits": np.uint64,
+    "solve_time": np.float32,
+}
+
+# Solver, table and cache reused by every task of a worker process
+_worker_solver: Optional[Solver] = None
+_worker_cache: Optional[PositionCache] = None
+
+
+def deal_position(n_players: int, seed: int, deal_no: int) -> Position:
+    """Deals a game the way Vezimas does and returns its starting position
+    Args:
+        n_players: number of players at the table
+        seed: seed of the study
+        deal_no: index of the deal within the study
+
+    Returns:
+        Position of the player holding the queen of clubs, about to lead
+    """
+    game = setup_simulation_game([RandomBot() for _ in range(n_players)])
+    game.deal_cards(game_rng(seed, deal_no, stream=n_players))
+    starting_player = game.set_trumps()
+    game.share_nines()
+    return Position.from_players(game.players, [], starting_player)
+
+
+def solve_deals(
+    n_players: int,
+    deal_nos: Iterable[int],
+    seed: int,
+    max_nodes: int,
+    solver: Optional[Solver] = None,
+    cache: Optional[PositionCache] = None,
+) -> Dict[str, np.ndarray]:
+    """Solves deals from their start
+    Args:
+        n_players: number of players at the table
+        deal_nos: indexes of the deals to solve
+        seed: seed of the study
+        max_nodes: node budget of a single deal, deals past it are recorded as ABORTED
+        solver: (Optional) solver to reuse, its node budget is replaced
+        cache: (Optional) cache of solved deals, symmetric deals are only solved once
+
+    Returns:
+        Column arrays of the results, keyed as STUDY_COLUMNS
+    """
+    solver = solver or Solver()
+    solver.max_nodes = max_nodes
+    rows = []
+    for deal_no in deal_nos:
+        position = deal_position(n_players, seed, deal_no)
+        probes, hits = solver.table.probes, solver.table.hits
+        start = time.perf_counter()
+        result = cache.get(position) if cache is not None else None
+        try:
+            if result is None:
+                result = solver.solve(position)
+                if cache is not None:
+                    cache.put(position, result.loser, result.best_move, result.nodes)
+            status = NO_FORCED_LOSER if result.loser is None else FORCED
+            loser = -1 if result.loser is None else result.loser
+        except SearchAborted:
+            status, loser = ABORTED, -1
+        rows.append(
+            (
+                deal_no,
+                n_players,
+                status,
+                loser,
+                solver.nodes if result is None else result.nodes,
+                solver.table.probes - probes,
+                solver.table.hits - hits,
+                time.perf_counter() - start,
+            )
+        )
+
+    columns = list(zip(*rows)) if rows else [[] for _ in STUDY_COLUMNS]
+    return {
+        name: np.array(values, dtype=dtype)
+        for (name, dtype), values in zip(STUDY_COLUMNS.items(), columns)
+    }
+
+
+def chunk_path(directory: str, n_players: int, start: int) -> str:
+    """Path of the file holding the chunk of deals starting at start"""
+    return os.path.join(directory, f"deals_{n_players}p_{start:09d}.npz")
+
+
+def _init_worker(table_size_log2: int, cache_path: Optional[str] = None):
+    """Creates the solver of a worker process once, so its table is reused between chunks"""
+    global _worker_solver, _worker_cache
+    _worker_solver = Solver(TranspositionTable(table_size_log2))
+    _worker_cache = PositionCache(cache_path) if cache_path else None
+
+
+def _run_chunk(task: Tuple[str, int, int, int, int, int]) -> str:
+    """Solves a chunk of deals and writes it atomically, so a killed run never leaves half a chunk
+    Args:
+        task: tuple of (directory, n_players, start, stop, seed, max_nodes)
+
+    Returns:
+        Path of the written chunk
+    """
+    directory, n_players, start, stop, seed, max_nodes = task
+    columns = solve_deals(
+        n_players, range(start, stop), seed, max_nodes, _worker_solver, _worker_cache
+    )
+    if _worker_cache is not None:
+        _worker_cache.flush()
+
+    path = chunk_path(directory, n_players, start)
+    temporary_path = f"{path}.tmp.npz"
+    np.savez_compressed(temporary_path, **columns)
+    os.replace(temporary_path, path)
+    return path
+
+
+def _check_config(directory: str, config: dict):
+    """Records the settings of a new study directory, or checks a resumed one was solved with the
+    same settings, chunks of other settings would be mixed in otherwise
+    Args:
+        directory: directory of the chunk files
+        config: settings the results depend on
+
+    Raises:
+        ValueError: the directory holds a study solved with other settings
+    """
+    path = os.path.join(directory, CONFIG_FILE)
+    if os.path.exists(path):
+        with open(path) as config_file:
+            if json.load(config_file) != config:
+                raise ValueError(f"Study in {directory} was solved with other settings")
+        return
+    with open(f"{path}.tmp", "w") as config_file:
+        json.dump(config, config_file, indent=1)
+    os.replace(f"{path}.tmp", path)
+
+
+def run_study(
+    directory: str,
+    n_deals: int,
+    seed: int,
+    player_counts: Tuple[int, ...] = (2, 3, 4),
+    max_nodes: int = 1_000_000,
+    chunk_size: int = 64,
+    workers: Optional[int] = None,
+    table_size_log2: int = 20,
+    cache_path: Optional[str] = None,
+) -> List[str]:
+    """Solves n_deals random deals for each player count, skipping chunks already on disk,
+    so an interrupted study continues where it stopped when run again with the same arguments
+    Args:
+        directory: directory for the chunk files
+        n_deals: number of deals for each player count
+        seed: seed of the study
+        player_counts: numbers of players to deal for
+        max_nodes: node budget of a single deal
+        chunk_size: number of deals in a chunk file, the unit of checkpointing
+        workers: number of worker processes, all cores are used by default
+        table_size_log2: size of the transposition table of each worker
+        cache_path: (Optional) SQLite file of solved deals shared by the workers and later runs
+
+    Returns:
+        Paths of the chunks written by this run
+
+    Raises:
+        ValueError: the directory holds a study solved with another seed, node budget or chunk size
+    """
+    global _worker_cache
+    os.makedirs(directory, exist_ok=True)
+    _check_config(
+        directory, {"seed": seed, "max_nodes": max_nodes, "chunk_size": chunk_size}
+    )
+    tasks = [
+        (directory, n_players, start, min(start + chunk_size, n_deals), seed, max_nodes)
+        for n_players in player_counts
+        for start in range(0, n_deals, chunk_size)
+        if not os.path.exists(chunk_path(directory, n_players, start))
+    ]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        _init_worker(table_size_log2, cache_path)
+        try:
+            return [_run_chunk(task) for task in tasks]
+        finally:
+            if _worker_cache is not None:
+                _worker_cache.close()
+                _worker_cache = None
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(table_size_log2, cache_path),
+    ) as pool:
+        return list(pool.map(_run_chunk, tasks))
+
+
+def load_study(directory: str) -> Dict[str, np.ndarray]:
+    """Loads every finished chunk of a study into column arrays
+    Args:
+        directory: directory of the chunk files
+
+    Returns:
+        Column arrays of the results, keyed as STUDY_COLUMNS
+    """
+    chunks = sorted(
+        file_name
+        for file_name in os.listdir(directory)
+        if file_name.startswith("deals_")
+        and file_name.endswith(".npz")
+        and ".tmp" not in file_name
+    )
+    loaded = []
+    for file_name in chunks:
+        with np.load(os.path.join(directory, file_name)) as chunk:
+            loaded.append({name: chunk[name] for name in STUDY_COLUMNS})
+    return {
+        name: np.concatenate([chunk[name] for chunk in loaded] or [np.zeros(0, dtype)])
+        for name, dtype in STUDY_COLUMNS.items()
+    }
@@ -0,0 +1,251 @@
+"""Module containing a perfect information solver for Vezimas positions"""
+
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+from deck.card_encoding import SUITS
+from deck.deck_functions import CARDS_BY_INDEX
+from game.position import PICKUP, PICKUP_BIT, Position
+
+# Outcomes as seen by the player to act, ordered from worst to best
+MOVER_LOSES, NO_FORCED_LOSER, OTHER_LOSES = 0, 1, 2
+
+# Recursion limit used while searching, games with many pickups run deep
+SEARCH_RECURSION_LIMIT = 100_000
+# Search order of cards for each trump suit of the player to act: cheap cards of other suits
+# first and own trumps last, which finds forced losses far sooner than plain card order
+MOVE_ORDER = {
+    suit: [
+        card.index
+        for card in sorted(
+            CARDS_BY_INDEX, key=lambda card: (card.suit == suit, card.face)
+        )
+    ]
+    for suit in SUITS
+}
+
+# Dependency of a result that does not rely on any repetition of an ancestor position
+NO_DEPENDENCY = sys.maxsize
+
+
+class SearchAborted(Exception):
+    """Raised when a search exceeds its node budget"""
+
+
+class SolveResult(NamedTuple):
+    """Result of solving a position
+    Args:
+        loser: seat forced to lose, None if the players can keep the game cycling forever
+        best_move: move the player to act should play, None if the game is over
+        nodes: number of positions searched
+        tt_probes: number of transposition table lookups
+        tt_hits: number of lookups answered by the table
+    """
+
+    loser: Optional[int]
+    best_move: Optional[int]
+    nodes: int
+    tt_probes: int
+    tt_hits: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of transposition table lookups answered by the table"""
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+
+class TranspositionTable:
+    """Fixed size Zobrist hashed table of solved positions, memory never grows past its size.
+    A colliding entry is replaced when the new result took at least as many nodes to find,
+    so expensive results survive cheap ones.
+    Args:
+        size_log2: table holds 2 ** size_log2 entries
+    """
+
+    def __init__(self, size_log2: int = 18):
+        self.size = 1 << size_log2
+        self.index_mask = self.size - 1
+        self.keys = [0] * self.size
+        self.losers: List[Optional[int]] = [None] * self.size
+        self.moves: List[Optional[int]] = [None] * self.size
+        self.nodes = [0] * self.size
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def probe(self, key: int) -> Optional[int]:
+        """Looks up a position
+        Args:
+            key: Zobrist hash of the position
+
+        Returns:
+            Slot of the stored entry or None if the position is not stored
+        """
+        self.probes += 1
+        slot = key & self.index_mask
+        if self.keys[slot] == key and self.nodes[slot]:
+            self.hits += 1
+            return slot
+        return None
+
+    def store(self, key: int, loser: Optional[int], move: Optional[int], nodes: int):
+        """Stores a solved position, replacing a colliding entry only if it was cheaper to find
+        Args:
+            key: Zobrist hash of the position
+            loser: seat forced to lose
+            move: best move of the player to act
+            nodes: number of positions searched to solve it
+        """
+        slot = key & self.index_mask
+        stored_nodes = self.nodes[slot]
+        if stored_nodes and self.keys[slot] != key:
+            if stored_nodes > nodes:
+                return
+            self.evictions += 1
+        self.keys[slot] = key
+        self.losers[slot] = loser
+        self.moves[slot] = move
+        self.nodes[slot] = max(nodes, 1)
+        self.stores += 1
+
+    def clear(self):
+        """Removes every entry and resets statistics"""
+        self.__init__(self.size.bit_length() - 1)
+
+
+def _outcome(mover: int, loser: Optional[int]) -> int:
+    """Ranks a result from the point of view of the player to act"""
+    if loser is None:
+        return NO_FORCED_LOSER
+    return MOVER_LOSES if loser == mover else OTHER_LOSES
+
+
+def _ordered_moves(position: Position) -> List[int]:
+    """Returns legal moves in search order, pickup is tried last"""
+    legal_mask = position.legal_move_mask()
+    moves = [
+        card_idx
+        for card_idx in MOVE_ORDER[position.suits[position.to_act]]
+        if legal_mask >> card_idx & 1
+    ]
+    if legal_mask & PICKUP_BIT:
+        moves.append(PICKUP)
+    return moves
+
+
+class Solver:
+    """Perfect information minimax solver with pruning and a transposition table.
+
+    Every player prefers any other player losing over an endless game, and an endless game over
+    losing themselves. As the best outcome can not be improved on, a node is cut off as soon as
+    one move forcing it is found, which is the alpha-beta cutoff of this three valued game.
+    With more than two players left, ties between other players losing are broken by move order.
+    A position repeated on the search path is scored as having no forced loser. A forced loser
+    is always backed by a finite strategy that never repeats, so it holds whatever the path and
+    is stored right away. A result without forced loser carries the ply of the earliest ancestor
+    whose repetition it relied on, and is stored only once the search is back at that ancestor.
+    Args:
+        table: (Optional) transposition table to share between searches
+        max_nodes: (Optional) node budget of a single solve, SearchAborted is raised past it
+    """
+
+    def __init__(
+        self,
+        table: Optional[TranspositionTable] = None,
+        max_nodes: Optional[int] = None,
+    ):
+        self.table = table or TranspositionTable()
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self._path: Dict[int, int] = {}
+
+    def solve(self, position: Position) -> SolveResult:
+        """Solves a position, the position is left unchanged
+        Args:
+            position: position to solve
+
+        Returns:
+            Forced loser and best move with search statistics
+        """
+        self.nodes = 0
+        self._path = {}
+        probes, hits = self.table.probes, self.table.hits
+
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, SEARCH_RECURSION_LIMIT))
+        try:
+            loser, best_move, _ = self._search(position, 0)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        return SolveResult(
+            loser=loser,
+            best_move=best_move,
+            nodes=self.nodes,
+            tt_probes=self.table.probes - probes,
+            tt_hits=self.table.hits - hits,
+        )
+
+    def _search(self, position: Position, ply: int):
+        """Searches a position in place
+        Args:
+            position: position to search
+            ply: distance from the root of the search
+
+        Returns:
+            Tuple of (forced loser, best move, ply of the earliest ancestor the result relies on)
+        """
+        if position.loser is not None:
+            return position.loser, None, NO_DEPENDENCY
+
+        key = position.key
+        repeated_ply = self._path.get(key)
+        if repeated_ply is not None:
+            return None, None, repeated_ply
+
+        slot = self.table.probe(key)
+        if slot is not None:
+            return self.table.losers[slot], self.table.moves[slot], NO_DEPENDENCY
+
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchAborted(f"Search exceeded {self.max_nodes} nodes")
+        nodes_before = self.nodes
+
+        mover = position.to_act
+        best_loser, best_move, best_outcome = None, None, -1
+        dependency = NO_DEPENDENCY
+        self._path[key] = ply
+        try:
+            for move in _ordered_moves(position):
+                undo = position.apply(move)
+                loser, _, child_dependency = self._search(position, ply + 1)
+                position.undo(undo)
+
+                outcome = _outcome(mover, loser)
+                if outcome > best_outcome:
+                    best_loser, best_move, best_outcome = loser, move, outcome
+                if outcome == OTHER_LOSES:
+                    break
+                dependency = min(dependency, child_dependency)
+        finally:
+            del self._path[key]
+
+        if best_loser is not None or dependency >= ply:
+            self.table.store(key, best_loser, best_move, self.nodes - nodes_before + 1)
+            dependency = NO_DEPENDENCY
+        return best_loser, best_move, dependency
+
+
+def solve(position: Position, max_nodes: Optional[int] = None) -> SolveResult:
+    """Solves a position with a fresh solver and a small table, reuse a Solver for many positions
+    Args:
+        position: position to solve
+        max_nodes: (Optional) node budget, SearchAborted is raised past it
+
+    Returns:
+        Forced loser and best move with search statistics
+    """
+    return Solver(TranspositionTable(16), max_nodes=max_nodes).solve(position)
@@ -0,0 +1,110 @@
+"""Module containing time budgets of player decisions"""
+
+import time
+from typing import List, NamedTuple, Optional
+
+# Moves a game clock is expected to last for, a decision gets this share of the clock left
+MOVES_TO_GO = 20
+
+
+class TimeUsage(NamedTuple):
+    """Time used by a seat over every game played with a time control
+    Args:
+        decisions: number of decisions made
+        total_seconds: time spent deciding
+        max_seconds: longest single decision
+        overruns: decisions that took longer than their budget
+        flags: decisions started with the game clock already used up
+    """
+
+    decisions: int
+    total_seconds: float
+    max_seconds: float
+    overruns: int
+    flags: int
+
+    @property
+    def mean_seconds(self) -> float:
+        """Average time of a decision"""
+        return self.total_seconds / self.decisions if self.decisions else 0.0
+
+
+class TimeControl:
+    """Gives every decision a deadline from a per move budget, a per game clock or both, and
+    keeps track of how each seat used its time. The game loop passes the deadline to the player
+    type with PlayerType.set_deadline, anytime bots return their best move found by then.
+    Args:
+        move_time: (Optional) seconds a single decision may take
+        game_time: (Optional) seconds each seat has for a whole trick
+        increment: seconds added to the game clock after every decision
+    """
+
+    def __init__(
+        self,
+        move_time: Optional[float] = None,
+        game_time: Optional[float] = None,
+        increment: float = 0.0,
+    ):
+        if move_time is None and game_time is None:
+            raise ValueError("Either move_time or game_time has to be given")
+        self.move_time = move_time
+        self.game_time = game_time
+        self.increment = increment
+
+        self.clocks: List[float] = []
+        self._usage: List[List[float]] = []
+        self._started = 0.0
+        self._budget = 0.0
+
+    def copy(self) -> "TimeControl":
+        """Returns a time control with the same budgets and no usage, for a game played alongside"""
+        return TimeControl(self.move_time, self.game_time, self.increment)
+
+    def start_game(self, n_seats: int):
+        """Sets the game clock of every seat, usage carries over between games"""
+        if len(self._usage) < n_seats:
+            self._usage += [
+                [0, 0.0, 0.0, 0, 0] for _ in range(n_seats - len(self._usage))
+            ]
+        self.clocks = [
+            self.game_time if self.game_time is not None else float("inf")
+        ] * n_seats
+
+    def start_decision(self, seat: int) -> float:
+        """Starts timing a decision
+        Args:
+            seat: seat of the deciding player
+
+        Returns:
+            Deadline of the decision on the time.perf_counter clock
+        """
+        clock = max(self.clocks[seat], 0.0)
+        if self.game_time is not None and clock <= 0:
+            self._usage[seat][4] += 1
+        budget = clock / MOVES_TO_GO if self.game_time is not None else float("inf")
+        if self.move_time is not None:
+            budget = min(budget, self.move_time)
+        self._budget = budget
+        self._started = time.perf_counter()
+        return self._started + budget
+
+    def end_decision(self, seat: int) -> float:
+        """Stops timing the decision of a seat and charges it to its clock
+        Args:
+            seat: seat of the deciding player
+
+        Returns:
+            Seconds the decision took
+        """
+        elapsed = time.perf_counter() - self._started
+        self.clocks[seat] += self.increment - elapsed
+        usage = self._usage[seat]
+        usage[0] += 1
+        usage[1] += elapsed
+        usage[2] = max(usage[2], elapsed)
+        usage[3] += elapsed > self._budget
+        return elapsed
+
+    def usage(self) -> List[TimeUsage]:
+        """Returns time usage of each seat"""
+        return [TimeUsage(*usage) for usage in self._usage]
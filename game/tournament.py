@@ -0,0 +1,249 @@
+"""Module for running long Vezimas matches between bots across processes"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from game.game_functions import Vezimas, VezimasSubgame
+from game.simulation import game_rng, setup_simulation_game
+from player.player_functions import PlayerType, HumanInput
+
+# Score needed to collect all the letters of V-E-Z-I-M-A-S
+MATCH_SCORE = 7
+# z value of a two-sided 95% confidence interval
+CONFIDENCE_Z = 1.96
+
+# Lineup and game reused by every task of a worker process, set by _init_worker
+_worker_lineup: Optional[List[PlayerType]] = None
+_worker_game: Optional[Vezimas] = None
+
+
+class WinRate(NamedTuple):
+    """Win rate with its Wilson confidence interval
+    Args:
+        matches: number of matches played
+        wins: number of matches not lost
+        win_rate: fraction of matches not lost
+        ci_low: lower bound of the confidence interval
+        ci_high: upper bound of the confidence interval
+    """
+
+    matches: int
+    wins: int
+    win_rate: float
+    ci_low: float
+    ci_high: float
+
+
+class TournamentResults(NamedTuple):
+    """Merged results of a tournament
+    Args:
+        seat_stats: win rate of each seat
+        type_stats: win rate of each player type label, aggregated over the seats it played
+        losers: seat index of the loser of each match
+        rotations: seat rotation the lineup was played with in each match
+    """
+
+    seat_stats: List[WinRate]
+    type_stats: Dict[str, WinRate]
+    losers: np.ndarray
+    rotations: np.ndarray
+
+
+def wilson_interval(wins: int, matches: int, z: float = CONFIDENCE_Z) -> WinRate:
+    """Computes win rate with the Wilson score interval, which stays inside [0, 1] for small samples
+    Args:
+        wins: number of matches not lost
+        matches: number of matches played
+        z: z value of the wanted confidence level
+
+    Returns:
+        Win rate with confidence interval
+    """
+    if matches == 0:
+        return WinRate(0, 0, 0.0, 0.0, 1.0)
+    rate = wins / matches
+    denominator = 1 + z**2 / matches
+    centre = (rate + z**2 / (2 * matches)) / denominator
+    margin = (
+        z
+        * math.sqrt(rate * (1 - rate) / matches + z**2 / (4 * matches**2))
+        / denominator
+    )
+    return WinRate(
+        matches, wins, rate, max(0.0, centre - margin), min(1.0, centre + margin)
+    )
+
+
+def seat_lineup(lineup: List[PlayerType], rotation: int) -> List[PlayerType]:
+    """Rotates the lineup so every player type gets to play from every seat
+    Args:
+        lineup: player type for each seat
+        rotation: number of seats to shift the lineup by
+
+    Returns:
+        Player type for each seat
+    """
+    return [lineup[(seat + rotation) % len(lineup)] for seat in range(len(lineup))]
+
+
+def play_match(game: Vezimas, rng, target_score: int = MATCH_SCORE) -> int:
+    """Plays tricks until one player reaches the target score, keeping trumps and starting player
+    like game_play.start_game does
+    Args:
+        game: game created with setup_simulation_game
+        rng: random stream of the match, used for dealing and by every bot
+        target_score: score that ends the match
+
+    Returns:
+        Seat index of the player who lost the match
+    """
+    for player in game.players:
+        player.score = 0
+    game.reset_cards()
+    game.reset_trumps()
+    game.reset_player_reference()
+    for player_type in game.player_types:
+        player_type.set_rng(rng)
+
+    game.deal_cards(rng)
+    game.set_trumps()
+    while True:
+        game.share_nines()
+        VezimasSubgame(game, record_log=False).start_game()
+        game.reset_player_reference()
+        game.reset_cards()
+        if game.check_worst_player().score >= target_score:
+            return game.players.index(game.check_worst_player())
+        game.deal_cards(rng)
+
+
+def _init_worker(lineup: List[PlayerType]):
+    """Builds the game of a worker process once, so tasks never pickle the player graph"""
+    global _worker_lineup, _worker_game
+    _worker_lineup = lineup
+    _worker_game = setup_simulation_game(lineup)
+
+
+def _run_matches(
+    lineup: List[PlayerType], start: int, stop: int, seed: int, rotate_seats: bool
+) -> np.ndarray:
+    """Plays matches start..stop of a tournament in the current process
+    Args:
+        lineup: player type for each seat
+        start: index of the first match
+        stop: index after the last match
+        seed: seed of the tournament
+        rotate_seats: flag to rotate the lineup between matches
+
+    Returns:
+        Array of (loser seat, rotation) rows, one per match
+    """
+    game = _worker_game or setup_simulation_game(lineup)
+    results = np.zeros((stop - start, 2), dtype=np.int16)
+    for row, match_no in enumerate(range(start, stop)):
+        rotation = match_no % len(lineup) if rotate_seats else 0
+        game.player_types = seat_lineup(lineup, rotation)
+        for player, player_type in zip(game.players, game.player_types):
+            player.player_type = player_type
+
+        results[row] = play_match(game, game_rng(seed, match_no)), rotation
+    return results
+
+
+def _run_task(task: Tuple[int, int, int, bool]) -> np.ndarray:
+    """Process pool entry point, unpacks a task of the worker's lineup"""
+    start, stop, seed, rotate_seats = task
+    return _run_matches(_worker_lineup, start, stop, seed, rotate_seats)
+
+
+def merge_results(
+    lineup: List[PlayerType],
+    losers: np.ndarray,
+    rotations: np.ndarray,
+    labels: Optional[List[str]] = None,
+) -> TournamentResults:
+    """Merges per match results into win rates for each seat and each player type
+    Args:
+        lineup: player type for each seat
+        losers: seat index of the loser of each match
+        rotations: seat rotation the lineup was played with in each match
+        labels: (Optional) label of each lineup entry, class names are used otherwise
+
+    Returns:
+        Merged tournament results
+    """
+    labels = labels or [type(player_type).__name__ for player_type in lineup]
+    n_matches, n_seats = len(losers), len(lineup)
+
+    seat_losses = np.bincount(losers, minlength=n_seats)
+    seat_stats = [
+        wilson_interval(n_matches - int(seat_losses[seat]), n_matches)
+        for seat in range(n_seats)
+    ]
+
+    type_counts: Dict[str, List[int]] = {label: [0, 0] for label in labels}
+    for seat in range(n_seats):
+        # lineup entry sitting in this seat for every match
+        entries = (seat + rotations) % n_seats
+        for entry in range(n_seats):
+            played = entries == entry
+            counts = type_counts[labels[entry]]
+            counts[0] += int(played.sum())
+            counts[1] += int((played & (losers != seat)).sum())
+    type_stats = {
+        label: wilson_interval(wins, matches)
+        for label, (matches, wins) in type_counts.items()
+    }
+    return TournamentResults(seat_stats, type_stats, losers, rotations)
+
+
+def run_tournament(
+    n_matches: int,
+    lineup: List[PlayerType],
+    seed: int,
+    workers: Optional[int] = None,
+    rotate_seats: bool = True,
+    labels: Optional[List[str]] = None,
+    chunk_size: int = 16,
+) -> TournamentResults:
+    """Plays full matches in a process pool and merges them into win rates
+    Args:
+        n_matches: number of matches to play
+        lineup: player type for each seat, player types must be picklable
+        seed: seed of the tournament, each match draws from its own stream so results
+            do not depend on the number of workers
+        workers: number of worker processes, all cores are used by default, 1 runs in process
+        rotate_seats: flag to rotate the lineup between matches
+        labels: (Optional) label of each lineup entry, class names are used otherwise
+        chunk_size: number of matches in a single task
+
+    Returns:
+        Merged tournament results
+    """
+    if any(isinstance(player_type, HumanInput) for player_type in lineup):
+        raise ValueError("Human players can not take part in a tournament")
+    if labels and len(labels) != len(lineup):
+        raise ValueError(
+            f"Incorrect number of labels provided, expected {len(lineup)}, got {len(labels)}"
+        )
+
+    workers = workers or os.cpu_count() or 1
+    tasks = [
+        (start, min(start + chunk_size, n_matches), seed, rotate_seats)
+        for start in range(0, n_matches, chunk_size)
+    ]
+
+    if workers == 1:
+        chunks = [_run_matches(lineup, *task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(lineup,)
+        ) as pool:
+            chunks = list(pool.map(_run_task, tasks))
+
+    results = np.concatenate(chunks) if chunks else np.zeros((0, 2), dtype=np.int16)
+    return merge_results(lineup, results[:, 0], results[:, 1], labels)
@@ -0,0 +1,80 @@
+"""Module containing the turn order of players still in a trick"""
+
+from typing import List
+
+
+class TurnOrder:
+    """Circular order of seats still in play, kept as a doubly linked list over seat indexes so
+    advancing, removing a seat and counting seats are O(1). It never touches Player objects and
+    copies as a few short lists, so search code can clone it and restore the clone on undo.
+    Args:
+        next_seats: seat playing after each seat
+        current: seat whose turn it is
+    """
+
+    __slots__ = ("next_seats", "previous_seats", "current", "count")
+
+    def __init__(self, next_seats: List[int], current: int):
+        self.next_seats = list(next_seats)
+        self.previous_seats = [0] * len(next_seats)
+        for seat, next_seat in enumerate(next_seats):
+            self.previous_seats[next_seat] = seat
+        self.current = current
+        self.count = len(next_seats)
+
+    def __len__(self):
+        return self.count
+
+    def __eq__(self, other: "TurnOrder"):
+        return self.seats() == other.seats() and self.current == other.current
+
+    def __repr__(self):
+        return f"TurnOrder(seats={self.seats()}, current={self.current})"
+
+    def copy(self) -> "TurnOrder":
+        """Returns an independent copy of the turn order"""
+        turn_order = TurnOrder.__new__(TurnOrder)
+        turn_order.next_seats = self.next_seats.copy()
+        turn_order.previous_seats = self.previous_seats.copy()
+        turn_order.current = self.current
+        turn_order.count = self.count
+        return turn_order
+
+    def next_of(self, seat: int) -> int:
+        """Returns the seat in play after the given one"""
+        return self.next_seats[seat]
+
+    def advance(self) -> int:
+        """Passes the turn to the next seat in play
+        Returns:
+            Seat whose turn it is now
+        """
+        self.current = self.next_seats[self.current]
+        return self.current
+
+    def remove(self, seat: int):
+        """Takes a seat out of play. A removed current seat keeps its link to the next seat,
+        so advance still passes the turn on correctly
+        Args:
+            seat: seat still in play
+        """
+        next_seat, previous_seat = self.next_seats[seat], self.previous_seats[seat]
+        self.next_seats[previous_seat] = next_seat
+        self.previous_seats[next_seat] = previous_seat
+        # keeps the link of a removed current seat pointing to a seat in play
+        if self.next_seats[self.current] == seat:
+            self.next_seats[self.current] = next_seat
+        self.count -= 1
+
+    def seats(self) -> List[int]:
+        """Returns seats still in play in turn order, starting from the current one if in play"""
+        if not self.count:
+            return []
+        seat = self.current
+        if self.next_seats[self.previous_seats[seat]] != seat:
+            seat = self.next_seats[seat]
+        seats = [seat]
+        while len(seats) < self.count:
+            seat = self.next_seats[seat]
+            seats.append(seat)
+        return seats
@@ -0,0 +1,259 @@
+"""Module containing a bot whose decisions are scored in batches shared by many games"""
+
+import queue
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from deck.deck_functions import Card
+from game.encoding import ENCODING_SIZE, StateEncoder
+from game.position import PICKUP, move_to_card
+from player.player_functions import OptionalCardList, Player, PlayerType
+
+if TYPE_CHECKING:
+    from game.game_log import GameLog
+    from game.game_state import GameState
+
+# Columns of the legal move mask and of policy scores, one per card and one for the pickup
+N_MOVES = PICKUP + 1
+
+# Writes private views of game states into rows of the batch buffer, like StateEncoder.encode
+Encoder = Callable[[np.ndarray, Sequence["GameState"], Sequence[Player]], None]
+# Scores every move of a batch, given features (n, n_features) and legal masks (n, N_MOVES)
+Policy = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+class _Request:
+    """Decision waiting in the queue of a BatchEvaluator, its game waits so its state stays put"""
+
+    __slots__ = ("game_state", "player", "legal", "move", "error", "done")
+
+    def __init__(self, game_state: "GameState", player: Player, legal: np.ndarray):
+        self.game_state = game_state
+        self.player = player
+        self.legal = legal
+        self.move: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class BatchEvaluator:
+    """Collects decisions of bots playing in many threads and scores them together in one call
+    of a vectorized policy. A batch is scored once it is full or max_wait seconds after its first
+    decision arrived, so at least batch_size games have to decide concurrently for full batches.
+    Tricks have no move limit, a policy always picking the same move may repeat a trick forever.
+    Args:
+        policy: scores every move of a batch, illegal moves are masked out afterwards
+        batch_size: largest number of decisions scored in one call
+        max_wait: seconds the first decision of a batch waits for more to arrive
+        encoder: (Optional) writes features of a batch of decisions, StateEncoder by default
+        n_features: length of a feature row written by the encoder
+    """
+
+    def __init__(
+        self,
+        policy: Policy,
+        batch_size: int = 64,
+        max_wait: float = 0.002,
+        encoder: Optional[Encoder] = None,
+        n_features: int = ENCODING_SIZE,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"Batch size has to be positive, got {batch_size}")
+        self.policy = policy
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.encoder = encoder or StateEncoder(batch_size).encode
+        self.n_features = n_features
+
+        self.batches = 0
+        self.decisions = 0
+        self._features = np.zeros((batch_size, n_features), dtype=np.float32)
+        self._legal = np.zeros((batch_size, N_MOVES), dtype=bool)
+        self._queue: "queue.SimpleQueue[Optional[_Request]]" = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Average number of decisions scored together"""
+        return self.decisions / self.batches if self.batches else 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def evaluate(
+        self, player: Player, game_state: "GameState", legal: np.ndarray
+    ) -> int:
+        """Queues a decision and waits until its batch is scored, called from game threads. The
+        game state is encoded by the worker straight into the batch buffer while the game waits.
+        Args:
+            player: player to make the move
+            game_state: game state encoding, card_to_beat set for the decision
+            legal: legal moves as a boolean row of N_MOVES
+
+        Returns:
+            Legal move with the highest score
+        """
+        request = _Request(game_state, player, legal)
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._serve, daemon=True)
+                self._worker.start()
+            self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.move
+
+    def close(self):
+        """Scores decisions still queued and stops the worker thread"""
+        with self._lock:
+            worker, self._worker = self._worker, None
+            if worker is not None:
+                self._queue.put(None)
+        if worker is not None:
+            worker.join()
+
+    def _collect(self) -> List[Optional[_Request]]:
+        """Waits for the first decision of a batch, then for more until full or out of time"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while batch[-1] is not None and len(batch) < self.batch_size:
+            timeout = deadline - time.perf_counter()
+            try:
+                batch.append(
+                    self._queue.get(timeout=timeout)
+                    if timeout > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+        return batch
+
+    def _serve(self):
+        """Worker loop scoring batches until close puts its sentinel in the queue"""
+        stopping = False
+        while not stopping:
+            batch = self._collect()
+            if batch[-1] is None:
+                stopping = True
+                batch.pop()
+            if batch:
+                self._score(batch)
+
+    def _score(self, batch: List[_Request]):
+        """Scores a batch with one policy call and wakes its games"""
+        size = len(batch)
+        features, legal = self._features[:size], self._legal[:size]
+        for row, request in enumerate(batch):
+            legal[row] = request.legal
+        try:
+            self.encoder(
+                features,
+                [request.game_state for request in batch],
+                [request.player for request in batch],
+            )
+            scores = np.asarray(self.policy(features, legal), dtype=np.float64)
+            moves = np.where(legal, scores, -np.inf).argmax(axis=1)
+        except Exception as error:
+            for request in batch:
+                request.error = error
+                request.done.set()
+            return
+        self.batches += 1
+        self.decisions += size
+        for request, move in zip(batch, moves.tolist()):
+            request.move = move
+            request.done.set()
+
+
+def random_policy(seed: Optional[int] = None) -> Policy:
+    """Creates a policy scoring moves at random, a baseline for policies under test
+    Args:
+        seed: (Optional) seed of the scores
+
+    Returns:
+        Policy giving every move a uniform random score
+    """
+    rng = np.random.default_rng(seed)
+    return lambda features, legal: rng.random(legal.shape)
+
+
+class BatchedBot(PlayerType):
+    """Bot whose decisions are scored by a BatchEvaluator shared with bots of other games, meant
+    for games played in concurrent threads like the tables of game.server
+    Args:
+        evaluator: evaluator scoring the decisions, usually shared by many bots
+    """
+
+    def __init__(self, evaluator: BatchEvaluator):
+        self.evaluator = evaluator
+
+    def select_card_to_beat(
+        self,
+        list_of_cards: OptionalCardList,
+        player: Player,
+        card_stack: OptionalCardList,
+        play_history: "GameLog",
+        game_state: "GameState",
+        play_no: int,
+        allow_pickup: bool = True,
+    ) -> Optional[Card]:
+        """Selects a card to beat with by the score of the policy
+        Args:
+            list_of_cards: list of card to chose from
+            player: player to make the move
+            card_stack: cards on the table
+            play_history: history of all moves
+            game_state: game state encoding
+            play_no: placement of 1st or 2nd card (1,2)
+            allow_pickup: flag if card pickup is a viable move
+
+        Returns:
+            Card to beat with or None
+        """
+        return self._decide(list_of_cards, player, game_state, allow_pickup)
+
+    def select_card_to_play(
+        self,
+        list_of_cards: OptionalCardList,
+        player: Player,
+        card_stack: OptionalCardList,
+        play_history: "GameLog",
+        game_state: "GameState",
+        play_no: int,
+        allow_pickup: bool = True,
+    ) -> Optional[Card]:
+        """Selects a card to play by the score of the policy
+        Args:
+            list_of_cards: list of card to chose from
+            player: player to make the move
+            card_stack: cards on the table
+            play_history: history of all moves
+            game_state: game state encoding
+            play_no: placement of 1st or 2nd card (1,2)
+            allow_pickup: flag if card pickup is a viable move
+
+        Returns:
+            Card to play or None
+        """
+        return self._decide(list_of_cards, player, game_state, allow_pickup)
+
+    def _decide(
+        self,
+        list_of_cards: OptionalCardList,
+        player: Player,
+        game_state: "GameState",
+        allow_pickup: bool,
+    ) -> Optional[Card]:
+        """Builds the legal move row of a decision and waits for its scored move"""
+        legal = np.zeros(N_MOVES, dtype=bool)
+        legal[[card.index for card in list_of_cards]] = True
+        legal[PICKUP] = allow_pickup
+        return move_to_card(self.evaluator.evaluate(player, game_state, legal))
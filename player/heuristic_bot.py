@@ -0,0 +1,208 @@
+"""Module containing a rule based bot cheap enough to drive Monte Carlo playouts"""
+
+import random
+from typing import Optional, TYPE_CHECKING
+
+from deck.card_encoding import SUITS
+from deck.deck_functions import (
+    CARDS_BY_INDEX,
+    Card,
+    CardSet,
+    cards_to_mask,
+    popcount,
+)
+from game.position import BEAT, LEAD, PICKUP, PICKUP_BIT, PLAY, Position
+from player.player_functions import OptionalCardList, Player, PlayerType
+
+if TYPE_CHECKING:
+    from game.game_log import GameLog
+    from game.game_state import GameState
+
+# Masks of every card of a suit, indexed by suit
+SUIT_MASKS = [
+    cards_to_mask(card for card in CARDS_BY_INDEX if card.suit == suit)
+    for suit in range(max(SUITS) + 1)
+]
+# Masks of every card of a face, from the lowest face to the highest
+FACE_MASKS = [
+    cards_to_mask(card for card in CARDS_BY_INDEX if card.face == face)
+    for face in sorted({card.face for card in CARDS_BY_INDEX})
+]
+# Fraction of playout moves played with a random card, see HeuristicBot
+ROLLOUT_EPSILON = 0.05
+
+
+def cheapest_card(card_mask: int) -> int:
+    """Returns the bit index of the card of the lowest face in a mask, -1 for an empty mask"""
+    for face_mask in FACE_MASKS:
+        faces = card_mask & face_mask
+        if faces:
+            return (faces & -faces).bit_length() - 1
+    return -1
+
+
+def random_card(card_mask: int, rng: random.Random) -> int:
+    """Returns the bit index of a uniformly drawn card of a non empty mask"""
+    for _ in range(rng.randrange(popcount(card_mask))):
+        card_mask &= card_mask - 1
+    return (card_mask & -card_mask).bit_length() - 1
+
+
+def heuristic_move(
+    hand: int,
+    beat_mask: int,
+    phase: int,
+    suit: int,
+    next_suit: int,
+    after_next_suit: int,
+) -> int:
+    """Picks a move by the rules of thumb of the game, working on card masks only:
+    beat with the cheapest card, keeping trumps while a card of the stack suit beats,
+    pick up only without a beat, and play cards that make the next player beat with their own
+    trumps, cards of their suit or of the suit of the player after them
+    Args:
+        hand: cards of the player to act
+        beat_mask: cards that legally beat the top card, used in the BEAT phase
+        phase: LEAD, BEAT or PLAY
+        suit: suit of the player to act
+        next_suit: suit of the next player that still has cards
+        after_next_suit: suit of the player after the next one
+
+    Returns:
+        Bit index of the card to play or PICKUP
+    """
+    own_trumps = SUIT_MASKS[suit]
+    if phase == BEAT:
+        if not beat_mask:
+            return PICKUP
+        if beat_mask & ~own_trumps:
+            return cheapest_card(beat_mask & ~own_trumps)
+        return cheapest_card(beat_mask)
+
+    spare = hand & ~own_trumps
+    forcing = spare & (SUIT_MASKS[next_suit] | SUIT_MASKS[after_next_suit])
+    if forcing:
+        return cheapest_card(forcing)
+    if spare:
+        return cheapest_card(spare)
+    return cheapest_card(hand)
+
+
+def heuristic_rollout_move(position: Position, rng: random.Random) -> int:
+    """Rollout policy of ISMCTSBot playing heuristic_move, or a random card with a probability
+    of ROLLOUT_EPSILON, see RolloutPolicy
+    Args:
+        position: position of the playout
+        rng: random generator of the playout
+
+    Returns:
+        Move to play
+    """
+    seat = position.to_act
+    next_seat = position.next_active_seat(seat)
+    legal = position.legal_move_mask() & ~PICKUP_BIT
+    if legal and rng.random() < ROLLOUT_EPSILON:
+        return random_card(legal, rng)
+    return heuristic_move(
+        position.hands[seat],
+        legal,
+        position.phase,
+        position.suits[seat],
+        position.suits[next_seat],
+        position.suits[position.next_active_seat(next_seat)],
+    )
+
+
+class HeuristicBot(PlayerType):
+    """Rule based bot meant for playouts, plays heuristic_move with a small share of random
+    cards. Tricks have no move limit and the rules alone may repeat a trick forever, the random
+    cards end such tricks and keep playouts varied.
+    Args:
+        epsilon: fraction of decisions played with a random legal card
+        rng: (Optional) random generator to draw choices from, global random state is used otherwise
+    """
+
+    def __init__(
+        self, epsilon: float = ROLLOUT_EPSILON, rng: Optional[random.Random] = None
+    ):
+        self.epsilon = epsilon
+        self.rng = rng or random
+
+    def set_rng(self, rng: random.Random):
+        """Method for seeding random choices of the player
+        Args:
+            rng: random generator to draw choices from
+        """
+        self.rng = rng
+
+    def select_card_to_beat(
+        self,
+        list_of_cards: OptionalCardList,
+        player: Player,
+        card_stack: OptionalCardList,
+        play_history: "GameLog",
+        game_state: "GameState",
+        play_no: int,
+        allow_pickup: bool = True,
+    ) -> Optional[Card]:
+        """Selects the cheapest card to beat with, picking up only without one
+        Args:
+            list_of_cards: list of card to chose from
+            player: player to make the move
+            card_stack: cards on the table
+            play_history: history of all moves
+            game_state: game state encoding
+            play_no: placement of 1st or 2nd card (1,2)
+            allow_pickup: flag if card pickup is a viable move
+
+        Returns:
+            Card to beat with or None
+        """
+        return self._decide(list_of_cards, player, BEAT)
+
+    def select_card_to_play(
+        self,
+        list_of_cards: OptionalCardList,
+        player: Player,
+        card_stack: OptionalCardList,
+        play_history: "GameLog",
+        game_state: "GameState",
+        play_no: int,
+        allow_pickup: bool = True,
+    ) -> Optional[Card]:
+        """Selects a card forcing the next player to use their trumps, never picks up
+        Args:
+            list_of_cards: list of card to chose from
+            player: player to make the move
+            card_stack: cards on the table
+            play_history: history of all moves
+            game_state: game state encoding
+            play_no: placement of 1st or 2nd card (1,2)
+            allow_pickup: flag if card pickup is a viable move
+
+        Returns:
+            Card to play
+        """
+        return self._decide(list_of_cards, player, PLAY if play_no == 2 else LEAD)
+
+    def _decide(
+        self, list_of_cards: OptionalCardList, player: Player, phase: int
+    ) -> Optional[Card]:
+        """Plays heuristic_move, or a random card with a probability of epsilon"""
+        card_mask = (
+            list_of_cards.mask
+            if isinstance(list_of_cards, CardSet)
+            else cards_to_mask(list_of_cards)
+        )
+        if card_mask and self.epsilon and self.rng.random() < self.epsilon:
+            return CARDS_BY_INDEX[random_card(card_mask, self.rng)]
+        next_player = player.next_active_player()
+        move = heuristic_move(
+            card_mask,
+            card_mask,
+            phase,
+            player.suit,
+            next_player.suit,
+            next_player.next_active_player().suit,
+        )
+        return None if move == PICKUP else CARDS_BY_INDEX[move]
@@ -0,0 +1,321 @@
+"""Module containing the Information Set Monte Carlo Tree Search bot"""
+
+import math
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from deck.deck_functions import Card
+from game.deal_sampler import DealSampler, hand_constraints
+from game.position import (
+    BEAT,
+    LEAD,
+    PICKUP,
+    PICKUP_BIT,
+    PLAY,
+    Position,
+    move_to_card,
+)
+from player.player_functions import OptionalCardList, Player, PlayerType
+
+if TYPE_CHECKING:
+    from game.game_log import GameLog
+    from game.game_state import GameState
+
+RolloutPolicy = Callable[[Position, random.Random], int]
+
+# Moves after which an unfinished playout is scored as a draw
+MAX_PLAYOUT_MOVES = 600
+DRAW_REWARD = 0.5
+# Deals drawn from the sampler at once, iterations then take them one at a time
+DEAL_BATCH = 256
+
+
+def random_rollout_move(position: Position, rng: random.Random) -> int:
+    """Plays a random card, picking up only when no card can be played
+    Args:
+        position: position of the playout
+        rng: random generator of the playout
+
+    Returns:
+        Move to play
+    """
+    card_mask = position.legal_move_mask() & ~PICKUP_BIT
+    if not card_mask:
+        return PICKUP
+    moves = []
+    while card_mask:
+        low_bit = card_mask & -card_mask
+        moves.append(low_bit.bit_length() - 1)
+        card_mask ^= low_bit
+    return rng.choice(moves)
+
+
+class Node:
+    """Tree node of a move, rewards are seen from the player who played the move"""
+
+    __slots__ = ("move", "seat", "parent", "children", "visits", "reward", "available")
+
+    def __init__(self, move: Optional[int], seat: int, parent: Optional["Node"]):
+        self.move = move
+        self.seat = seat
+        self.parent = parent
+        self.children: Dict[int, Node] = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.available = 0
+
+
+class ISMCTSBot(PlayerType):
+    """Bot that searches with single observer Information Set Monte Carlo Tree Search,
+    each iteration plays in a different deal of hidden cards consistent with the game state
+    Args:
+        iterations: (Optional) number of iterations for a decision
+        time_limit: (Optional) seconds to search a decision, used when iterations is not given,
+            a deadline set by the game cuts either of them short
+        exploration: UCB exploration constant
+        rollout_policy: move selection of the playouts
+        rng: (Optional) random generator of the search
+    """
+
+    def __init__(
+        self,
+        iterations: Optional[int] = 1000,
+        time_limit: Optional[float] = None,
+        exploration: float = 0.7,
+        rollout_policy: RolloutPolicy = random_rollout_move,
+        rng: Optional[random.Random] = None,
+    ):
+        if iterations is None and time_limit is None:
+            raise ValueError("Either iterations or time_limit has to be given")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy
+        self.rng = rng or random.Random()
+
+        self.last_iterations = 0
+        self.deadline: Optional[float] = None
+        # Game state of the trick the trees were grown in, a new one starts every trick
+        self._game_state: Optional["GameState"] = None
+        # Tree of the last decision of each seat with the stack and its own hand after its move,
+        # one bot may play several seats and must never search from the information set of another
+        self._roots: Dict[int, Tuple[Node, List[int], int]] = {}
+
+    def set_rng(self, rng: random.Random):
+        """Method for seeding random choices of the search
+        Args:
+            rng: random generator to draw choices from
+        """
+        self.rng = rng
+
+    def set_deadline(self, deadline: Optional[float]):
+        """Method for limiting the time of the next search, it returns the best move found by then
+        Args:
+            deadline: time.perf_counter reading the search should stop at, None for no limit
+        """
+        self.deadline = deadline
+
+    def select_card_to_beat(
+        self,
+        list_of_cards: OptionalCardList,
+        player: Player,
+        card_stack: OptionalCardList,
+        play_history: "GameLog",
+        game_state: "GameState",
+        play_no: int,
+        allow_pickup: bool = True,
+    ) -> Optional[Card]:
+        """Selects a card to beat with by searching
+        Args:
+            list_of_cards: list of card to chose from
+            player: player to make the move
+            card_stack: cards on the table
+            play_history: history of all moves
+            game_state: game state encoding
+            play_no: placement of 1st or 2nd card (1,2)
+            allow_pickup: flag if card pickup is a viable move
+
+        Returns:
+            Card to beat with or None
+        """
+        return self.search(player, card_stack, game_state, BEAT)
+
+    def select_card_to_play(
+        self,
+        list_of_cards: OptionalCardList,
+        player: Player,
+        card_stack: OptionalCardList,
+        play_history: "GameLog",
+        game_state: "GameState",
+        play_no: int,
+        allow_pickup: bool = True,
+    ) -> Optional[Card]:
+        """Selects a card to play by searching
+        Args:
+            list_of_cards: list of card to chose from
+            player: player to make the move
+            card_stack: cards on the table
+            play_history: history of all moves
+            game_state: game state encoding
+            play_no: placement of 1st or 2nd card (1,2)
+            allow_pickup: flag if card pickup is a viable move
+
+        Returns:
+            Card to play or None
+        """
+        return self.search(
+            player, card_stack, game_state, LEAD if not card_stack else PLAY
+        )
+
+    def search(
+        self,
+        player: Player,
+        card_stack: OptionalCardList,
+        game_state: "GameState",
+        phase: int,
+    ) -> Optional[Card]:
+        """Runs the search for a decision and returns the most visited move
+        Args:
+            player: player to make the move
+            card_stack: cards on the table
+            game_state: game state encoding
+            phase: turn phase of the decision
+
+        Returns:
+            Card to play or None to pick up
+        """
+        players = game_state.players
+        seat = players.index(player)
+        stack = [card.index for card in card_stack]
+        if game_state is not self._game_state:
+            self._game_state, self._roots = game_state, {}
+        root = self._reused_root(seat, stack, player.hand.mask) or Node(
+            None, seat, None
+        )
+
+        # Search is anytime, whichever of the iterations and the deadlines runs out first stops it
+        deadline, self.deadline = self.deadline, None
+        if self.time_limit is not None and self.iterations is None:
+            own_deadline = time.perf_counter() + self.time_limit
+            deadline = own_deadline if deadline is None else min(deadline, own_deadline)
+        sampler = DealSampler(hand_constraints(game_state, player))
+        deal_rng = np.random.default_rng(self.rng.getrandbits(64))
+        deals: List[List[int]] = []
+        iterations = 0
+        while iterations == 0 or (
+            (self.iterations is None or iterations < self.iterations)
+            and (deadline is None or time.perf_counter() < deadline)
+        ):
+            if not deals:
+                n_deals = DEAL_BATCH
+                if self.iterations is not None:
+                    n_deals = min(n_deals, self.iterations - iterations)
+                deals = sampler.sample(max(n_deals, 1), deal_rng).tolist()
+            position = self._determinize(player, stack, game_state, phase, deals.pop())
+            self._iterate(root, position)
+            iterations += 1
+        self.last_iterations = iterations
+
+        best = max(root.children.values(), key=lambda node: node.visits)
+        if best.move == PICKUP:
+            self._roots.pop(seat, None)
+        else:
+            self._roots[seat] = (
+                best,
+                stack + [best.move],
+                player.hand.mask & ~(1 << best.move),
+            )
+        return move_to_card(best.move)
+
+    def _reused_root(self, seat: int, stack: List[int], hand: int) -> Optional[Node]:
+        """Finds the node of the current decision in the tree of the previous decision of the same
+        seat in the same trick. The cards added to the stack since then are the moves played in
+        between, an emptied stack hides them, and so does a pickup the hand of the seat shows.
+        """
+        node, root_stack, root_hand = self._roots.pop(seat, (None, [], 0))
+        if node is None or hand != root_hand or stack[: len(root_stack)] != root_stack:
+            return None
+        for card_idx in stack[len(root_stack) :]:
+            node = node.children.get(card_idx)
+            if node is None:
+                return None
+        node.parent = None
+        return node
+
+    def _determinize(
+        self,
+        player: Player,
+        stack: List[int],
+        game_state: "GameState",
+        phase: int,
+        hands: List[int],
+    ) -> Position:
+        """Builds the position of a deal of hidden cards drawn by the DealSampler"""
+        players = game_state.players
+        seats = {id(seat_player): seat for seat, seat_player in enumerate(players)}
+        return Position(
+            hands=hands,
+            suits=[seat_player.suit for seat_player in players],
+            to_act=seats[id(player)],
+            stack=stack,
+            next_seats=[
+                seats[id(seat_player.next_player_init)] for seat_player in players
+            ],
+            phase=phase,
+        )
+
+    def _iterate(self, root: Node, position: Position):
+        """Runs selection, expansion, playout and backpropagation in one determinization"""
+        node = root
+        # Selection, descend while every legal move of the determinization has a child
+        while not position.is_over:
+            legal_mask = position.legal_move_mask()
+            untried = []
+            best_child, best_score = None, -1.0
+            mask = legal_mask
+            while mask:
+                low_bit = mask & -mask
+                move = low_bit.bit_length() - 1
+                mask ^= low_bit
+                child = node.children.get(move)
+                if child is None:
+                    untried.append(move)
+                    continue
+                child.available += 1
+                if untried:
+                    continue
+                score = child.reward / child.visits + self.exploration * math.sqrt(
+                    math.log(max(child.available, 1)) / child.visits
+                )
+                if score > best_score:
+                    best_child, best_score = child, score
+
+            if untried:
+                move = self.rng.choice(untried)
+                child = Node(move, position.to_act, node)
+                child.available = 1
+                node.children[move] = child
+                position.step(move)
+                node = child
+                break
+            position.step(best_child.move)
+            node = best_child
+
+        # Playout
+        moves = 0
+        while not position.is_over and moves < MAX_PLAYOUT_MOVES:
+            position.step(self.rollout_policy(position, self.rng))
+            moves += 1
+
+        # Backpropagation
+        loser = position.loser if position.is_over else None
+        while node is not None:
+            node.visits += 1
+            if loser is None:
+                node.reward += DRAW_REWARD
+            elif loser != node.seat:
+                node.reward += 1.0
+            node = node.parent
@@ -1,13 +1,14 @@
 import os
 import random
 from abc import ABC, abstractmethod
-from typing import List, Any, Optional, Iterable
+from typing import List, Optional, Iterable
 from typing import TYPE_CHECKING
 
 from deck.card_encoding import SUITS
-from deck.deck_functions import visualise_set_of_cards, Card
+from deck.deck_functions import visualise_set_of_cards, Card, CardSet
 
 if TYPE_CHECKING:
+    from game.game_log import GameLog
     from game.game_state import GameState
 
 OptionalCardList = List[Optional[Card]]
@@ -16,13 +17,25 @@ OptionalCardList = List[Optional[Card]]
 class PlayerType(ABC):
     """Abstract class for representation of player with ability to make choices in game"""
 
+    def set_rng(self, rng: random.Random):
+        """Method for seeding random choices of the player, ignored by deterministic players
+        Args:
+            rng: random generator to draw choices from
+        """
+
+    def set_deadline(self, deadline: Optional[float]):
+        """Method for limiting the time of the next decision, ignored by players that decide at once
+        Args:
+            deadline: time.perf_counter reading the decision should be made by, None for no limit
+        """
+
     @abstractmethod
     def select_card_to_beat(
         self,
         list_of_cards: OptionalCardList,
         player: "Player",
         card_stack: OptionalCardList,
-        play_history: List[str],
+        play_history: "GameLog",
         game_state: "GameState",
         play_no: int,
         allow_pickup: bool = True,
@@ -48,7 +61,7 @@ class PlayerType(ABC):
         list_of_cards: OptionalCardList,
         player: "Player",
         card_stack: OptionalCardList,
-        play_history: List[str],
+        play_history: "GameLog",
         game_state: "GameState",
         play_no: int,
         allow_pickup: bool = True,
@@ -77,7 +90,7 @@ class HumanInput(PlayerType):
         list_of_cards: OptionalCardList,
         player: "Player",
         card_stack: OptionalCardList,
-        play_history: List[str],
+        play_history: "GameLog",
         game_state: "GameState",
         play_no: int,
         allow_pickup: bool = True,
@@ -104,7 +117,7 @@ class HumanInput(PlayerType):
         list_of_cards: OptionalCardList,
         player: "Player",
         card_stack: OptionalCardList,
-        play_history: List[str],
+        play_history: "GameLog",
         game_state: "GameState",
         play_no: int,
         allow_pickup: bool = True,
@@ -126,13 +139,65 @@ class HumanInput(PlayerType):
             list_of_cards, player, card_stack, play_no, play_history, allow_pickup
         )
 
+    @staticmethod
+    def card_prompt(
+        list_of_cards: Iterable[Card],
+        player: "Player",
+        card_stack: OptionalCardList,
+        play_no: int,
+        play_history: Optional["GameLog"] = None,
+    ) -> str:
+        """Visualises all cards of a decision as text shown to a human player
+        Args:
+            list_of_cards: available cards to play from hand
+            player: player whose cards to show
+            card_stack: card stack to visualise
+            play_no: which card is player currently playing
+            play_history: history of moves in the game
+
+        Returns:
+            Text of the decision"""
+        prompt = ""
+        if play_history:
+            prompt += f"""Play history:
+        {play_history.render()}
+-----------------------------------------------------------------------------------
+"""
+        return (
+            prompt
+            + f"""Player {player.name} to play {play_no}{f"st" if play_no == 1 else "nd"} card
+        -----------------------------------------------------------------------------------
+        Select 0 to pickup cards, or ID of card to play. Your suit: {SUITS[player.suit]}, next player suit: {SUITS[player.next_active_player().suit]}
+        {visualise_set_of_cards(player.hand)}
+        Card stack: {[str(c) for c in card_stack[-3:]]}, total stack {len(card_stack)}
+        -----------------------------------------------------------------------------------"""
+        )
+
+    @staticmethod
+    def legal_card_ids(
+        list_of_cards: Iterable[Card], player: "Player", allow_pickup: bool = True
+    ) -> List[int]:
+        """Returns IDs a human player may choose, 0 to pick up and position in hand + 1 for cards
+        Args:
+            list_of_cards: available cards to play from hand
+            player: player to make the move
+            allow_pickup: allow pickup of cards flag
+
+        Returns:
+            Legal IDs to choose
+        """
+        legal_ids = [
+            idx + 1 for idx, card in enumerate(player.hand) if card in list_of_cards
+        ]
+        return legal_ids + [0] if allow_pickup else legal_ids
+
     @staticmethod
     def card_play_input(
         list_of_cards: Iterable[Card],
         player: "Player",
         card_stack: OptionalCardList,
         play_no: int,
-        play_history: Optional[List[str]] = None,
+        play_history: Optional["GameLog"] = None,
         allow_pickup: bool = True,
     ) -> Optional[Card]:
         """Visualises all cards and asks for a card to play
@@ -148,32 +213,21 @@ class HumanInput(PlayerType):
             card selected to play"""
 
         os.system("cls")
-        if play_history:
-            print(
-                f"""Play history:
-        {"".join(play_history)}"""
-            )
-            print(
-                "-----------------------------------------------------------------------------------"
+        print(
+            HumanInput.card_prompt(
+                list_of_cards, player, card_stack, play_no, play_history
             )
+        )
 
         card_idx = None
-        legal_idx_to_choose = [
-            idx + 1 for idx, card in enumerate(player.hand) if card in list_of_cards
-        ]
-        print(
-            f"""Player {player.name} to play {play_no}{f"st" if play_no == 1 else "nd"} card
-        -----------------------------------------------------------------------------------
-        Select 0 to pickup cards, or ID of card to play. Your suit: {SUITS[player.suit]}, next player suit: {SUITS[player.next_player.suit]}
-        {visualise_set_of_cards(player.hand)}
-        Card stack: {[str(c) for c in card_stack[-3:]]}, total stack {len(card_stack)}
-        -----------------------------------------------------------------------------------"""
+        legal_idx_to_choose = HumanInput.legal_card_ids(
+            list_of_cards, player, allow_pickup
         )
 
         while card_idx is None:
             try:
                 card_idx = int(input("ID of card to play: "))
-                if card_idx not in legal_idx_to_choose + [0 if allow_pickup else None]:
+                if card_idx not in legal_idx_to_choose:
                     raise ValueError
 
             except ValueError:
@@ -186,14 +240,27 @@ class HumanInput(PlayerType):
 
 
 class RandomBot(PlayerType):
-    """Bot player for the game that plays random cards"""
+    """Bot player for the game that plays random cards
+    Args:
+        rng: (Optional) random generator to draw choices from, global random state is used otherwise
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random
+
+    def set_rng(self, rng: random.Random):
+        """Method for seeding random choices of the player
+        Args:
+            rng: random generator to draw choices from
+        """
+        self.rng = rng
 
     def select_card_to_beat(
         self,
         list_of_cards: OptionalCardList,
         player: "Player",
         card_stack: OptionalCardList,
-        play_history: List[str],
+        play_history: "GameLog",
         game_state: "GameState",
         play_no: int,
         allow_pickup: bool = True,
@@ -212,14 +279,14 @@ class RandomBot(PlayerType):
             Card to beat with or None
         """
 
-        return random.choice(list_of_cards + [None])
+        return self.rng.choice([*list_of_cards, None])
 
     def select_card_to_play(
         self,
         list_of_cards: OptionalCardList,
         player: "Player",
         card_stack: OptionalCardList,
-        play_history: List[str],
+        play_history: "GameLog",
         game_state: "GameState",
         play_no: int,
         allow_pickup: bool = True,
@@ -239,8 +306,8 @@ class RandomBot(PlayerType):
         """
 
         if allow_pickup is False:
-            return random.choice(list_of_cards)
-        return random.choice(list_of_cards + [None])
+            return self.rng.choice(list(list_of_cards))
+        return self.rng.choice([*list_of_cards, None])
 
 
 class Player:
@@ -255,7 +322,7 @@ class Player:
         self.player_type: Optional[PlayerType] = player_type
 
         self.score: int = 0
-        self.hand: List[Card] = []
+        self.hand: CardSet = CardSet()
 
         self.next_player_init: Optional[Player] = None
         self.previous_player_init: Optional[Player] = None
@@ -270,18 +337,18 @@ class Player:
         Args:
             list_of_cards: list of tuple that represents a card to add to players hand
         """
-        self.hand = self.hand + list_of_cards
+        self.hand.add_cards(list_of_cards)
 
     def remove_cards(self, list_of_cards: List[Card]):
         """Method to remove cards from the players hand
         Args:
             list_of_cards: list of tuple that represents a card to remove from players hand
         """
-        [self.hand.remove(card) for card in list_of_cards if card in self.hand]
+        self.hand.remove_cards(list_of_cards)
 
     def remove_all_cards(self):
         """Method to remove all cards from the players hand"""
-        self.hand = []
+        self.hand.clear()
 
     def has_card(self, card: Card):
         """Method to check if a player has specified card in hand
@@ -307,6 +374,13 @@ class Player:
         self.previous_player = prev_player
         self.next_player = next_player
 
+    def next_active_player(self) -> "Player":
+        """Returns the next player in line that still has cards"""
+        next_player = self.next_player
+        while not next_player.hand:
+            next_player = next_player.next_player
+        return next_player
+
     def reset_player_reference(self):
         """Method to reset initial references to a player playing after and before current player
         Args:
@@ -318,36 +392,4 @@ class Player:
         self.next_player = self.next_player_init
 
     def sort_cards(self):
-        """Method for sorting player cards"""
-        self.hand = sorted(self.hand, key=lambda card: (card.suit, card.face))
-
-
-class MyCycle:
-    """Object that allows to cycle over given list and remove elements from it"""
-
-    def __init__(self, lst: List[Optional[Player]]):
-        self.list = lst
-
-    def __iter__(self):
-        while True:
-            items_left = False
-            for x in self.list:
-                if x is not None:
-                    items_left = True
-                    yield x
-            if not items_left:
-                return
-
-    def __len__(self):
-        return len([el for el in self.list if el])
-
-    def remove(self, e: Any):
-        """Method to remove element from list
-        Args:
-            e: element to remove from list
-        """
-        self.list[self.list.index(e)] = None
-
-    def elements(self):
-        """Method to return list of elements still in cycle"""
-        return [el for el in self.list if el]
+        """Method for sorting player cards, CardSet already iterates in (suit, face) order"""
@@ -0,0 +1,80 @@
+import numpy as np
+
+from game.batch_engine import (
+    BatchEngine,
+    LOW_CARD_ORDER,
+    UNFINISHED_GAME,
+    lowest_card_policy,
+    playout_loss_rates,
+    random_policy,
+    scored_policy,
+)
+from game.position import PICKUP, PICKUP_BIT
+from game.solvability_study import deal_position
+
+
+def play_lowest_cards(position, max_moves=600):
+    for _ in range(max_moves):
+        if position.is_over:
+            return position.loser if position.loser is not None else -1
+        legal_mask = position.legal_move_mask()
+        move = next(
+            (card_idx for card_idx in LOW_CARD_ORDER if legal_mask >> card_idx & 1),
+            PICKUP,
+        )
+        position.step(move)
+    return UNFINISHED_GAME
+
+
+def test_batch_engine_matches_position_rules():
+    positions = [
+        deal_position(n_players, 3, deal_no)
+        for n_players in (2, 3, 4)
+        for deal_no in range(20)
+    ]
+    expected = [play_lowest_cards(position.copy()) for position in positions]
+
+    for n_players in (2, 3, 4):
+        batch = [position for position in positions if len(position.hands) == n_players]
+        engine = BatchEngine.from_positions(batch)
+        losers = engine.run(lowest_card_policy, np.random.default_rng(0))
+        assert losers.tolist() == [
+            loser
+            for position, loser in zip(positions, expected)
+            if len(position.hands) == n_players
+        ]
+
+
+def test_batch_engine_legal_moves_match_position():
+    position = deal_position(3, 1, 0)
+    engine = BatchEngine.from_positions([position.copy() for _ in range(50)])
+    rng = np.random.default_rng(1)
+
+    for _ in range(30):
+        moves = random_policy(
+            engine, engine.legal_card_masks(), engine.can_pick_up(), rng
+        )
+        engine.step(np.full(50, moves[0]))
+        position.step(int(moves[0]))
+        if position.is_over:
+            break
+        legal_mask = engine.legal_card_masks()[0] | engine.can_pick_up()[0] * PICKUP_BIT
+        assert legal_mask == position.legal_move_mask()
+
+
+def test_scored_policy_plays_highest_scored_legal_move():
+    engine = BatchEngine.from_positions([deal_position(2, 0, 0)])
+    scores = np.arange(PICKUP + 1, dtype=float)[None, :]
+    policy = scored_policy(lambda batch: scores)
+
+    card_masks = engine.legal_card_masks()
+    move = policy(engine, card_masks, engine.can_pick_up(), None)[0]
+
+    assert move == int(card_masks[0]).bit_length() - 1
+
+
+def test_playout_loss_rates_sum_to_at_most_one():
+    rates = playout_loss_rates(deal_position(3, 2, 0), 200, seed=0)
+
+    assert rates.shape == (3,)
+    assert 0 < rates.sum() <= 1
@@ -0,0 +1,65 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from game.encoding import ENCODING_SIZE
+from game.server import play_bot_tables
+from game.simulation import simulate
+from player.batched_bot import (
+    N_MOVES,
+    BatchEvaluator,
+    BatchedBot,
+    random_policy,
+)
+
+
+def test_decisions_of_concurrent_games_are_scored_together():
+    calls = []
+    rng = np.random.default_rng(0)
+
+    def policy(features, legal):
+        calls.append((features.shape, legal.shape))
+        return features[:, :N_MOVES] + rng.random(legal.shape)
+
+    with BatchEvaluator(policy, batch_size=4, max_wait=0.002) as evaluator:
+        with ThreadPoolExecutor(4) as executor:
+            results = list(
+                executor.map(
+                    lambda seed: simulate(1, [BatchedBot(evaluator)] * 3, seed),
+                    range(4),
+                )
+            )
+
+    assert all(set(result.loser) <= {-1, 0, 1, 2} for result in results)
+    assert evaluator.decisions == sum(shape[0] for shape, _ in calls)
+    assert max(shape[0] for shape, _ in calls) <= 4
+    assert evaluator.mean_batch_size > 1
+    assert all(shape[1] == ENCODING_SIZE for shape, _ in calls)
+
+
+def test_bot_tables_share_an_evaluator():
+    with BatchEvaluator(random_policy(0), batch_size=4) as evaluator:
+        with ThreadPoolExecutor(4) as executor:
+            losers = asyncio.run(
+                play_bot_tables(
+                    4,
+                    n_seats=2,
+                    bot_factory=lambda: BatchedBot(evaluator),
+                    executor=executor,
+                    target_score=1,
+                )
+            )
+
+    assert set(losers) <= {0, 1}
+    assert evaluator.mean_batch_size > 1
+
+
+def test_policy_errors_reach_the_deciding_game():
+    def policy(features, legal):
+        raise RuntimeError("model failed")
+
+    with BatchEvaluator(policy, batch_size=1) as evaluator:
+        with pytest.raises(RuntimeError):
+            simulate(1, [BatchedBot(evaluator), BatchedBot(evaluator)], seed=0)
@@ -0,0 +1,23 @@
+from benchmarks.run_benchmarks import append_history, find_regressions, load_history
+
+
+def test_find_regressions_flags_metrics_worse_than_threshold():
+    history = [
+        {"results": {"subgame": {"games_per_sec": 100.0, "peak_kib_per_game": 10.0}}}
+    ]
+    results = {"subgame": {"games_per_sec": 85.0, "peak_kib_per_game": 10.5}}
+
+    regressions = find_regressions(results, history, threshold=10)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("subgame.games_per_sec")
+
+
+def test_history_round_trip_keeps_results(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    append_history(path, {"deck": {"deals_per_sec": 1.0}})
+    append_history(path, {"deck": {"deals_per_sec": 2.0}})
+
+    history = load_history(path)
+
+    assert [entry["results"]["deck"]["deals_per_sec"] for entry in history] == [1, 2]
@@ -0,0 +1,55 @@
+from deck.deck_functions import Card, CardSet, ENCODED_CARDS, FULL_MASK, popcount
+from player.player_functions import Player
+
+card1 = Card((14, 1))
+card2 = Card((9, 4))
+card3 = Card((10, 3))
+
+
+def test_card_index_is_unique_for_each_card():
+    assert sorted(card.index for card in ENCODED_CARDS) == list(range(24))
+
+
+def test_card_set_add_and_remove_updates_membership_and_size():
+    card_set = CardSet([card2])
+    card_set.add(card3)
+
+    assert card3 in card_set
+    assert len(card_set) == 2
+
+    card_set.discard(card2)
+
+    assert card2 not in card_set
+    assert len(card_set) == 1
+
+
+def test_card_set_iterates_in_suit_then_face_order():
+    card_set = CardSet(FULL_MASK)
+
+    assert list(card_set) == sorted(
+        ENCODED_CARDS, key=lambda card: (card.suit, card.face)
+    )
+
+
+def test_card_set_none_is_never_contained():
+    assert None not in CardSet(FULL_MASK)
+
+
+def test_player_hand_add_and_remove_cards():
+    player = Player("test")
+    player.add_cards([card3, card1, card2])
+    player.remove_cards([card3, Card((12, 2))])
+
+    assert list(player.hand) == [card1, card2]
+    assert player.has_card(card1)
+    assert not player.has_card(card3)
+
+
+def test_popcount_counts_cards_of_a_mask():
+    assert popcount(0) == 0
+    assert popcount(FULL_MASK) == 24
+    assert (
+        len(CardSet([card1, card2, card3]))
+        == popcount(CardSet([card1, card2, card3]).mask)
+        == 3
+    )
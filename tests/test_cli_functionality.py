@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+from game.cli import main
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _modules_after(code: str) -> set:
+    output = subprocess.run(
+        [sys.executable, "-c", f"import sys\n{code}\nprint(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+    ).stdout
+    return set(output.splitlines()[-1].split())
+
+
+def test_cli_and_play_do_not_import_numpy():
+    assert "numpy" not in _modules_after("import game.cli")
+    assert "numpy" not in _modules_after(
+        "from game.cli import main\n"
+        "main(['play', '--players', '2', '--bots', '2', '--bot', 'heuristic', '--seed', '0'])"
+    )
+
+
+def test_simulate_command_prints_seat_losses(capsys):
+    assert (
+        main(["simulate", "--games", "5", "--players", "3", "--bot", "heuristic"]) == 0
+    )
+
+    assert capsys.readouterr().out.count("lost") == 3
+
+
+def test_tournament_command_prints_each_bot(capsys):
+    args = ["tournament", "heuristic", "random", "--matches", "4", "--workers", "1"]
+
+    assert main(args) == 0
+
+    output = capsys.readouterr().out
+    assert "heuristic" in output and "random" in output
+
+
+def test_solve_command_reports_aborted_search(capsys):
+    assert main(["solve", "--max-nodes", "10"]) == 1
+    assert "aborted" in capsys.readouterr().out
@@ -0,0 +1,66 @@
+import itertools
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from game.batch_engine import popcount
+from game.deal_sampler import DealSampler, HandConstraints, hand_constraints
+from game.game_state import GameState
+from game.simulation import setup_simulation_game
+from player.player_functions import RandomBot
+
+
+def test_sampler_is_uniform_when_constraints_interact():
+    # Card 2 is known to be with seat 1, card 7 can only be with seat 2 and card 3 only with seat 1
+    constraints = HandConstraints(
+        fixed=(0b11, 1 << 2, 0),
+        counts=(2, 3, 3),
+        possible=(0b11, 0b01111100, 0b11110000),
+    )
+    consistent = []
+    for pair in itertools.combinations(range(3, 8), 2):
+        seat_1 = 1 << 2 | sum(1 << card for card in pair)
+        seat_2 = sum(1 << card for card in range(3, 8) if card not in pair)
+        if (
+            not seat_1 & ~constraints.possible[1]
+            and not seat_2 & ~constraints.possible[2]
+        ):
+            consistent.append((0b11, seat_1, seat_2))
+
+    sampler = DealSampler(constraints)
+    deals = Counter(
+        map(tuple, sampler.sample(30000, np.random.default_rng(0)).tolist())
+    )
+
+    assert sampler.n_deals == len(consistent)
+    assert set(deals) == set(consistent)
+    assert max(deals.values()) / min(deals.values()) < 1.15
+
+
+def test_sampler_rejects_impossible_constraints():
+    with pytest.raises(ValueError):
+        DealSampler(HandConstraints(fixed=(0, 0), counts=(2, 1), possible=(0b1, 0b110)))
+
+
+def test_sampled_deals_follow_the_game_state():
+    game = setup_simulation_game([RandomBot() for _ in range(4)])
+    game.deal_cards(random.Random(3))
+    game.set_trumps()
+    game.share_nines()
+    game_state = GameState(game.players, card_stack=[], card_to_beat=False)
+    card = next(iter(game.players[1].hand))
+    game.players[1].remove_cards([card])
+    game_state.remove_known_cards(game.players[1], [card], [card])
+    game.players[2].add_cards([card])
+    game_state.add_known_cards(game.players[2], [card])
+    observer = game.players[0]
+
+    constraints = hand_constraints(game_state, observer)
+    deals = DealSampler(constraints).sample(1000, np.random.default_rng(1))
+
+    assert (deals[:, 0] == observer.hand.mask).all()
+    assert (deals[:, 2] & card.mask == card.mask).all()
+    assert (popcount(deals) == np.array(constraints.counts)).all()
+    assert (np.bitwise_or.reduce(deals, axis=1) == (1 << 24) - 1).all()
@@ -0,0 +1,77 @@
+import random
+
+import numpy as np
+
+from game.encoding import (
+    ACTIVE,
+    CARD_COUNTS,
+    ENCODING_SIZE,
+    HAND_PLANE,
+    KNOWN_PLANES,
+    N_CARDS,
+    PHASE,
+    STACK_PLANE,
+    TRUMPS,
+    StateEncoder,
+    encode_state,
+)
+from game.game_state import GameState
+from game.position import BEAT
+from game.simulation import setup_simulation_game
+from player.player_functions import RandomBot
+
+
+def _dealt_game_state(n_players: int = 4):
+    game = setup_simulation_game([RandomBot() for _ in range(n_players)])
+    game.deal_cards(random.Random(5))
+    game.set_trumps()
+    game.share_nines()
+    return game, GameState(game.players, card_stack=[], card_to_beat=False)
+
+
+def _plane(row: np.ndarray, plane: int) -> int:
+    bits = row[plane * N_CARDS : (plane + 1) * N_CARDS].astype(int)
+    return sum(bit << card_idx for card_idx, bit in enumerate(bits))
+
+
+def test_encoding_holds_private_view_of_observer():
+    game, game_state = _dealt_game_state()
+    observer = game.players[0]
+    opponent = observer.next_player_init
+    card = next(iter(opponent.next_player_init.hand))
+    opponent.next_player_init.remove_cards([card])
+    game_state.remove_known_cards(opponent.next_player_init, [card], [card])
+    opponent.add_cards([card])
+    game_state.add_known_cards(opponent, [card])
+    lead_card = next(iter(observer.hand))
+    observer.remove_cards([lead_card])
+    game_state.remove_known_cards(observer, [lead_card], [lead_card])
+    game_state.adjust_card_to_beat(True)
+
+    row = encode_state(game_state, observer)
+
+    assert row.shape == (ENCODING_SIZE,)
+    assert _plane(row, HAND_PLANE) == observer.hand.mask
+    assert _plane(row, KNOWN_PLANES) & card.mask
+    assert _plane(row, STACK_PLANE) == lead_card.mask
+    assert row[CARD_COUNTS + 1] * N_CARDS == len(opponent.hand)
+    assert row[ACTIVE : ACTIVE + 4].tolist() == [1, 1, 1, 1]
+    assert row[TRUMPS : TRUMPS + 16].reshape(4, 4).sum(axis=1).tolist() == [1] * 4
+    assert row[TRUMPS + observer.suit - 1] == 1
+    assert row[PHASE + BEAT] == 1 and row[PHASE:].sum() == 1
+
+
+def test_batch_encoding_matches_single_states_and_views():
+    game, game_state = _dealt_game_state(3)
+    encoder = StateEncoder(batch_size=8)
+    out = np.full((8, ENCODING_SIZE), 7, dtype=np.float32)
+
+    rows = encoder.encode(out, [game_state] * 3, game.players)
+
+    assert rows.shape == (3, ENCODING_SIZE)
+    assert (out[3:] == 7).all()
+    for row, player in zip(rows, game.players):
+        assert (row == encode_state(game_state, player)).all()
+        view = game_state.private_game_state(player)
+        assert (row == encode_state(view, player)).all()
+    assert rows[:, ACTIVE + 3].sum() == 0
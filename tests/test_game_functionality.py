@@ -0,0 +1,113 @@
+import itertools
+import random
+from typing import List, Optional
+
+from deck.card_encoding import SUITS
+from deck.deck_functions import CARDS_BY_INDEX, Card, CardSet, FULL_MASK
+from game.game_functions import (
+    check_play_validity,
+    get_available_play_card,
+    get_legal_beat_mask,
+    VezimasSubgame,
+)
+from game.simulation import setup_simulation_game
+from player.player_functions import Player, RandomBot
+
+
+def _make_players(player_suit: int, next_player_suit: int):
+    player, next_player = Player("player"), Player("next player")
+    player.suit, next_player.suit = player_suit, next_player_suit
+    player.add_player_reference(next_player, next_player)
+    next_player.add_player_reference(player, player)
+    next_player.add_cards([Card((9, next_player_suit))])
+    return player, next_player
+
+
+def _baseline_check_play_validity(
+    card_stack: List[Card], card_to_beat: Optional[Card], player: Player
+) -> bool:
+    """check_play_validity as it was before the rule was precomputed, kept as the oracle"""
+    if not card_to_beat:
+        return True
+    last_card = card_stack[-1]
+    next_player_suit = None
+    next_player_to_play = player.next_player
+
+    while next_player_suit is None:
+        if next_player_to_play.hand:
+            next_player_suit = next_player_to_play.suit
+        else:
+            next_player_to_play = next_player_to_play.next_player
+
+    if last_card.suit == player.suit and card_to_beat.suit != player.suit:
+        return False
+
+    if last_card.suit == player.suit and last_card > card_to_beat:
+        return False
+
+    if last_card.suit == next_player_suit and card_to_beat.suit != player.suit:
+        return False
+
+    if last_card.suit != next_player_suit and last_card.suit != player.suit:
+        if card_to_beat.suit != player.suit:
+            if card_to_beat.suit != last_card.suit:
+                return False
+            if last_card > card_to_beat:
+                return False
+
+    return True
+
+
+def test_legal_beat_masks_match_check_play_validity_exhaustively():
+    for player_suit, next_player_suit in itertools.product(SUITS, SUITS):
+        player, _ = _make_players(player_suit, next_player_suit)
+        for last_card in CARDS_BY_INDEX:
+            legal_mask = get_legal_beat_mask(
+                last_card.index, player_suit, next_player_suit
+            )
+            for card in CARDS_BY_INDEX:
+                expected = _baseline_check_play_validity([last_card], card, player)
+                assert bool(legal_mask & card.mask) == expected
+                assert check_play_validity([last_card], card, player) == expected
+
+
+def test_get_available_play_card_skips_players_without_cards():
+    player, next_player = _make_players(2, 3)
+    empty_player = Player("empty")
+    empty_player.suit = 4
+    player.add_player_reference(next_player, empty_player)
+    empty_player.add_player_reference(player, next_player)
+    player.add_cards(CardSet(FULL_MASK))
+
+    available = get_available_play_card([Card((12, 3))], player)
+
+    assert set(available) == {
+        card
+        for card in CARDS_BY_INDEX
+        if check_play_validity([Card((12, 3))], card, player)
+    }
+    assert all(card.suit == 2 for card in available)
+
+
+def test_subgame_driven_by_play_move_keeps_players_and_position_in_sync():
+    game = setup_simulation_game([RandomBot() for _ in range(3)])
+    game.deal_cards(random.Random(2))
+    game.set_trumps()
+    game.share_nines()
+    trick = VezimasSubgame(game)
+    trick.setup_position()
+    rng = random.Random(3)
+
+    while not trick.position.is_over:
+        before = trick.position.copy()
+        undo = before.apply(rng.choice(before.legal_moves()))
+        before.undo(undo)
+        assert before.key == trick.position.key
+
+        trick.play_move(rng.choice(trick.position.legal_moves()))
+        assert [player.hand.mask for player in game.players] == trick.position.hands
+        assert [card.index for card in trick.card_stack] == trick.position.stack
+
+    assert {game.players.index(p) for p in trick.remaining_players()} <= {
+        trick.position.loser
+    }
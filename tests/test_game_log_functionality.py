@@ -0,0 +1,68 @@
+import numpy as np
+
+from deck.deck_functions import Card
+from game.game_functions import VezimasSubgame
+from game.game_log import (
+    GameLog,
+    LEAD_CARD,
+    BEAT_CARD,
+    PLAY_CARD,
+    PICKUP_CARDS,
+    PLAYER_LOST,
+    load_records,
+)
+from game.simulation import game_rng, setup_simulation_game
+from player.player_functions import Player, RandomBot
+
+card1 = Card((10, 1))
+card2 = Card((11, 1))
+card3 = Card((12, 2))
+
+
+def make_log():
+    players = [Player("a", RandomBot()), Player("b", RandomBot())]
+    players[0].suit, players[1].suit = 1, 2
+    game_log = GameLog(players)
+    game_log.append(1, 0, LEAD_CARD, card1.index)
+    game_log.append(2, 1, BEAT_CARD, card2.index)
+    game_log.append(2, 1, PLAY_CARD, card3.index)
+    game_log.append(3, 0, PICKUP_CARDS, 3)
+    game_log.append(3, 1, PLAYER_LOST)
+    return game_log
+
+
+def test_game_log_renders_moves_as_text():
+    assert make_log().render() == (
+        f"\na♣: 1st card: {card1} "
+        f"\nb♠: 1st card: {card2} 2nd card: {card3}"
+        "\na♣: Pickup cards(3)b lost the game"
+    )
+
+
+def test_game_log_saved_records_are_memory_mapped_back(tmp_path):
+    game_log = make_log()
+    path = str(tmp_path / "log.npy")
+    game_log.save(path)
+
+    records = load_records(path)
+
+    assert isinstance(records, np.memmap)
+    assert np.array_equal(records, game_log.records)
+    assert GameLog.from_records(records).records.tolist() == game_log.records.tolist()
+
+
+def test_subgame_log_records_every_turn():
+    game = setup_simulation_game([RandomBot() for _ in range(3)])
+    rng = game_rng(5, 0)
+    for player_type in game.player_types:
+        player_type.set_rng(rng)
+    game.deal_cards(rng)
+    game.set_trumps()
+    game.share_nines()
+    trick = VezimasSubgame(game)
+    trick.start_game()
+
+    records = trick.game_log.records
+    turns_started = np.isin(records["action"], (LEAD_CARD, BEAT_CARD, PICKUP_CARDS))
+    assert len(np.unique(records["turn"][turns_started])) == trick.turn_count
+    assert records["action"][-1] == PLAYER_LOST
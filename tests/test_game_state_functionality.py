@@ -0,0 +1,92 @@
+import pytest
+
+from deck.deck_functions import Card, FULL_MASK, cards_to_mask
+from game.game_state import GameState
+from game.simulation import simulate
+from player.player_functions import Player, RandomBot
+
+card1 = Card((10, 1))
+card2 = Card((11, 2))
+card3 = Card((12, 3))
+
+
+def make_game_state():
+    players = [Player("a", RandomBot()), Player("b", RandomBot())]
+    for player, suit in zip(players, (1, 2)):
+        player.suit = suit
+    players[0].add_cards([card1, card2])
+    players[1].add_cards([card3])
+    return players, GameState(players, card_stack=[], card_to_beat=False)
+
+
+def test_private_game_state_shows_observer_hand_only():
+    players, game_state = make_game_state()
+    snapshot = game_state.private_game_state(players[0])
+
+    assert list(snapshot.player_state["a"]["known_cards"]) == [card1, card2]
+    assert card3 not in snapshot.player_state["b"]["known_cards"]
+    assert snapshot.players[1] is players[1]
+
+
+def test_private_game_state_is_reused_until_state_changes():
+    players, game_state = make_game_state()
+    snapshot = game_state.private_game_state(players[0])
+
+    assert game_state.private_game_state(players[0]) is snapshot
+
+    players[0].remove_cards([card1])
+    game_state.remove_known_cards(players[0], [card1], [card1])
+    new_snapshot = game_state.private_game_state(players[0])
+
+    assert new_snapshot is not snapshot
+    assert snapshot.play_state["card_stack"] == ()
+    assert new_snapshot.play_state["card_stack"] == (card1,)
+
+
+def test_private_game_state_is_read_only():
+    players, game_state = make_game_state()
+    snapshot = game_state.private_game_state(players[0])
+
+    with pytest.raises(TypeError):
+        snapshot.player_state["a"]["no_cards"] = 0
+    with pytest.raises(AttributeError):
+        snapshot.players = []
+
+
+class BeliefCheckingBot(RandomBot):
+    """Random bot asserting the incremental masks of the game state at every decision"""
+
+    def check(self, game_state):
+        seen_mask = cards_to_mask(game_state.play_state["card_stack"])
+        for player in game_state.players:
+            seen_mask |= game_state.player_state[player.name]["known_cards"].mask
+        assert game_state.unseen_mask == FULL_MASK & ~seen_mask
+
+        for player in game_state.players:
+            possible_mask = game_state.possible_cards(player).mask
+            assert player.hand.mask & ~possible_mask == 0
+
+    def select_card_to_beat(self, list_of_cards, player, card_stack, *args, **kwargs):
+        self.check(kwargs["game_state"])
+        return super().select_card_to_beat(
+            list_of_cards, player, card_stack, *args, **kwargs
+        )
+
+    def select_card_to_play(self, list_of_cards, player, card_stack, *args, **kwargs):
+        self.check(kwargs["game_state"])
+        return super().select_card_to_play(
+            list_of_cards, player, card_stack, *args, **kwargs
+        )
+
+
+def test_game_state_masks_stay_consistent_through_games():
+    simulate(5, [BeliefCheckingBot() for _ in range(3)], seed=2)
+
+
+def test_private_game_state_hides_observer_hand_from_others():
+    players, game_state = make_game_state()
+    snapshot = game_state.private_game_state(players[0])
+
+    assert snapshot.possible_cards(players[0]).mask == players[0].hand.mask
+    assert snapshot.possible_cards(players[1]).mask & players[0].hand.mask == 0
+    assert card3 in snapshot.possible_cards(players[1])
@@ -0,0 +1,48 @@
+import random
+
+from deck.deck_functions import CARD_INDEX, cards_to_mask, Card
+from game.position import BEAT, LEAD, PICKUP
+from game.rules import LEGAL_BEAT_MASKS
+from game.simulation import TIED_GAME, simulate
+from game.tournament import run_tournament
+from player.heuristic_bot import HeuristicBot, heuristic_move, heuristic_rollout_move
+from player.ismcts_bot import ISMCTSBot
+from player.player_functions import RandomBot
+
+
+def _mask(*cards):
+    return cards_to_mask(Card(card) for card in cards)
+
+
+def test_heuristic_move_beats_cheaply_keeping_trumps():
+    hand = _mask((14, 3), (11, 3), (9, 1))
+    beat_mask = hand & LEGAL_BEAT_MASKS[CARD_INDEX[(10, 3)]][1][2]
+
+    assert heuristic_move(hand, beat_mask, BEAT, 1, 2, 3) == CARD_INDEX[(11, 3)]
+    assert heuristic_move(hand, 0, BEAT, 1, 2, 3) == PICKUP
+
+
+def test_heuristic_move_plays_cards_forcing_trumps_of_next_player():
+    hand = _mask((9, 4), (13, 2), (10, 3), (9, 1))
+
+    assert heuristic_move(hand, 0, LEAD, 1, 2, 3) == CARD_INDEX[(10, 3)]
+    assert heuristic_move(hand, 0, LEAD, 1, 3, 1) == CARD_INDEX[(10, 3)]
+    assert heuristic_move(_mask((9, 4), (9, 1)), 0, LEAD, 1, 2, 3) == CARD_INDEX[(9, 4)]
+    assert heuristic_move(_mask((9, 1)), 0, LEAD, 1, 2, 3) == CARD_INDEX[(9, 1)]
+
+
+def test_heuristic_bot_beats_random_bot():
+    results = run_tournament(200, [HeuristicBot(), RandomBot()], seed=0, workers=1)
+
+    assert results.type_stats["HeuristicBot"].ci_low > 0.9
+
+
+def test_ismcts_bot_finishes_games_with_heuristic_rollouts():
+    bots = [
+        ISMCTSBot(iterations=10, rollout_policy=heuristic_rollout_move),
+        HeuristicBot(rng=random.Random(0)),
+    ]
+
+    results = simulate(2, bots, seed=3)
+
+    assert set(results.loser) <= {TIED_GAME, 0, 1}
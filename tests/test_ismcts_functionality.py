@@ -0,0 +1,64 @@
+import random
+
+from game.game_state import GameState
+from game.simulation import setup_simulation_game, simulate
+from player.ismcts_bot import ISMCTSBot
+from player.player_functions import RandomBot
+
+
+def test_ismcts_bot_finishes_games():
+    results = simulate(1, [ISMCTSBot(iterations=10), ISMCTSBot(iterations=10)], seed=4)
+
+    assert results.loser[0] in (0, 1)
+
+
+def _beat_decision(seed: int):
+    """Deals a two player game, leads a card and returns what the other player has to beat"""
+    game = setup_simulation_game([RandomBot(), RandomBot()])
+    game.deal_cards(random.Random(seed))
+    leader = game.set_trumps()
+    game.share_nines()
+    game_state = GameState(game.players, card_stack=[], card_to_beat=True)
+
+    lead_card = next(iter(leader.hand))
+    leader.remove_cards([lead_card])
+    game_state.remove_known_cards(leader, [lead_card], [lead_card])
+    return game, game_state, leader, lead_card
+
+
+def test_ismcts_bot_reuses_tree_between_beat_and_play():
+    game, game_state, leader, lead_card = _beat_decision(1)
+    player = leader.next_player_init
+    seat = game.players.index(player)
+    bot = ISMCTSBot(iterations=50, rng=random.Random(2))
+
+    card_to_beat = bot.select_card_to_beat([], player, [lead_card], [], game_state, 1)
+    assert card_to_beat is not None
+    beat_node = bot._roots[seat][0]
+    player.remove_cards([card_to_beat])
+    card_to_play = bot.select_card_to_play(
+        [], player, [lead_card, card_to_beat], [], game_state, 2
+    )
+
+    assert card_to_play is not None
+    assert bot._roots[seat][0].parent is beat_node
+    assert beat_node.visits > 50
+
+
+def test_ismcts_bot_does_not_reuse_trees_of_other_seats_or_tricks():
+    game, game_state, leader, lead_card = _beat_decision(1)
+    player = leader.next_player_init
+    bot = ISMCTSBot(iterations=50, rng=random.Random(2))
+    card_to_beat = bot.select_card_to_beat([], player, [lead_card], [], game_state, 1)
+    beat_node = bot._roots[game.players.index(player)][0]
+    visits = beat_node.visits
+
+    # The leader sees the same stack, but searching in its tree would leak the hand of player
+    bot.select_card_to_beat([], leader, [lead_card, card_to_beat], [], game_state, 1)
+    player.remove_cards([card_to_beat])
+    next_trick_state = GameState(game.players, card_stack=[], card_to_beat=False)
+    bot.select_card_to_play(
+        [], player, [lead_card, card_to_beat], [], next_trick_state, 2
+    )
+
+    assert beat_node.visits == visits
@@ -0,0 +1,63 @@
+import pickle
+import random
+
+from game.canonical import canonicalize, _relabel_card, _relabel_mask
+from game.position import Position
+from game.position_cache import PositionCache, solve_cached
+from game.solver import Solver
+
+
+def _random_position(rng: random.Random, cards_per_player: int) -> Position:
+    cards = rng.sample(range(24), 3 * cards_per_player)
+    hands = [0, 0, 0]
+    for idx, card_idx in enumerate(cards):
+        hands[idx % 3] |= 1 << card_idx
+    return Position(hands, [1, 2, 3], rng.randrange(3))
+
+
+def _symmetric_position(position: Position) -> Position:
+    """Same position with suits relabelled and seats rotated by one"""
+    suit_map = {1: 3, 2: 4, 3: 1, 4: 2}
+    seats = len(position.hands)
+    order = [(seat - 1) % seats for seat in range(seats)]
+    return Position(
+        hands=[_relabel_mask(position.hands[seat], suit_map) for seat in order],
+        suits=[suit_map[position.suits[seat]] for seat in order],
+        to_act=(position.to_act + 1) % seats,
+    )
+
+
+def test_symmetric_positions_share_canonical_key():
+    position = _random_position(random.Random(3), 3)
+    symmetric = _symmetric_position(position)
+
+    assert symmetric.key != position.key
+    assert canonicalize(symmetric).key == canonicalize(position).key
+
+
+def test_cache_answers_symmetric_position_in_its_own_labels(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    position = _random_position(random.Random(7), 2)
+    symmetric = _symmetric_position(position)
+    cache = PositionCache(path)
+    result = solve_cached(Solver(), position, cache)
+    cache.close()
+
+    reopened = pickle.loads(pickle.dumps(PositionCache(path)))
+    cached = reopened.get(symmetric)
+
+    assert reopened.hits == 1
+    assert cached.loser == (None if result.loser is None else (result.loser + 1) % 3)
+    assert cached.best_move == _relabel_card(result.best_move, {1: 3, 2: 4, 3: 1, 4: 2})
+
+
+def test_cache_evicts_least_recently_used_from_memory(tmp_path):
+    cache = PositionCache(str(tmp_path / "cache.sqlite"), capacity=2)
+    rng = random.Random(1)
+    positions = [_random_position(rng, 1) for _ in range(3)]
+    for position in positions:
+        cache.put(position, None, None, 1)
+
+    assert len(cache._memory) == 2
+    assert cache.get(positions[0]) is not None
+    assert len(cache) == 3
@@ -0,0 +1,40 @@
+import json
+import pstats
+
+from game.profiling import (
+    DECISION,
+    DEAL,
+    MOVES,
+    PICKUPS,
+    ELIMINATIONS,
+    GameProfiler,
+)
+from game.simulation import game_rng, play_simulation_game, setup_simulation_game
+from player.player_functions import RandomBot
+
+
+def test_profiler_counts_moves_of_played_tricks():
+    profiler = GameProfiler()
+    game = setup_simulation_game([RandomBot() for _ in range(3)], profiler=profiler)
+    tricks = [play_simulation_game(game, game_rng(1, game_no)) for game_no in range(3)]
+
+    assert profiler.calls[DEAL] == 3
+    assert profiler.counters[PICKUPS] == sum(trick.pickup_count for trick in tricks)
+    assert profiler.counters[MOVES] == profiler.calls[DECISION]
+    assert 2 * 3 <= profiler.counters[ELIMINATIONS] <= 3 * 3
+    assert "decision" in profiler.summary()
+
+
+def test_profiler_dumps_chrome_trace_and_pstats(tmp_path):
+    profiler = GameProfiler(record_events=True)
+    game = setup_simulation_game([RandomBot() for _ in range(2)], profiler=profiler)
+    play_simulation_game(game, game_rng(2, 0))
+
+    trace_path, stats_path = tmp_path / "trace.json", tmp_path / "game.prof"
+    profiler.chrome_trace(str(trace_path))
+    profiler.dump_stats(str(stats_path))
+
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert any(event["name"] == DECISION for event in events)
+    stats = pstats.Stats(str(stats_path))
+    assert stats.stats[("vezimas", 0, DECISION)][0] == profiler.calls[DECISION]
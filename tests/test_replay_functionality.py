@@ -0,0 +1,62 @@
+from game.position import PICKUP
+from game.replay import (
+    Replay,
+    iter_positions,
+    load_archive,
+    move_agreement,
+    record_from_subgame,
+    save_archive,
+)
+from game.simulation import game_rng, play_simulation_game, setup_simulation_game
+from player.player_functions import RandomBot
+
+
+def play_records(n_games, n_players=3, seed=1):
+    game = setup_simulation_game([RandomBot() for _ in range(n_players)])
+    records, losers = [], []
+    for game_no in range(n_games):
+        trick = play_simulation_game(game, game_rng(seed, game_no), record_log=True)
+        remaining = trick.remaining_players()
+        losers.append(game.players.index(remaining[0]) if remaining else None)
+        records.append(record_from_subgame(trick))
+    return records, losers
+
+
+def test_replay_reaches_the_recorded_result():
+    records, losers = play_records(5)
+
+    for record, loser in zip(records, losers):
+        assert Replay(record).loser == loser
+
+
+def test_replay_seeking_matches_stepping_through_moves():
+    record = play_records(1)[0][0]
+    replay = Replay(record, checkpoint_interval=8)
+
+    position = record.initial_position()
+    for move_no, move in enumerate(record.moves.tolist()):
+        assert replay.position_at(move_no).key == position.key
+        position.step(move)
+    assert replay.position_at(len(replay)).key == position.key
+
+
+def test_archive_round_trip_keeps_records(tmp_path):
+    records, _ = play_records(3, n_players=4)
+    path = str(tmp_path / "archive.npz")
+    save_archive(path, records)
+
+    loaded = load_archive(path)
+
+    assert len(loaded) == 3
+    for record, loaded_record in zip(records, loaded):
+        assert loaded_record.hands == record.hands
+        assert loaded_record.moves.tolist() == record.moves.tolist()
+    assert len(list(iter_positions(loaded))) == sum(len(r.moves) for r in records)
+
+
+def test_move_agreement_of_pickup_policy_counts_pickups():
+    records, _ = play_records(2)
+    pickups = sum((record.moves == PICKUP).sum() for record in records)
+    moves = sum(len(record.moves) for record in records)
+
+    assert move_agreement(records, lambda position: PICKUP) == pickups / moves
@@ -0,0 +1,53 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from game.encoding import ENCODING_SIZE
+from game.selfplay import (
+    INDEX_FILE,
+    LOST,
+    NOT_LOST,
+    SelfPlayDataset,
+    generate_dataset,
+    shard_path,
+)
+from player.player_functions import RandomBot
+
+
+def test_dataset_records_legal_decisions_with_outcomes(tmp_path):
+    dataset = generate_dataset(
+        str(tmp_path), [RandomBot() for _ in range(3)], 2, seed=1, shard_size=300
+    )
+    shard = dataset.shard(0)
+
+    assert len(dataset) == 600
+    assert shard.states.shape == (300, ENCODING_SIZE)
+    assert isinstance(shard.states, np.memmap)
+    assert shard.legal[np.arange(300), shard.moves].all()
+    assert set(np.unique(shard.outcomes)) <= {LOST, 0, NOT_LOST}
+    assert (shard.outcomes == LOST).any()
+
+    batch = dataset.sample(64, np.random.default_rng(0))
+    assert batch.states.shape == (64, ENCODING_SIZE)
+    assert batch.legal[np.arange(64), batch.moves].all()
+
+
+def test_generation_resumes_without_duplicating_shards(tmp_path):
+    lineup = [RandomBot(), RandomBot()]
+    generate_dataset(str(tmp_path), lineup, 1, seed=2, shard_size=100, workers=1)
+    first_moves = np.load(shard_path(str(tmp_path), 0, "moves")).copy()
+    os.utime(shard_path(str(tmp_path), 0, "moves"), (0, 0))
+
+    dataset = generate_dataset(
+        str(tmp_path), lineup, 3, seed=2, shard_size=100, workers=2
+    )
+
+    with open(os.path.join(str(tmp_path), INDEX_FILE)) as index_file:
+        assert json.load(index_file)["shards"] == [0, 1, 2]
+    assert os.path.getmtime(shard_path(str(tmp_path), 0, "moves")) == 0
+    assert (SelfPlayDataset(str(tmp_path)).shard(0).moves == first_moves).all()
+    assert len(dataset) == 300
+    with pytest.raises(ValueError):
+        generate_dataset(str(tmp_path), lineup, 3, seed=3, shard_size=100)
@@ -0,0 +1,106 @@
+import asyncio
+import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from game.server import (
+    BotSeat,
+    CHOOSE_PREFIX,
+    RESULT_PREFIX,
+    Table,
+    TableServer,
+    play_bot_tables,
+)
+from game.time_control import TimeControl
+from player.player_functions import RandomBot
+
+
+class DeadlineBot(RandomBot):
+    """Random bot remembering the deadlines it was given"""
+
+    def __init__(self):
+        super().__init__()
+        self.deadlines = []
+
+    def set_deadline(self, deadline):
+        self.deadlines.append(deadline)
+
+
+def test_many_bot_tables_play_concurrently():
+    with ThreadPoolExecutor(4) as executor:
+        losers = asyncio.run(
+            play_bot_tables(100, n_seats=3, executor=executor, target_score=1)
+        )
+
+    assert len(losers) == 100
+    assert set(losers) <= {0, 1, 2}
+
+
+def test_bots_refuse_to_decide_in_a_process_pool():
+    with ProcessPoolExecutor(1) as executor:
+        with pytest.raises(ValueError):
+            BotSeat(RandomBot(), executor)
+        with pytest.raises(ValueError):
+            asyncio.run(
+                play_bot_tables(1, n_seats=3, executor=executor, target_score=1)
+            )
+
+
+def test_bot_tables_are_seeded():
+    assert asyncio.run(play_bot_tables(5, seed=3, target_score=2)) == asyncio.run(
+        play_bot_tables(5, seed=3, target_score=2)
+    )
+
+
+async def _play_as_client(port: int) -> list:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    results = []
+    while line := (await reader.readline()).decode():
+        if line.startswith(CHOOSE_PREFIX):
+            writer.write(b"99\n")
+            writer.write(f"{line.split()[1]}\n".encode())
+            await writer.drain()
+        elif line.startswith(RESULT_PREFIX):
+            results.append(line)
+    writer.close()
+    return results
+
+
+def test_human_seat_plays_over_a_socket():
+    async def run():
+        server = TableServer(n_seats=2, humans_per_table=1, target_score=1)
+        listening = await server.start()
+        port = listening.sockets[0].getsockname()[1]
+        results = await _play_as_client(port)
+        await server.close()
+        return server, results
+
+    server, results = asyncio.run(run())
+
+    assert server.results[0] in (0, 1)
+    assert not server.errors
+    assert len(results) >= 2
+
+
+def test_table_passes_deadlines_and_charges_clocks():
+    bots = [DeadlineBot(), DeadlineBot()]
+    table = Table(
+        [BotSeat(bot, offload=False) for bot in bots],
+        random.Random(0),
+        target_score=1,
+        time_control=TimeControl(move_time=1.0),
+    )
+
+    asyncio.run(table.play_match())
+
+    usage = table.game.time_control.usage()
+    assert all(bot.deadlines for bot in bots)
+    assert sum(seat.decisions for seat in usage) == sum(
+        len(bot.deadlines) for bot in bots
+    )
+
+
+def test_server_without_human_seats_refuses_to_listen():
+    with pytest.raises(ValueError):
+        asyncio.run(TableServer(humans_per_table=0).start())
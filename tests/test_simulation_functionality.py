@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from game.simulation import simulate, TIED_GAME
+from player.player_functions import RandomBot, HumanInput
+
+
+def test_simulate_with_same_seed_results_are_reproducible():
+    first = simulate(20, [RandomBot() for _ in range(3)], seed=11)
+    second = simulate(20, [RandomBot() for _ in range(3)], seed=11)
+
+    assert np.array_equal(first.loser, second.loser)
+    assert np.array_equal(first.turns, second.turns)
+    assert np.array_equal(first.pickups, second.pickups)
+
+
+def test_simulate_losers_are_valid_seats():
+    results = simulate(20, [RandomBot() for _ in range(4)], seed=3)
+
+    assert len(results.loser) == 20
+    assert set(results.loser.tolist()) <= {TIED_GAME, 0, 1, 2, 3}
+    assert (results.turns > 0).all()
+
+
+def test_simulate_with_human_player_error_is_raised():
+    with pytest.raises(ValueError):
+        simulate(1, [RandomBot(), HumanInput()], seed=0)
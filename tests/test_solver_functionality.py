@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from deck.deck_functions import Card
+from game.position import Position, PICKUP
+from game.solvability_study import (
+    ABORTED,
+    FORCED,
+    NO_FORCED_LOSER,
+    load_study,
+    run_study,
+)
+from game.solver import Solver, TranspositionTable
+
+
+def _random_position(rng: random.Random, cards_per_player: int) -> Position:
+    cards = rng.sample(range(24), 2 * cards_per_player)
+    hands = [0, 0]
+    for idx, card_idx in enumerate(cards):
+        hands[idx % 2] |= 1 << card_idx
+    return Position(hands, [1, 2], 0)
+
+
+def _retrograde_loser(root: Position):
+    """Exact loser by retrograde analysis of every reachable position"""
+    graph, to_visit = {}, [root.copy()]
+    while to_visit:
+        position = to_visit.pop()
+        if position.key in graph:
+            continue
+        children = []
+        if position.loser is None:
+            for move in position.legal_moves():
+                child = position.copy()
+                child.apply(move)
+                children.append(child.key)
+                to_visit.append(child)
+        graph[position.key] = (position.to_act, children)
+        if position.loser is not None:
+            graph[position.key] = (position.loser, None)
+
+    values = {
+        key: mover for key, (mover, children) in graph.items() if children is None
+    }
+    changed = True
+    while changed:
+        changed = False
+        for key, (mover, children) in graph.items():
+            if key in values:
+                continue
+            child_values = [values.get(child) for child in children]
+            if any(value is not None and value != mover for value in child_values):
+                values[key] = 1 - mover
+                changed = True
+            elif all(value == mover for value in child_values):
+                values[key] = mover
+                changed = True
+    return values.get(root.key)
+
+
+def test_position_apply_and_undo_restore_position():
+    rng = random.Random(5)
+    position = _random_position(rng, 6)
+    start_key, start_hands = position.key, list(position.hands)
+
+    undos = []
+    while not position.is_over and len(undos) < 40:
+        undos.append(position.apply(rng.choice(position.legal_moves())))
+        assert position.key == position._compute_key()
+    for undo in reversed(undos):
+        position.undo(undo)
+
+    assert position.key == start_key
+    assert position.hands == start_hands
+    assert position.stack == []
+
+
+def test_solver_last_card_lead_loses_the_other_player():
+    position = Position(
+        [Card((9, 1)).mask, Card((10, 1)).mask | Card((11, 2)).mask], [1, 2], 0
+    )
+    result = Solver().solve(position)
+
+    assert result.loser == 1
+    assert result.best_move == Card((9, 1)).index
+
+
+def test_solver_matches_retrograde_analysis():
+    rng = random.Random(1)
+    solver = Solver(TranspositionTable(12))
+    for _ in range(10):
+        position = _random_position(rng, 3)
+        result = solver.solve(position)
+
+        assert result.loser == _retrograde_loser(position)
+        assert result.best_move in position.legal_moves()
+        assert 0 <= result.hit_rate <= 1
+
+
+def test_transposition_table_keeps_expensive_entry_on_collision():
+    table = TranspositionTable(1)
+    table.store(0b10, 0, PICKUP, nodes=100)
+    table.store(0b100, 1, PICKUP, nodes=5)
+
+    assert table.probe(0b10) is not None
+    assert table.probe(0b100) is None
+
+
+def test_run_study_resumes_without_solving_finished_chunks(tmp_path):
+    written = run_study(
+        str(tmp_path),
+        3,
+        seed=1,
+        player_counts=(2,),
+        max_nodes=50,
+        chunk_size=2,
+        workers=1,
+    )
+    rerun = run_study(
+        str(tmp_path),
+        3,
+        seed=1,
+        player_counts=(2,),
+        max_nodes=50,
+        chunk_size=2,
+        workers=1,
+    )
+    study = load_study(str(tmp_path))
+
+    assert len(written) == 2
+    assert rerun == []
+    assert study["deal_no"].tolist() == [0, 1, 2]
+    assert set(study["status"].tolist()) <= {ABORTED, NO_FORCED_LOSER, FORCED}
+
+
+def test_run_study_refuses_a_directory_of_other_settings(tmp_path):
+    run_study(str(tmp_path), 1, seed=1, player_counts=(2,), max_nodes=50, workers=1)
+
+    with pytest.raises(ValueError):
+        run_study(str(tmp_path), 1, seed=2, player_counts=(2,), max_nodes=50, workers=1)
@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+from game.simulation import simulate
+from game.time_control import TimeControl
+from player.ismcts_bot import ISMCTSBot
+from player.player_functions import RandomBot
+
+
+def test_time_control_needs_a_budget():
+    with pytest.raises(ValueError):
+        TimeControl()
+
+
+def test_game_clock_is_charged_and_flags_when_used_up():
+    time_control = TimeControl(game_time=0.001)
+    time_control.start_game(2)
+    time_control.start_decision(0)
+    time.sleep(0.002)
+    time_control.end_decision(0)
+    time_control.start_decision(0)
+    time_control.end_decision(0)
+
+    usage = time_control.usage()
+    assert time_control.clocks[0] < 0
+    assert usage[0].decisions == 2
+    assert usage[0].overruns >= 1
+    assert usage[0].flags == 1
+    assert usage[1].decisions == 0
+
+
+def test_anytime_bot_stops_searching_at_the_move_deadline():
+    bots = [ISMCTSBot(iterations=10**9), RandomBot()]
+    time_control = TimeControl(move_time=0.01)
+    results = simulate(1, bots, seed=3, time_control=time_control)
+
+    usage = results.time_usage
+    assert results.loser[0] in (0, 1)
+    assert usage[0].decisions > 0 and usage[1].decisions > 0
+    assert usage[0].mean_seconds < 0.05
+    assert usage[0].max_seconds < 0.5
+    assert bots[0].deadline is None
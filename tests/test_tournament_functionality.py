@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from game.tournament import merge_results, run_tournament, wilson_interval
+from player.player_functions import RandomBot, HumanInput
+
+
+def test_wilson_interval_contains_win_rate():
+    win_rate = wilson_interval(7, 10)
+
+    assert win_rate.ci_low < win_rate.win_rate < win_rate.ci_high
+    assert 0 <= win_rate.ci_low and win_rate.ci_high <= 1
+
+
+def test_merge_results_type_stats_follow_rotated_seats():
+    lineup = [RandomBot(), RandomBot()]
+    results = merge_results(
+        lineup, np.array([0, 0, 1]), np.array([0, 1, 0]), labels=["a", "b"]
+    )
+
+    assert [seat.wins for seat in results.seat_stats] == [1, 2]
+    assert results.type_stats["a"].wins == 2
+    assert results.type_stats["b"].wins == 1
+
+
+def test_run_tournament_in_process_plays_every_match():
+    results = run_tournament(2, [RandomBot(), RandomBot()], seed=1, workers=1)
+
+    assert len(results.losers) == 2
+    assert sum(seat.wins for seat in results.seat_stats) == 2
+
+
+def test_run_tournament_with_human_player_error_is_raised():
+    with pytest.raises(ValueError):
+        run_tournament(1, [RandomBot(), HumanInput()], seed=1)
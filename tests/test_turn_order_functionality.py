@@ -0,0 +1,31 @@
+from game.turn_order import TurnOrder
+
+
+def test_turn_order_advances_around_the_table():
+    turn_order = TurnOrder([1, 2, 0], current=2)
+
+    assert [turn_order.advance() for _ in range(4)] == [0, 1, 2, 0]
+
+
+def test_turn_order_with_removed_current_seat_passes_turn_on():
+    turn_order = TurnOrder([1, 2, 3, 0], current=1)
+    turn_order.remove(1)
+
+    assert len(turn_order) == 3
+    assert turn_order.seats() == [2, 3, 0]
+
+    turn_order.remove(2)
+
+    assert turn_order.advance() == 3
+    assert turn_order.seats() == [3, 0]
+
+
+def test_turn_order_copy_restores_state():
+    turn_order = TurnOrder([1, 2, 0], current=0)
+    saved = turn_order.copy()
+    turn_order.remove(0)
+    turn_order.advance()
+
+    assert turn_order != saved
+    assert saved.seats() == [0, 1, 2]
+    assert len(saved) == 3